@@ -0,0 +1,139 @@
+import sys, os, json, time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from classes import registry
+from utils import cache_functions as cache
+from utils import pipeline_functions as pipeline
+
+# Runs the pipeline of main.py for several datasets in one process pool. Every dataset is processed once, then
+# its clean and noisy cross validations are separate tasks, so the total wall time approaches that of the slowest
+# dataset instead of the sum over all of them. Workers are started once and reused, so the interpreter and numpy
+# import cost is paid per worker instead of per dataset.
+
+def prepare_task(name):
+  """
+  Processes (or loads from cache) a dataset in a worker and exports its model.
+
+  Returns:
+      tuple: (raw_hash, num_examples, seconds)
+  """
+  start = time.perf_counter()
+  schema, learnable_class = registry.get_schema(name), registry.get_learnable_class(name)
+  clean_data, _, discretizer, raw_hash = pipeline.prepare(schema, learnable_class)
+  pipeline.export_model(name, learnable_class, clean_data, discretizer)
+  return raw_hash, len(clean_data), time.perf_counter() - start
+
+def variant_task(name, variant, raw_hash):
+  """
+  Cross validates one variant of a dataset in a worker, reading the processed arrays memory mapped from the cache,
+  and writes its loss file. The folds run serially since the pool already has one task per variant.
+
+  Returns:
+      tuple: (fold results, seconds)
+  """
+  start = time.perf_counter()
+  clean_data, noisy_data = cache.load_cached(pipeline.CACHE_DIR, name, raw_hash)
+  results = pipeline.cross_validate(registry.get_learnable_class(name), clean_data if variant == 'clean' else noisy_data, 'serial')
+  pipeline.write_losses(name, variant, results)
+  return results, time.perf_counter() - start
+
+def find_datasets(args):
+  """
+  Resolves dataset names, raw file names and directories of raw files to dataset names.
+
+  Returns:
+      list of str: dataset names, in order and without duplicates.
+  """
+  names = []
+  for arg in args:
+    if os.path.isdir(arg):
+      found = [registry.find_schema(file_name) for file_name in sorted(os.listdir(arg))]
+      names += [schema.name for schema in found if schema is not None]
+    else:
+      schema = registry.find_schema(os.path.basename(arg)) or registry.get_schema(arg)
+      if schema is None:
+        print(f"Warning: No class for '{arg}', skipped.")
+      else:
+        names.append(schema.name)
+  return list(dict.fromkeys(names))
+
+def summarize(results):
+  # mean and standard deviation of the fold losses of every variant
+  summary = {}
+  for variant in [variant for variant in pipeline.VARIANTS if variant in results]:
+    folds = results[variant]
+    zero_one = np.array([fold['zero_one_loss'] for fold in folds])
+    f1 = np.array([fold['f1_score_loss'] for fold in folds])
+    summary[variant] = {
+      'zero_one_loss': float(zero_one.mean()), 'zero_one_loss_std': float(zero_one.std()),
+      'f1_score_loss': float(f1.mean()), 'f1_score_loss_std': float(f1.std()),
+    }
+  return summary
+
+def run_batch(names, max_workers=None):
+  """
+  Runs the pipeline of every dataset in a process pool and writes every loss file, report and model.
+
+  Parameters:
+      names (list of str): dataset names.
+      max_workers (int): Size of the pool, defaults to the number of CPUs.
+
+  Returns:
+      dict: the combined summary, per dataset losses, task times and errors plus the total wall time.
+  """
+  start = time.perf_counter()
+  datasets = {name: {'results': {}, 'seconds': {}} for name in names}
+  with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    pending = {executor.submit(prepare_task, name): (name, 'prepare') for name in names}
+    while pending:
+      done, _ = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        name, task = pending.pop(future)
+        dataset = datasets[name]
+        try:
+          result = future.result()
+        except Exception as e:
+          dataset['error'] = f"{task}: {e}"
+          print(f"Error in {task} of '{name}': {e}")
+          continue
+        if task == 'prepare':
+          raw_hash, dataset['num_examples'], dataset['seconds']['prepare'] = result
+          for variant in pipeline.VARIANTS:
+            pending[executor.submit(variant_task, name, variant, raw_hash)] = (name, variant)
+        else:
+          dataset['results'][task], dataset['seconds'][task] = result
+          if len(dataset['results']) == len(pipeline.VARIANTS):
+            pipeline.write_report(name, dataset['results'])
+            print(f"Finished '{name}'")
+
+  summary = {'wall_seconds': time.perf_counter() - start, 'datasets': {}}
+  for name, dataset in datasets.items():
+    summary['datasets'][name] = {key: value for key, value in dataset.items() if key != 'results'}
+    summary['datasets'][name]['losses'] = summarize(dataset['results'])
+  return summary
+
+def main():
+  args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+  options = dict(arg.split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+  if not args:
+    print("Usage: python batch.py <dataset | raw_file | directory>... [--workers=<n>] [--summary=<file>]")
+    return
+
+  names = find_datasets(args)
+  summary_file = options.get('--summary', os.path.join("loss", "summary.json"))
+  workers = int(options['--workers']) if '--workers' in options else None
+  summary = run_batch(names, workers)
+
+  print(f"{'dataset':>10} | {'variant':>7} | {'0/1 loss':>8} | {'f1 loss':>8}")
+  for name, dataset in summary['datasets'].items():
+    for variant, losses in dataset['losses'].items():
+      print(f"{name:>10} | {variant:>7} | {losses['zero_one_loss']:>8.4f} | {losses['f1_score_loss']:>8.4f}")
+  print(f"Total wall time: {summary['wall_seconds']:.2f} s")
+  try:
+    with open(summary_file, 'w') as summary_f:
+      json.dump(summary, summary_f, indent=1)
+  except IOError as e:
+    print(f"Error writing summary file '{summary_file}': {e}")
+
+if __name__ == "__main__":
+  main()
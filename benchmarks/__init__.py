@@ -0,0 +1 @@
+# allows python files in folder to be imported
\ No newline at end of file
@@ -0,0 +1,63 @@
+import time
+import numpy as np
+
+def synthetic_examples(learnable_class, num_examples, seed=0):
+  """
+  Generates a random integer example matrix with the same shape as a processed dataset.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass whose attribute and class counts are used.
+      num_examples (int): Number of rows to generate.
+      seed (int): Seed for the random generator.
+
+  Returns:
+      numpy.ndarray: 2D integer array with the class id in the last column.
+  """
+  rng = np.random.default_rng(seed)
+  features = rng.integers(0, learnable_class.domain_size(), size=(num_examples, learnable_class.num_attributes))
+  labels = rng.integers(0, learnable_class.num_classes, size=(num_examples, 1))
+  return np.hstack((features, labels))
+
+def best_time(function, *args, repeat=3):
+  """
+  Runs a function several times and returns the fastest wall time in seconds.
+  """
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function(*args)
+    times.append(time.perf_counter() - start)
+  return min(times)
+
+def peak_rss():
+  """
+  Returns the peak resident set size of the current process in MiB.
+  VmHWM belongs to the current address space, unlike ru_maxrss which survives exec from a large parent.
+  """
+  try:
+    with open('/proc/self/status') as status:
+      for line in status:
+        if line.startswith('VmHWM:'):
+          return int(line.split()[1]) / 1024
+  except OSError:
+    pass
+  import resource
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def memory_status():
+  """
+  Returns the resident memory of the current process in MiB, split into private ('anon') and shared pages
+  ('file' for memory mapped files, 'shmem' for shared memory), plus the peak ('hwm').
+  Only available on Linux, an empty dict elsewhere.
+  """
+  fields = {'RssAnon:': 'anon', 'RssFile:': 'file', 'RssShmem:': 'shmem', 'VmHWM:': 'hwm'}
+  status = {}
+  try:
+    with open('/proc/self/status') as status_f:
+      for line in status_f:
+        key = line.split(maxsplit=1)[0]
+        if key in fields:
+          status[fields[key]] = int(line.split()[1]) / 1024
+  except OSError:
+    pass
+  return status
@@ -0,0 +1,54 @@
+import sys
+import numpy as np
+from utils import processor_functions as pf
+from benchmarks import bench_functions as bf
+
+def legacy_bin_attributes(experiments, attribute_bins):
+  # the per value dictionary scan bin_attributes used before it was vectorized, kept as the reference
+  attributes = np.array(experiments, dtype=float).T
+  for i in range(len(attributes) - 1):
+    attribute = attributes[i]
+    attribute_bin = attribute_bins[i]
+    for j in range(len(attribute)):
+      for (min_val, max_val) in attribute_bin:
+        if min_val < attribute[j] <= max_val:
+          attributes[i][j] = attribute_bin[(min_val, max_val)]
+          break
+  return attributes.T
+
+def continuous_examples(num_examples, num_attributes, num_classes, zero_fraction=0.0, seed=0):
+  rng = np.random.default_rng(seed)
+  features = rng.normal(size=(num_examples, num_attributes)).round(3)    # rounding creates ties like the real data
+  if zero_fraction:    # nonnegative, mostly zero columns such as glass Ba and Fe, whose lowest edges are all tied
+    features = np.abs(features)
+    features[rng.random(features.shape) < zero_fraction] = 0.0
+  labels = rng.integers(0, num_classes, size=(num_examples, 1))
+  return np.hstack((features, labels))
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5, 10**6, 4 * 10**6]
+  shapes = {'iris': (4, 3, 0.0), 'glass': (9, 7, 0.0), 'ties': (9, 7, 0.8)}    # (attributes, classes, share of zeros)
+  num_bins = 15
+
+  print(f"{'shape':>6} | {'rows':>9} | {'legacy (s)':>10} | {'vector (s)':>10} | {'rows/s':>12}")
+  for name, (num_attributes, num_classes, zero_fraction) in shapes.items():
+    for n in sizes:
+      examples = continuous_examples(n, num_attributes, num_classes, zero_fraction)
+      edges = pf.get_bin_edges(examples, num_bins)
+      attribute_bins = [{(e[j], e[j + 1]): j for j in range(num_bins)} for e in edges]
+
+      legacy_time = float('nan')
+      if n <= 10**5:    # the dictionary scan takes minutes beyond this
+        legacy_time = bf.best_time(legacy_bin_attributes, examples, attribute_bins, repeat=1)
+        legacy = legacy_bin_attributes(examples, attribute_bins)
+        binned = pf.bin_attributes(examples, attribute_bins)
+        tied = examples[:, :-1] == edges[:, 0]    # values equal to the lowest edge were left unbinned before
+        assert np.array_equal(legacy[:, :-1][~tied], binned[:, :-1][~tied])
+        assert np.all(binned[:, :-1][tied] == 0)
+        assert np.array_equal(binned, pf.bin_attributes(examples, edges))    # tied edges collapse dictionary keys, not bins
+
+      vector_time = bf.best_time(pf.bin_attributes, examples, edges)
+      print(f"{name:>6} | {n:>9} | {legacy_time:>10.4f} | {vector_time:>10.4f} | {n / vector_time:>12.0f}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,33 @@
+import sys
+import numpy as np
+from classes.soybean import Soybean
+from benchmarks import bench_functions as bf
+
+def loop_classifier(learnable_class, examples):
+  return [e.class_id for e in learnable_class.naive_bayes_classifier([learnable_class(e, False) for e in examples])]
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5, 10**6]
+  learnable_class = Soybean    # widest table, 35 attributes
+
+  learnable_class.naive_bayes_array_trainer(bf.synthetic_examples(learnable_class, 1000, seed=1))
+
+  print(f"{'rows':>10} | {'loop (s)':>10} | {'batch (s)':>10} | {'speedup':>8}")
+  for n in sizes:
+    examples = bf.synthetic_examples(learnable_class, n)
+
+    loop_ids = None
+    loop_time = float('nan')
+    if n <= 10**5:    # the per-example loop takes minutes beyond this
+      loop_time = bf.best_time(loop_classifier, learnable_class, examples, repeat=1)
+      loop_ids = loop_classifier(learnable_class, examples)
+
+    batch_time = bf.best_time(learnable_class.naive_bayes_batch_classifier, examples)
+    batch_ids, _ = learnable_class.naive_bayes_batch_classifier(examples)
+    if loop_ids is not None:
+      assert np.array_equal(batch_ids, loop_ids)
+
+    print(f"{n:>10} | {loop_time:>10.4f} | {batch_time:>10.4f} | {loop_time / batch_time:>7.1f}x")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,33 @@
+import os, sys, time
+from classes.cancer import Cancer
+from utils import cv_functions as cvf
+from benchmarks import bench_functions as bf
+
+def main():
+  num_examples = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+  num_repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+  data = bf.synthetic_examples(Cancer, num_examples)
+  seeds = list(range(num_repeats))
+
+  for mode in ('refit', 'counts'):    # compiles the Numba kernels for these array types before anything is timed
+    cvf.cross_validate(Cancer, data[:1000], executor='serial', mode=mode)
+  start = time.perf_counter()
+  reference = cvf.cross_validate(Cancer, data, seeds=seeds, executor='serial', mode='refit')
+  serial_time = time.perf_counter() - start
+  print(f"{num_repeats}x10-fold CV on {num_examples} rows, {os.cpu_count()} cores")
+  print(f"{'mode':>6} | {'executor':>8} | {'workers':>7} | {'time (s)':>9} | {'speedup':>8}")
+  print(f"{'refit':>6} | {'serial':>8} | {1:>7} | {serial_time:>9.3f} | {1.0:>7.2f}x")
+
+  workers = 1
+  while workers <= os.cpu_count():
+    for mode in ('refit', 'counts'):
+      for executor in ('process', 'thread'):
+        start = time.perf_counter()
+        results = cvf.cross_validate(Cancer, data, seeds=seeds, executor=executor, max_workers=workers, mode=mode)
+        elapsed = time.perf_counter() - start
+        assert results == reference    # deterministic for the given seeds regardless of scheduling or mode
+        print(f"{mode:>6} | {executor:>8} | {workers:>7} | {elapsed:>9.3f} | {serial_time / elapsed:>7.2f}x")
+    workers *= 2
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,45 @@
+import sys, time, tracemalloc
+import numpy as np
+from classes.soybean import Soybean
+from classes.dataset import Dataset
+from utils import cv_functions as cvf
+from benchmarks import bench_functions as bf
+
+# Cost of building the training data of every fold: the former concatenate-per-fold copies against
+# training on index views of the example matrix (cv_functions 'refit' and 'counts' modes).
+
+def legacy_folds(learnable_class, data):
+  # former n_fold_cross_validation: concatenate the other folds, then copy again with np.array
+  folds = np.array_split(data, 10)
+  for i in range(len(folds)):
+    training = np.array(np.concatenate(folds[0:i] + folds[i + 1:]), dtype=int)
+    model = learnable_class.new_model().fit(Dataset.from_examples(training, learnable_class))
+    model.predict(Dataset.from_examples(folds[i], learnable_class))
+
+def view_folds(learnable_class, data, mode):
+  cvf.cross_validate(learnable_class, data, 10, executor='serial', mode=mode)
+
+def measure(function, *args):
+  start = time.perf_counter()
+  function(*args)
+  seconds = time.perf_counter() - start
+  tracemalloc.start()
+  function(*args)
+  peak = tracemalloc.get_traced_memory()[1] / 2**20
+  tracemalloc.stop()
+  return seconds, peak
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+  learnable_class = Soybean
+
+  print(f"{'rows':>8} | {'data (MiB)':>10} | {'method':>13} | {'time (s)':>8} | {'peak extra (MiB)':>16}")
+  for n in sizes:
+    data = bf.synthetic_examples(learnable_class, n)
+    for method, function, args in [('concatenate', legacy_folds, ()), ('views, refit', view_folds, ('refit',)),
+                                   ('views, counts', view_folds, ('counts',))]:
+      seconds, peak = measure(function, learnable_class, data, *args)
+      print(f"{n:>8} | {data.nbytes / 2**20:>10.1f} | {method:>13} | {seconds:>8.3f} | {peak:>16.1f}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,60 @@
+import sys, os, time, tracemalloc
+import numpy as np
+from classes.soybean import Soybean
+from utils import kernel_functions as kf
+from utils import nb_functions as nbf
+from benchmarks import bench_functions as bf
+
+# Every available backend of the count and predict kernels on Soybean sized tables (35 attributes):
+# time, peak extra memory, and scoring from several threads. All backends must give identical counts,
+# posteriors and class ids, which is checked on every size, with and without a rows selection.
+
+def measure(function, *args, **kwargs):
+  function(*args, **kwargs)    # compiles the Numba kernels for these array types before timing
+  start = time.perf_counter()
+  result = function(*args, **kwargs)
+  seconds = time.perf_counter() - start
+  tracemalloc.start()
+  function(*args, **kwargs)
+  peak = tracemalloc.get_traced_memory()[1] / 2**20
+  tracemalloc.stop()
+  return result, seconds, peak
+
+def run_backend(name, features, labels, log_prior, log_prob, rows, threads):
+  # returns (results compared between backends, timings)
+  count_values, predict = kf.BACKENDS[name]
+  num_classes, _, num_values = log_prob.shape
+  counts, count_seconds, count_peak = measure(count_values, features, labels, num_classes, num_values)
+  (class_ids, posteriors), predict_seconds, predict_peak = measure(predict, log_prior, log_prob, features)
+  start = time.perf_counter()
+  threaded_ids, threaded_posteriors = kf.threaded_predict(log_prior, log_prob, features, threads, backend=name)
+  threaded_seconds = time.perf_counter() - start
+  results = [counts, class_ids, posteriors, threaded_ids, threaded_posteriors,
+             count_values(features, labels, num_classes, num_values, rows=rows), *predict(log_prior, log_prob, features, rows=rows)]
+  return results, (count_seconds, count_peak, predict_seconds, predict_peak, threaded_seconds)
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+  learnable_class = Soybean
+  num_classes, num_values = learnable_class.num_classes, learnable_class.domain_size()
+  threads = os.cpu_count()
+
+  print(f"selected backend: {kf.BACKEND}, available: {', '.join(kf.BACKENDS)}")
+  print(f"{'rows':>8} | {'backend':>7} | {'count (s)':>9} | {'peak (MiB)':>10} | {'predict (s)':>11} | {'peak (MiB)':>10} | {f'{threads} threads (s)':>15}")
+  for n in sizes:
+    examples = bf.synthetic_examples(learnable_class, n)
+    features, labels = examples[:, :-1], examples[:, -1]
+    model = learnable_class.new_model().set_counts(nbf.count_classes(labels, num_classes),
+                                                   nbf.count_values(features, labels, num_classes, num_values))
+    _, _, log_prior, log_prob = model.probabilities()
+    rows = np.arange(0, n, 3)
+
+    reference = None
+    for name in kf.BACKENDS:
+      results, timings = run_backend(name, features, labels, log_prior, log_prob, rows, threads)
+      print(f"{n:>8} | {name:>7} | {timings[0]:>9.3f} | {timings[1]:>10.1f} | {timings[2]:>11.3f} | {timings[3]:>10.1f} | {timings[4]:>15.3f}")
+      reference = reference or results
+      assert all(np.array_equal(result, expected) for result, expected in zip(results, reference)), f"{name} differs from {next(iter(kf.BACKENDS))}"
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,34 @@
+import sys
+from math import ceil
+from random import sample
+import numpy as np
+from classes.soybean import Soybean
+from utils import noise_functions as nf
+from benchmarks import bench_functions as bf
+
+def legacy_replicates(examples, num_replicates, noise_level=0.10):
+  # the former add_noise, on a copy per replicate since it shuffled in place
+  replicates = []
+  for _ in range(num_replicates):
+    attributes = examples.copy().T
+    num_attributes = len(attributes) - 1
+    for i in sample(range(num_attributes), min(ceil(num_attributes * noise_level), num_attributes)):
+      np.random.shuffle(attributes[i])
+    replicates.append(attributes.T)
+  return replicates
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5]
+  num_replicates = 32
+
+  print(f"{'rows':>8} | {'replicates':>10} | {'legacy loop (s)':>15} | {'batched (s)':>11} | {'lazy index (s)':>14}")
+  for n in sizes:
+    examples = bf.synthetic_examples(Soybean, n)
+    legacy_time = bf.best_time(legacy_replicates, examples, num_replicates)
+    batched_time = bf.best_time(nf.replicates, examples, num_replicates, 'permute', 0.10, None, None, 0)
+    # the lazy index only draws the permutations, rows are materialized later where they are needed
+    index_time = bf.best_time(lambda: [nf.permutation_index(n, examples.shape[1] - 1, 0.10, seed) for seed in range(num_replicates)])
+    print(f"{n:>8} | {num_replicates:>10} | {legacy_time:>15.4f} | {batched_time:>11.4f} | {index_time:>14.4f}")
+
+if __name__ == "__main__":
+  main()
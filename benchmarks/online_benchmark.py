@@ -0,0 +1,73 @@
+import sys, time
+import numpy as np
+from classes.soybean import Soybean
+
+# Keeping a model current on a drifting stream: each batch is first classified with the current model
+# (prequential accuracy) and then learned. Online updates are compared with retraining from scratch
+# on the same window after every batch, and with a model that keeps every batch.
+
+BATCH_SIZE: int = 1000
+WINDOW: int = 10
+
+def drifting_batches(learnable_class, num_batches, seed=0):
+  # the class prior rotates and the values of every class shift slowly over the stream
+  rng = np.random.default_rng(seed)
+  num_classes, num_values = learnable_class.num_classes, learnable_class.domain_size()
+  class_values = rng.integers(0, num_values, (num_classes, learnable_class.num_attributes))
+  batches = []
+  for t in range(num_batches):
+    prior = np.roll(np.linspace(1, 3, num_classes), t // 20)
+    labels = rng.choice(num_classes, BATCH_SIZE, p=prior / prior.sum())
+    noise = rng.integers(-1, 2, (BATCH_SIZE, learnable_class.num_attributes))
+    features = (class_values[labels] + t // 25 + noise) % num_values
+    batches.append(np.column_stack((features, labels)))
+  return batches
+
+def run(learnable_class, batches, strategy):
+  # returns (prequential accuracy, mean seconds spent learning a batch)
+  model = learnable_class.new_online_model(**strategy) if isinstance(strategy, dict) else learnable_class.new_model()
+  correct, seconds = 0, 0.0
+  for t, batch in enumerate(batches):
+    if t:
+      correct += int((model.predict(batch[:, :-1]) == batch[:, -1]).sum())
+    start = time.perf_counter()
+    if strategy == 'retrain':
+      window = np.vstack(batches[max(0, t + 1 - WINDOW):t + 1])
+      model.fit_arrays(window[:, :-1], window[:, -1])
+    else:
+      model.update(batch)
+    model.probabilities()
+    seconds += time.perf_counter() - start
+  return correct / (BATCH_SIZE * (len(batches) - 1)), seconds / len(batches)
+
+def main():
+  num_batches = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+  learnable_class = Soybean
+  batches = drifting_batches(learnable_class, num_batches)
+
+  print(f"{'strategy':>22} | {'accuracy':>8} | {'ms per batch':>12}")
+  for name, strategy in [('keep everything', 'cumulative'), (f'retrain last {WINDOW}', 'retrain'),
+                         (f'window of {WINDOW}', {'window': WINDOW}), ('decay 0.9', {'decay': 0.9})]:
+    accuracy, seconds = run(learnable_class, batches, strategy)
+    print(f"{name:>22} | {accuracy:>8.4f} | {seconds * 1000:>12.3f}")
+
+  # the window gives exactly the counts of retraining on the window
+  window_model = learnable_class.new_online_model(window=WINDOW)
+  for batch in batches:
+    window_model.update(batch)
+  last = np.vstack(batches[-WINDOW:])
+  assert np.array_equal(window_model.value_counts, learnable_class.new_model().fit_arrays(last[:, :-1], last[:, -1]).value_counts)
+
+  # decay gives every batch's counts weighted by decay once per later batch; a decay of 0.3 passes RESCALE_LIMIT
+  # within 200 batches, and the query folds the rest of the scale so the stored counts are the decayed counts
+  decay = 0.3
+  decay_model = learnable_class.new_online_model(decay=decay)
+  expected = np.zeros(decay_model.value_counts.shape)
+  for batch in batches:
+    decay_model.update(batch)
+    expected = decay * expected + learnable_class.new_model().fit_arrays(batch[:, :-1], batch[:, -1]).value_counts
+  decay_model.probabilities()
+  assert np.allclose(decay_model.value_counts, expected)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,96 @@
+import sys
+import numpy as np
+from classes import votes, iris, soybean
+from utils import parse_functions as psf
+from benchmarks import bench_functions as bf
+
+# the per line parsing loops process_data used before the bulk parser, kept as the reference
+
+def legacy_cancer(lines):
+  processed_lines = []
+  for line in lines:
+    line = line.split(',')
+    line.pop(0)
+    line[-1] = int(line[-1]) // 2
+    for j in range(len(line)):
+      line[j] = 0 if line[j] == '?' else int(line[j]) - 1    # 0 instead of a random value so the results can be compared
+    processed_lines.append(line)
+  return np.array(processed_lines, dtype=int)
+
+def legacy_glass(lines):
+  processed_lines = []
+  for line in lines:
+    line = line.strip().split(',')
+    line.pop(0)
+    line[-1] = int(line[-1]) - 1
+    processed_lines.append(line)
+  return np.array(processed_lines, dtype=float)
+
+def legacy_votes(lines):
+  strings_digits = ['?', 'y', 'n']
+  processed_lines = []
+  for line in lines:
+    line = line.strip().split(',')
+    line.append(line.pop(0))
+    line[-1] = votes.Votes.class_names.index(line[-1])
+    for j in range(len(line) - 1):
+      line[j] = strings_digits.index(line[j])
+    processed_lines.append(line)
+  return np.array(processed_lines, dtype=int)
+
+def legacy_named_class(class_names, dtype):
+  def parse(lines):
+    processed_lines = []
+    for line in lines:
+      line = line.strip().split(',')
+      line[-1] = class_names.index(line[-1])
+      processed_lines.append(line)
+    return np.array(processed_lines, dtype=dtype)
+  return parse
+
+def bulk_cancer(raw):
+  values, missing = psf.read_numeric(raw, range(1, 11), int, missing='?')
+  examples = psf.fill_missing(values - 1, missing, 0, 0)    # the legacy reference fills missing values with 0
+  examples[:, -1] = (examples[:, -1] + 1) // 2 - 1
+  return examples
+
+def bulk_glass(raw):
+  examples, _ = psf.read_numeric(raw, range(1, 11), float)
+  examples[:, -1] -= 1
+  return examples
+
+def bulk_votes(raw):
+  return np.column_stack((psf.read_categorical(raw, range(1, 17), ['?', 'y', 'n']), psf.read_categorical(raw, [0], votes.Votes.class_names)))
+
+def bulk_named_class(num_attributes, class_names, dtype):
+  def parse(raw):
+    attributes, _ = psf.read_numeric(raw, range(num_attributes), dtype)
+    return np.column_stack((attributes, psf.read_categorical(raw, [num_attributes], class_names)))
+  return parse
+
+datasets = {
+  'cancer': ("raw_data/breast-cancer-wisconsin.data", legacy_cancer, bulk_cancer),
+  'glass': ("raw_data/glass.data", legacy_glass, bulk_glass),
+  'votes': ("raw_data/house-votes-84.data", legacy_votes, bulk_votes),
+  'iris': ("raw_data/iris.data", legacy_named_class(iris.Iris.class_names, float), bulk_named_class(4, iris.Iris.class_names, float)),
+  'soybean': ("raw_data/soybean-small.data", legacy_named_class(soybean.Soybean.class_names, int), bulk_named_class(35, soybean.Soybean.class_names, int)),
+}
+
+def main():
+  target_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+
+  print(f"{'dataset':>8} | {'rows':>9} | {'MiB':>6} | {'legacy (s)':>10} | {'bulk (s)':>9} | {'MiB/s':>7} | {'speedup':>8}")
+  for name, (path, legacy, bulk) in datasets.items():
+    with open(path, 'r') as in_f:
+      lines = [line.rstrip() + '\n' for line in in_f if line.strip()]
+    lines = lines * max(1, target_rows // len(lines))    # the real file repeated up to the target size
+    raw = ''.join(lines).encode()
+
+    assert np.array_equal(legacy(lines), bulk(raw))
+    legacy_time = bf.best_time(legacy, lines, repeat=1)
+    bulk_time = bf.best_time(bulk, raw)
+    size = len(raw) / 2**20
+    print(f"{name:>8} | {len(lines):>9} | {size:>6.1f} | {legacy_time:>10.3f} | {bulk_time:>9.3f} | {size / bulk_time:>7.1f} | {legacy_time / bulk_time:>7.1f}x")
+
+if __name__ == "__main__":
+  main()
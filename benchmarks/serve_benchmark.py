@@ -0,0 +1,69 @@
+import os, sys, time, json, asyncio, subprocess, tempfile
+import numpy as np
+from classes.soybean import Soybean
+from classes.dataset import Dataset
+from benchmarks import bench_functions as bf
+
+# Load generator for serve.py: starts a local server on a Unix socket and sends requests from concurrent
+# keep-alive clients, reporting client side throughput and latency next to the server's own counters.
+
+async def request(reader, writer, method, path, body=b''):
+  writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+  await writer.drain()
+  headers = {}
+  await reader.readline()    # status line
+  while (line := await reader.readline()) not in (b'\r\n', b''):
+    key, _, value = line.decode().partition(':')
+    headers[key.strip().lower()] = value.strip()
+  return json.loads(await reader.readexactly(int(headers['content-length'])))
+
+async def client(socket_path, bodies, latencies):
+  reader, writer = await asyncio.open_unix_connection(socket_path)
+  for body in bodies:
+    start = time.perf_counter()
+    reply = await request(reader, writer, 'POST', '/predict', body)
+    latencies.append(time.perf_counter() - start)
+    assert 'class_ids' in reply, reply
+  writer.close()
+
+async def load(socket_path, num_clients, num_requests, rows_per_request, lines):
+  latencies = []
+  bodies = [b''.join(lines[(i * rows_per_request) % len(lines):][:rows_per_request]) for i in range(num_requests)]
+  start = time.perf_counter()
+  await asyncio.gather(*(client(socket_path, bodies, latencies) for _ in range(num_clients)))
+  elapsed = time.perf_counter() - start
+  reader, writer = await asyncio.open_unix_connection(socket_path)
+  stats = await request(reader, writer, 'GET', '/stats')
+  writer.close()
+  return elapsed, np.array(latencies) * 1000, stats
+
+def main():
+  with tempfile.TemporaryDirectory() as directory:
+    model_file = os.path.join(directory, 'soybean.nbm')
+    socket_path = os.path.join(directory, 'serve.sock')
+    examples = bf.synthetic_examples(Soybean, 10**5)
+    Soybean.new_model().fit(Dataset.from_examples(examples, Soybean)).save(model_file)
+    lines = [','.join(map(str, row)).encode() + b'\n' for row in examples[:10**4, :-1]]    # rows without the class column
+
+    server = subprocess.Popen([sys.executable, 'serve.py', model_file, '--socket', socket_path], stdout=subprocess.DEVNULL)
+    try:
+      while not os.path.exists(socket_path):
+        time.sleep(0.05)
+      print(f"{'clients':>7} | {'rows/req':>8} | {'req/s':>8} | {'rows/s':>9} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'rows/batch':>10}")
+      previous = {'rows': 0, 'batches': 0}
+      for num_clients in [1, 8, 64]:
+        for rows_per_request in [1, 100]:
+          num_requests = max(20, 2000 // num_clients)
+          elapsed, latencies, stats = asyncio.run(load(socket_path, num_clients, num_requests, rows_per_request, lines))
+          total = num_clients * num_requests
+          batch_rows = (stats['rows'] - previous['rows']) / max(stats['batches'] - previous['batches'], 1)
+          previous = stats
+          print(f"{num_clients:>7} | {rows_per_request:>8} | {total / elapsed:>8.0f} | {total * rows_per_request / elapsed:>9.0f} | "
+                f"{np.percentile(latencies, 50):>8.2f} | {np.percentile(latencies, 99):>8.2f} | {batch_rows:>10.1f}")
+      print(json.dumps(stats, indent=1))
+    finally:
+      server.terminate()
+      server.wait()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,64 @@
+import os, sys, tempfile
+import multiprocessing as mp
+import numpy as np
+from classes.soybean import Soybean
+from classes.dataset import Dataset
+from utils import nb_functions as nbf
+from utils import shared_functions as shf
+from benchmarks import bench_functions as bf
+
+# Resident memory per scoring worker when every worker receives its own copy of the model and the features,
+# against workers attached to one shared memory block or one memory mapped artifact. Workers are spawned so
+# nothing is inherited from this process.
+
+def worker(source, results):
+  if isinstance(source, dict) and isinstance(source['features'], np.ndarray):
+    arrays = source    # pickled copies
+  else:
+    blocks, arrays = shf.attach(source)
+  num_rows = len(arrays['features'])
+  for start in range(0, num_rows, nbf.CHUNK_SIZE):    # touch every page of the features
+    nbf.predict(arrays['log_prior'], arrays['log_prob'], arrays['features'][start:start + nbf.CHUNK_SIZE], chunk_size=4096)
+  results.put(bf.memory_status())
+
+def run(source, num_workers):
+  context = mp.get_context('spawn')
+  results = context.Queue()
+  workers = [context.Process(target=worker, args=(source, results)) for _ in range(num_workers)]
+  for process in workers:
+    process.start()
+  statuses = [results.get() for _ in workers]
+  for process in workers:
+    process.join()
+  return {key: np.mean([status.get(key, 0.0) for status in statuses]) for key in ('anon', 'file', 'shmem')}
+
+def main():
+  num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+  examples = bf.synthetic_examples(Soybean, num_rows)
+  dataset = Dataset.from_examples(examples, Soybean)
+  model = Soybean.new_model().fit(dataset)
+  _, _, log_prior, log_prob = model.probabilities()
+  features = dataset.features
+
+  # the pooled scorer gives the same predictions as scoring in this process
+  assert (shf.parallel_predict(model, features[:10**5], 2) == model.predict(features[:10**5])).all()
+
+  print(f"features: {features.nbytes / 2**20:.1f} MiB")
+  print(f"{'workers':>7} | {'source':>6} | {'private (MiB)':>13} | {'shared mmap (MiB)':>17} | {'shared shm (MiB)':>16} | {'host total (MiB)':>16}")
+  blocks, descriptor = shf.publish_model(model, features)
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'soybean.nbm')
+    model.save(path, features=features)
+    try:
+      for num_workers in [1, 2, 4]:
+        for name, source in [('copy', {'log_prior': log_prior, 'log_prob': log_prob, 'features': features}),
+                             ('shm', descriptor), ('mmap', path)]:
+          memory = run(source, num_workers)
+          shared = 0 if name == 'copy' else features.nbytes / 2**20    # counted once per host
+          print(f"{num_workers:>7} | {name:>6} | {memory['anon']:>13.1f} | {memory['file']:>17.1f} | {memory['shmem']:>16.1f} | "
+                f"{num_workers * memory['anon'] + shared:>16.1f}")
+    finally:
+      shf.release(blocks)
+
+if __name__ == "__main__":
+  main()
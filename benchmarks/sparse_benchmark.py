@@ -0,0 +1,62 @@
+import sys, time, tracemalloc
+import numpy as np
+from classes.learnablenb import LearnableNB
+from classes.nbmodel import NBModel
+from classes.sparse_nbmodel import SparseNBModel
+
+# Dense count tensor against the sparse key/count store on categorical attributes with many distinct values.
+# Values follow a Zipf law, as categories usually do, so most (class, attribute, value) cells are never observed.
+# Both layouts must give identical log posteriors.
+
+NUM_ATTRIBUTES: int = 20
+NUM_CLASSES: int = 5
+NUM_EXAMPLES: int = 10**5
+
+def wide_class(num_values):
+  # a LearnableNB subclass with num_values possible values per attribute
+  return type('Wide', (LearnableNB,), {'class_names': [str(c) for c in range(NUM_CLASSES)], 'num_classes': NUM_CLASSES,
+                                       'num_attributes': NUM_ATTRIBUTES, 'num_bins': num_values})
+
+def zipf_examples(num_values, num_examples, seed=0):
+  rng = np.random.default_rng(seed)
+  features = (rng.zipf(1.5, size=(num_examples, NUM_ATTRIBUTES)) - 1) % num_values
+  return features, rng.integers(0, NUM_CLASSES, num_examples)
+
+def model_bytes(model):
+  if isinstance(model, SparseNBModel):
+    return model.nbytes
+  arrays = [model.class_counts, model.value_counts] + list(model.probabilities())
+  return sum(array.nbytes for array in arrays)
+
+def run(model, features, labels):
+  # train on the first half, score the second
+  half = len(labels) // 2
+  start = time.perf_counter()
+  model.fit_arrays(features[:half], labels[:half])
+  model.probabilities()
+  fit_seconds = time.perf_counter() - start
+  start = time.perf_counter()
+  posteriors = model.log_posteriors(features[half:])
+  return fit_seconds, time.perf_counter() - start, posteriors
+
+def main():
+  cardinalities = [int(arg) for arg in sys.argv[1:]] or [10, 1000, 10**5]
+
+  print(f"{'values':>7} | {'layout':>6} | {'fit (s)':>7} | {'score (s)':>9} | {'model (MiB)':>11} | {'peak (MiB)':>10}")
+  for num_values in cardinalities:
+    learnable_class = wide_class(num_values)
+    features, labels = zipf_examples(num_values, NUM_EXAMPLES)
+    results = {}
+    for layout, model_type in [('dense', NBModel), ('sparse', SparseNBModel)]:
+      fit_seconds, score_seconds, posteriors = run(model_type(learnable_class), features, labels)
+      tracemalloc.start()
+      model = model_type(learnable_class)
+      run(model, features, labels)
+      peak = tracemalloc.get_traced_memory()[1] / 2**20
+      tracemalloc.stop()
+      results[layout] = posteriors
+      print(f"{num_values:>7} | {layout:>6} | {fit_seconds:>7.3f} | {score_seconds:>9.3f} | {model_bytes(model) / 2**20:>11.2f} | {peak:>10.1f}")
+    assert np.array_equal(results['dense'], results['sparse']), "sparse log posteriors differ from the dense ones"
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,40 @@
+import os, sys, subprocess, tempfile
+import numpy as np
+from classes.cancer import Cancer
+from utils import stream_functions as sf
+from benchmarks import bench_functions as bf
+
+def child(path, mode, chunk_size):
+  # runs in a fresh interpreter so the peak only reflects this training run
+  model = Cancer.new_model()
+  if mode == 'stream':
+    model.fit_stream(sf.iter_chunks(path, chunk_size))
+  else:
+    model.partial_fit(np.loadtxt(path, delimiter=',', dtype=int, ndmin=2))
+  print(bf.peak_rss(), int(model.class_counts.sum()))
+
+def peak_rss(path, mode, chunk_size):
+  output = subprocess.run([sys.executable, '-m', 'benchmarks.stream_benchmark', '--child', path, mode, str(chunk_size)],
+                          capture_output=True, text=True, check=True).stdout.split()
+  return float(output[0]), int(output[1])
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6, 4 * 10**6]
+  chunk_size = sf.CHUNK_SIZE
+
+  print(f"{'rows':>10} | {'file (MiB)':>10} | {'full load RSS (MiB)':>19} | {'stream RSS (MiB)':>16}")
+  with tempfile.TemporaryDirectory() as directory:
+    for n in sizes:
+      path = os.path.join(directory, f"cancer_{n}.data")
+      np.savetxt(path, bf.synthetic_examples(Cancer, n), fmt='%d', delimiter=',')
+      full_rss, full_rows = peak_rss(path, 'full', chunk_size)
+      stream_rss, stream_rows = peak_rss(path, 'stream', chunk_size)
+      assert full_rows == stream_rows == n
+      print(f"{n:>10} | {os.path.getsize(path) / 2**20:>10.1f} | {full_rss:>19.1f} | {stream_rss:>16.1f}")
+      os.remove(path)
+
+if __name__ == "__main__":
+  if len(sys.argv) > 1 and sys.argv[1] == '--child':
+    child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+  else:
+    main()
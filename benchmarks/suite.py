@@ -0,0 +1,156 @@
+import io, os, sys, json, time, platform, subprocess, tracemalloc
+import numpy as np
+from classes import registry
+from classes.dataset import Dataset
+from utils import processor_functions as pf
+from utils import cv_functions as cvf
+
+# Benchmark suite over every pipeline stage of every registered dataset, on synthetic raw files with the shape
+# of the real ones. Wall time and peak traced memory of each stage are written to JSON so runs of different
+# versions can be compared with --compare. Memory is traced in this process only, so the peak of cross_validate
+# leaves out its worker processes.
+#
+#   python -m benchmarks.suite [--sizes 1000,10000] [--datasets cancer,iris] [--output results.json]
+#                              [--repeat 3] [--memory 0] [--compare baseline.json]
+#
+# Results go to RESULTS_DIR/benchmark_results.json unless --output gives another path.
+
+SIZES: list[int] = [10**3, 10**4, 10**5, 10**6, 10**7]
+RESULTS_DIR: str = "benchmark_results"    # not tracked by git
+GENERATE_CHUNK: int = 10**5    # rows formatted at a time while generating a raw file
+
+def synthetic_raw(schema, num_rows, seed=0):
+  """
+  Generates a raw data file in the layout of a schema: id column, attribute tokens, missing tokens and class tokens.
+
+  Parameters:
+      schema (DatasetSchema): layout of the file.
+      num_rows (int): Number of rows.
+      seed (int): Seed for the random generator.
+
+  Returns:
+      bytes: the file contents.
+  """
+  rng = np.random.default_rng(seed)
+  low, high = schema.domain_values
+  out = io.BytesIO()
+  for start in range(0, num_rows, GENERATE_CHUNK):
+    n = min(GENERATE_CHUNK, num_rows - start)
+    tokens = np.empty((n, schema.num_columns), dtype='U24')
+    if schema.id_column is not None:
+      tokens[:, schema.id_column] = np.arange(start, start + n).astype('U24')
+    if schema.attribute_type == 'categorical':
+      values = np.array(schema.vocabulary)[rng.integers(0, len(schema.vocabulary), (n, schema.num_attributes))]
+    elif schema.attribute_type == 'float':
+      values = np.round(rng.normal(size=(n, schema.num_attributes)), 4).astype('U24')
+    else:
+      values = (rng.integers(low, high + 1, (n, schema.num_attributes)) - schema.value_offset).astype('U24')
+    if schema.missing:
+      values[rng.random(values.shape) < 0.01] = schema.missing    # about 1% missing values
+    tokens[:, schema.attribute_columns] = values
+    tokens[:, schema.class_column] = np.array(schema.class_tokens)[rng.integers(0, len(schema.class_tokens), n)]
+    np.savetxt(out, tokens, fmt='%s', delimiter=',')
+  return out.getvalue()
+
+def measure(function, *args, repeat=1, memory=True):
+  """
+  Returns: dict: the fastest wall time in seconds over repeat runs and the peak traced memory in MiB of one more run.
+  Tracing slows allocations down, so the traced run is not timed.
+  """
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function(*args)
+    times.append(time.perf_counter() - start)
+  result = {'seconds': min(times)}
+  if memory:
+    tracemalloc.start()
+    function(*args)
+    result['peak_mib'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+  return result
+
+def losses(learnable_class, classified):
+  return learnable_class.zero_one_loss(classified), learnable_class.f1_score_loss(classified)
+
+def run_dataset(name, num_rows, repeat, memory):
+  """
+  Times every stage of the pipeline on one synthetic dataset.
+
+  Returns:
+      list of dict: one record per stage.
+  """
+  schema = registry.get_schema(name)
+  learnable_class = registry.get_learnable_class(name)
+  raw = synthetic_raw(schema, num_rows)
+  clean, _, _ = learnable_class.process_data(raw)
+  dataset = Dataset.from_examples(clean, learnable_class)
+
+  stages = {'process_data': (learnable_class.process_data, raw)}
+  if schema.num_bins:
+    continuous = schema.load(raw)[:, :-1]
+    attribute_bins = pf.get_attribute_bins(continuous, schema.num_bins)
+    stages['get_attribute_bins'] = (pf.get_attribute_bins, continuous, schema.num_bins)
+    stages['bin_attributes'] = (pf.bin_attributes, continuous, attribute_bins)
+  stages['add_noise'] = (pf.add_noise, clean, 0.10)
+  stages['naive_bayes_trainer'] = (learnable_class.naive_bayes_trainer, dataset)
+  stages['naive_bayes_classifier'] = (learnable_class.naive_bayes_classifier, dataset)
+  stages['losses'] = (losses, learnable_class, dataset)
+  stages['cross_validate'] = (cvf.cross_validate, learnable_class, clean, 10)
+
+  records = []
+  for stage, (function, *args) in stages.items():
+    record = {'dataset': name, 'rows': num_rows, 'stage': stage, 'raw_mib': len(raw) / 2**20}
+    record.update(measure(function, *args, repeat=repeat, memory=memory))
+    records.append(record)
+    print(f"{name:>8} | {num_rows:>9} | {stage:>22} | {record['seconds']:>10.4f} | {record.get('peak_mib', float('nan')):>10.1f}", flush=True)
+  return records
+
+def environment():
+  try:
+    commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+  except OSError:
+    commit = ''
+  return {
+    'commit': commit,
+    'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    'python': platform.python_version(),
+    'numpy': np.__version__,
+    'platform': platform.platform(),
+    'cpus': os.cpu_count(),
+  }
+
+def compare(records, baseline_file):
+  # time ratio of every stage present in both runs, above 1 is slower than the baseline
+  with open(baseline_file) as baseline_f:
+    baseline = {(r['dataset'], r['rows'], r['stage']): r for r in json.load(baseline_f)['results']}
+  print(f"\n{'dataset':>8} | {'rows':>9} | {'stage':>22} | {'baseline (s)':>12} | {'now (s)':>10} | {'ratio':>6}")
+  for record in records:
+    old = baseline.get((record['dataset'], record['rows'], record['stage']))
+    if old:
+      print(f"{record['dataset']:>8} | {record['rows']:>9} | {record['stage']:>22} | {old['seconds']:>12.4f} | "
+            f"{record['seconds']:>10.4f} | {record['seconds'] / old['seconds']:>6.2f}")
+
+def main():
+  options = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+  sizes = [int(size) for size in options['--sizes'].split(',')] if '--sizes' in options else SIZES
+  datasets = options['--datasets'].split(',') if '--datasets' in options else list(registry.SCHEMAS)
+  output_file = options.get('--output', os.path.join(RESULTS_DIR, 'benchmark_results.json'))
+  repeat = int(options.get('--repeat', 1))
+  memory = options.get('--memory', '1') != '0'    # 0 skips the traced runs
+
+  print(f"{'dataset':>8} | {'rows':>9} | {'stage':>22} | {'time (s)':>10} | {'peak (MiB)':>10}")
+  records = []
+  for num_rows in sizes:
+    for name in datasets:
+      records += run_dataset(name, num_rows, repeat, memory)
+
+  os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+  with open(output_file, 'w') as out_f:
+    json.dump({'environment': environment(), 'sizes': sizes, 'results': records}, out_f, indent=1)
+  print(f"Results written to {output_file}")
+  if '--compare' in options:
+    compare(records, options['--compare'])
+
+if __name__ == "__main__":
+  main()
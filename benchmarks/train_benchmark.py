@@ -0,0 +1,27 @@
+import sys
+import numpy as np
+from classes.cancer import Cancer
+from benchmarks import bench_functions as bf
+
+def loop_trainer(learnable_class, examples):
+  learnable_class.naive_bayes_trainer([learnable_class(e, True) for e in examples])
+
+def main():
+  sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5, 10**6]
+  learnable_class = Cancer
+
+  print(f"{'rows':>10} | {'loop (s)':>10} | {'array (s)':>10} | {'speedup':>8}")
+  for n in sizes:
+    examples = bf.synthetic_examples(learnable_class, n)
+
+    loop_time = bf.best_time(loop_trainer, learnable_class, examples, repeat=1)
+    loop_prior, loop_tensor = learnable_class.class_prior, learnable_class.prob_tensor
+
+    array_time = bf.best_time(learnable_class.naive_bayes_array_trainer, examples)
+    assert np.allclose(loop_prior, learnable_class.class_prior)
+    assert np.allclose(loop_tensor, learnable_class.prob_tensor)
+
+    print(f"{n:>10} | {loop_time:>10.4f} | {array_time:>10.4f} | {loop_time / array_time:>7.1f}x")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,72 @@
+import numpy as np
+
+class Dataset:
+  """
+  Columnar container holding a whole set of examples as contiguous NumPy arrays
+  instead of one LearnableNB object per row.
+  """
+
+  __slots__ = ('features', 'labels', 'predictions', 'learnable_class')
+
+  # CONSTRUCTOR
+  def __init__(self, features: np.array(int), labels: np.array(int), learnable_class: type = None):
+    self.features = np.ascontiguousarray(features, dtype=int)    # row: example, column: attribute
+    self.labels = np.ascontiguousarray(labels, dtype=int)        # true class id of each example
+    self.predictions = np.full(len(self.labels), -1, dtype=int)  # predicted class id of each example, -1 until classified
+    self.learnable_class = learnable_class                       # LearnableNB subclass used for per-row views
+
+  @classmethod
+  def from_examples(cls, examples: np.array(int), learnable_class: type = None):
+    """
+    Splits an example matrix in the processed format into features and labels.
+
+    Parameters:
+        examples (numpy.ndarray): 2D integer array, one example per row with the class id in the last column.
+        learnable_class (type): LearnableNB subclass used for per-row views.
+
+    Returns:
+        Dataset: the columnar dataset.
+    """
+    examples = np.asarray(examples)
+    return cls(examples[:, :-1], examples[:, -1], learnable_class)
+
+  def __len__(self):
+    return len(self.labels)
+
+  def take(self, indices):
+    """
+    Returns a new Dataset holding the given rows.
+
+    Parameters:
+        indices (numpy.ndarray): integer indices or boolean mask of the rows to keep.
+    """
+    subset = Dataset(self.features[indices], self.labels[indices], self.learnable_class)
+    subset.predictions[:] = self.predictions[indices]
+    return subset
+
+  def to_examples(self):
+    """
+    Returns: numpy.ndarray: 2D integer array in the processed format, with the class id in the last column.
+    """
+    return np.column_stack((self.features, self.labels))
+
+  def view(self, index: int):
+    """
+    Builds a LearnableNB object for one row, classified with its prediction if it has one.
+
+    Parameters:
+        index (int): row of the example.
+
+    Returns:
+        LearnableNB: instance of learnable_class for the row.
+    """
+    example = self.learnable_class(np.append(self.features[index], self.labels[index]), False)
+    if self.predictions[index] >= 0:
+      example.set_class(int(self.predictions[index]))
+    return example
+
+  def views(self):
+    """
+    Returns: list of LearnableNB: one object per row, for code that still works with the per-row API.
+    """
+    return [self.view(i) for i in range(len(self))]
@@ -0,0 +1,73 @@
+import numpy as np
+from utils import processor_functions as pf
+
+class Discretizer:
+  """
+  Fitted binning of continuous attributes. The bin edges are learned once, saved to a small .npz file and
+  loaded back, so new rows are binned exactly like the training data with O(log bins) work per value.
+  """
+
+  strategies: tuple[str, ...] = ('frequency', 'quantile', 'uniform')
+
+  # CONSTRUCTOR
+  def __init__(self, num_bins: int = 15, strategy: str = 'frequency'):
+    if strategy not in self.strategies:
+      raise ValueError(f"Unknown binning strategy '{strategy}', expected one of {self.strategies}.")
+    self.num_bins = num_bins
+    self.strategy = strategy
+    self.edges: np.array = None    # row i holds the sorted bin edges of attribute i
+
+  def fit(self, features: np.array(float)):
+    """
+    Learns the bin edges of every attribute.
+    'frequency' places the same number of examples in every bin like get_attribute_bins,
+    'quantile' interpolates the edges with one np.quantile call and 'uniform' splits each range into equal widths.
+
+    Parameters:
+        features (numpy.ndarray): 2D array where each row is an example and each column an attribute, without the class.
+
+    Returns:
+        Discretizer: the discretizer itself.
+    """
+    features = np.asarray(features, dtype=float)
+    if self.strategy == 'frequency':
+      self.edges = pf.get_bin_edges(features, self.num_bins, has_class=False)
+    elif self.strategy == 'quantile':
+      self.edges = np.quantile(features, np.linspace(0, 1, self.num_bins + 1), axis=0).T
+    else:
+      self.edges = np.linspace(features.min(axis=0), features.max(axis=0), self.num_bins + 1).T
+    self.edges = np.ascontiguousarray(self.edges)
+    return self
+
+  def transform(self, features: np.array(float)):
+    """
+    Parameters:
+        features (numpy.ndarray): 2D array with one column per fitted attribute.
+
+    Returns:
+        numpy.ndarray: 2D integer array of bin numbers.
+    """
+    return pf.bin_attributes(np.atleast_2d(features), self.edges).astype(int)
+
+  def fit_transform(self, features: np.array(float)):
+    return self.fit(features).transform(features)
+
+  def save(self, path: str):
+    """
+    Writes the bin edges to an uncompressed .npz file.
+    """
+    np.savez(path, edges=self.edges, num_bins=self.num_bins, strategy=self.strategy)
+
+  @classmethod
+  def load(cls, path: str):
+    """
+    Reads a discretizer written by save.
+    """
+    with np.load(path) as saved:
+      discretizer = cls(int(saved['num_bins']), str(saved['strategy']))
+      discretizer.edges = saved['edges']
+    return discretizer
+
+  def __str__(self):
+    # human-readable documentation in the format of get_bin_string
+    return pf.get_bin_string([{(e[j], e[j + 1]): j for j in range(len(e) - 1)} for e in self.edges])
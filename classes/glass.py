@@ -1,22 +1,18 @@
 import numpy as np
 from classes.learnablenb import LearnableNB
-from utils import processor_functions as pf
+from classes.registry import SCHEMAS
 
 class Glass(LearnableNB):
 
-  class_names: list[str] = [
-    "building_windows_float_processed",
-    "building_windows_non_float_processed",
-    "vehicle_windows_float_processed",
-    "vehicle_windows_non_float_processed",
-    "containers",
-    "tableware",
-    "headlamps"
-  ]
+  __slots__ = ()
+
+  schema = SCHEMAS['glass']  # columns, vocabularies, missing values and binning of the raw file
+
+  class_names: list[str] = schema.class_names
 
   num_classes: int = len(class_names) # number of classes
-  num_attributes: int = 9 # number of attributes (excluding the class feature)
-  num_bins: int = 15 # arbitrary number of bins used for discretizing continuous values
+  num_attributes: int = schema.num_attributes # number of attributes (excluding the class feature)
+  num_bins: int = schema.num_bins # arbitrary number of bins used for discretizing continuous values
 
   class_prior: np.array = np.zeros(num_classes)
   prob_tensor: np.array = np.ones((num_classes, num_attributes, num_bins)) #initialized to all 1's for smoothing
@@ -25,27 +21,13 @@ class Glass(LearnableNB):
     super().__init__(attributes, classify)
 
   @staticmethod
-  def process_data(lines: list[str]):
+  def process_data(raw: bytes | list[str], rng: np.random.Generator = None):
     """
-    Process raw_data lines by binning attributes and shuffling examples.
-    Parameters: lines (list of str): Raw raw_data lines from the input file.
-    Returns: tuple: (processed_lines, documentation) where:
-            - processed_lines is a list of strings with processed raw_data.
-            - documentation is a string describing the binning information.
+    Process raw_data by binning attributes and shuffling examples, as described by the schema.
+    Parameters: raw (bytes | list of str): Raw raw_data file contents or lines from the input file.
+                rng (numpy.random.Generator | int): random generator or seed used for missing values, the shuffle and the noise.
+    Returns: tuple: (clean_examples, noisy_examples, discretizer) where:
+            - clean_examples and noisy_examples are 2D integer arrays with the class id in the last column.
+            - discretizer is the fitted Discretizer holding the bin edges, str() gives the binning documentation.
     """
-    processed_lines = []
-    for i in range(len(lines)):
-      line = lines[i].strip().split(',')
-      line.pop(0)  # remove sample id from front of line
-      line[-1] = int(line[-1]) - 1
-      processed_lines.append(line)
-    examples = np.array(processed_lines, dtype=float)  # ensure class uses a digit id, get a matrix of floats
-    bins = pf.get_attribute_bins(examples, Glass.num_bins)  # get list of attribute bin edges
-    binned_examples = pf.bin_attributes(examples, bins)  # bin the example values
-    np.random.shuffle(binned_examples)  # ensure raw_data is in random order to eliminate bias
-    noisy_examples = pf.add_noise(binned_examples, 0.10)  # add noise to class, get a matrix of floats
-    clean_lines = pf.array_to_lines(binned_examples)    # get list of strings in proper format
-    noisy_lines = pf.array_to_lines(noisy_examples) # get list of strings in proper format
-    documentation = pf.get_bin_string(bins) # get string for documenting binning information
-
-    return clean_lines, noisy_lines, documentation
\ No newline at end of file
+    return Glass.schema.process(raw, rng)
\ No newline at end of file
@@ -1,16 +1,26 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from classes.dataset import Dataset
+from classes.nbmodel import NBModel
+from classes.online_nbmodel import OnlineNBModel
+from classes.sparse_nbmodel import SparseNBModel
+from utils import kernel_functions as kf
+from utils import metrics
 
 class LearnableNB(ABC):
 
+  __slots__ = ('attributes', 'class_id', 'class_name')    # per-row objects are only views over a Dataset, keep them small
+
   class_names: list[str] = []
   num_classes: int = len(class_names)                             # number of classes
   num_attributes: int = 0                                         # number of attributes (excluding the class attribute)
   domain_values: tuple[int, int] = (0,0)                          # range of possible discrete values
   num_values: int = domain_values[-1] - domain_values[0] + 1      # number of possible discrete values
   num_bins: int = 0                                               # number of possible discrete bins
+  alpha: float = 1.0                                              # additive smoothing of the likelihoods, 1 is Laplace smoothing
+  schema: 'DatasetSchema' = None                                  # description of the raw data file, see classes.registry
 
-  class_prior: np.array   #initialized to all 0's
+  class_prior: np.array   #initialized to all 0's, set by the class level trainers; NBModel holds per-model state
   prob_tensor: np.array   #initialized to all 1's for smoothing
 
   ##################################################################################
@@ -49,8 +59,14 @@ class LearnableNB(ABC):
       self.class_id = None
 
   @classmethod
-  def naive_bayes_trainer(cls, training_examples: list['LearnableNB']):
+  def naive_bayes_trainer(cls, training_examples: list['LearnableNB'] | Dataset):
+    if isinstance(training_examples, Dataset):
+      cls.naive_bayes_dataset_trainer(training_examples)
+      return
     n = len(training_examples)
+    # start from fresh state so consecutive calls (e.g. cross validation folds) do not add onto each other's counts
+    cls.class_prior = np.zeros(cls.num_classes)
+    cls.prob_tensor = np.full((cls.num_classes, cls.num_attributes, cls.domain_size()), float(cls.alpha))
     #1. For each class in the training set, calculate the class prior probability Q(C=c_i)
     for e in training_examples:
       cls.class_prior[e.class_id] += 1    # counts occurrences of class
@@ -70,13 +86,80 @@ class LearnableNB(ABC):
         value_counts = cls.prob_tensor[c_id][attr_id]    # index of the array is the attribute value, count of the value is contained in the array
         total_count = np.sum(value_counts)
         if total_count> 0:  # check that nothing went wrong
-          n_ci = total_count
-          d = LearnableNB.num_values
-          # plus 1 in the numerator is handled with the initialization of prob_tensor to all 1's
-          cls.prob_tensor[c_id][attr_id] /= (n_ci + d)    # changes counts to probabilities
+          # plus alpha in the numerator is handled with the initialization of prob_tensor to all alphas,
+          # so the total is already n_ci + alpha * V
+          cls.prob_tensor[c_id][attr_id] /= total_count    # changes counts to probabilities
+
+  @classmethod
+  def naive_bayes_array_trainer(cls, training_examples: np.array(int)):
+    """
+    Trains the class directly from an integer example matrix instead of a list of LearnableNB objects.
+    Gives the same smoothed probabilities as naive_bayes_trainer on freshly initialized class state,
+    but replaces the trained state instead of adding onto the counts of a previous call.
+
+    Parameters:
+        training_examples (numpy.ndarray): 2D integer array, one example per row with the class id in the last column.
+    """
+    training_examples = np.asarray(training_examples, dtype=int)
+    cls.naive_bayes_dataset_trainer(Dataset(training_examples[:, :cls.num_attributes], training_examples[:, -1]))
+
+  @classmethod
+  def naive_bayes_dataset_trainer(cls, training_set: Dataset):
+    """
+    Trains the class from the feature and label arrays of a Dataset, see naive_bayes_array_trainer.
+
+    Parameters:
+        training_set (Dataset): the training examples.
+    """
+    model = cls.new_model().fit(training_set)
+    cls.class_prior = model.class_prior
+    cls.prob_tensor = model.prob_tensor
 
   @classmethod
-  def naive_bayes_classifier(cls, test_examples: list['LearnableNB']):
+  def new_model(cls, alpha: float = None):
+    """
+    Parameters:
+        alpha (float): additive smoothing, the class's alpha by default.
+
+    Returns: NBModel: an untrained model of this class that owns its own counts and probabilities.
+    """
+    return NBModel(cls, alpha)
+
+  @classmethod
+  def new_online_model(cls, alpha: float = None, decay: float = None, window: int = None):
+    """
+    Parameters:
+        alpha (float): additive smoothing, the class's alpha by default.
+        decay (float): weight of the counts learned before each update, e.g. 0.99.
+        window (int): number of most recent batches counted instead.
+
+    Returns: OnlineNBModel: an untrained model that is kept current with update and forget on drifting data.
+    """
+    return OnlineNBModel(cls, alpha, decay=decay, window=window)
+
+  @classmethod
+  def new_sparse_model(cls, alpha: float = None, domain_sizes: np.array(int) = None):
+    """
+    Parameters:
+        alpha (float): additive smoothing, the class's alpha by default.
+        domain_sizes (numpy.ndarray): number of values of each attribute, domain_size() for all by default.
+
+    Returns: SparseNBModel: an untrained model that only stores the counts of observed values, for large domains.
+    """
+    return SparseNBModel(cls, alpha, domain_sizes)
+
+  @classmethod
+  def domain_size(cls):
+    """
+    Returns: int: the number of discrete values an attribute can take, i.e. the last dimension of prob_tensor.
+    """
+    return cls.num_bins if cls.num_bins else cls.num_values
+
+  @classmethod
+  def naive_bayes_classifier(cls, test_examples: list['LearnableNB'] | Dataset):
+    if isinstance(test_examples, Dataset):
+      test_examples.predictions[:], _ = cls.naive_bayes_batch_classifier(test_examples.features)
+      return test_examples
     classified_examples = []
     C = [0] * cls.num_classes
     for e in test_examples:
@@ -93,35 +176,49 @@ class LearnableNB(ABC):
       classified_examples.append(e)
     return classified_examples
 
+  @classmethod
+  def naive_bayes_batch_classifier(cls, test_examples: np.array(int)):
+    """
+    Classifies a whole integer example matrix at once in log space, which avoids underflow on wide tables.
+    Only the first num_attributes columns are read, so a trailing class column is ignored.
+
+    Parameters:
+        test_examples (numpy.ndarray): 2D integer array of shape (n, num_attributes) or (n, num_attributes + 1).
+
+    Returns:
+        tuple: (class_ids, posteriors) where:
+            - class_ids is a 1D integer array of predicted class ids.
+            - posteriors is a 2D float array of shape (n, num_classes) holding each class's log posterior.
+    """
+    with np.errstate(divide='ignore'):    # unseen classes have a prior of 0 and a log prior of -inf
+      log_prior = np.log(cls.class_prior)
+      log_prob = np.log(cls.prob_tensor)
+    return kf.predict(log_prior, log_prob, test_examples)
+
 ###################################################################################
 
   @staticmethod
-  def zero_one_loss(classified_examples: list['LearnableNB']):
-    total = len(classified_examples)
-    correct = sum([e.attributes[-1] == e.class_id for e in classified_examples])
-    loss = 1 - correct / total
+  def confusion_matrix(classified_examples: list['LearnableNB'] | Dataset):
+    """
+    Builds the confusion matrix of classified examples, entry (i, j) counts examples of class i predicted as class j.
+    """
+    if isinstance(classified_examples, Dataset):
+      true, pred = classified_examples.labels, classified_examples.predictions
+      learnable_class = classified_examples.learnable_class
+      num_classes = learnable_class.num_classes if learnable_class else int(max(true.max(), pred.max())) + 1
+    else:
+      true = np.array([e.attributes[-1] for e in classified_examples], dtype=int)
+      pred = np.array([e.class_id for e in classified_examples], dtype=int)
+      num_classes = classified_examples[0].num_classes
+    return metrics.confusion_matrix(true, pred, num_classes)
 
-    return loss
+  @staticmethod
+  def zero_one_loss(classified_examples: list['LearnableNB'] | Dataset):
+    return metrics.zero_one_loss(LearnableNB.confusion_matrix(classified_examples))
 
   @staticmethod
-  def f1_score_loss(classified_examples: list['LearnableNB']):
-    num_classes = classified_examples[0].num_classes
-    score = 0
-    counts = {}
-    scores = {}
-    for c in range(num_classes):
-      counts[c] = {'TP': 0, 'FP': 0, 'FN': 0}
-      scores[c] = {'precision': 0.0, 'recall': 0.0, 'f1_score': 0.0}
-      for e in classified_examples:
-        counts[c]['TP'] += int(e.class_id == c and e.attributes[-1] == e.class_id)
-        counts[c]['FP'] += int(e.class_id == c and e.attributes[-1] != e.class_id)
-        counts[c]['FN'] += int(e.attributes[-1] == c and e.attributes[-1] != e.class_id)
-
-      scores[c]['precision'] = 0 if not (counts[c]['TP'] + counts[c]['FP']) else counts[c]['TP'] / (counts[c]['TP'] + counts[c]['FP'])
-      scores[c]['recall'] = 0 if not (counts[c]['TP'] + counts[c]['FN']) else counts[c]['TP'] / (counts[c]['TP'] + counts[c]['FN'])
-      scores[c]['f1_score'] = (2 * scores[c]['precision'] * scores[c]['recall']) / (scores[c]['precision'] + scores[c]['recall'])
-      score += scores[c]['f1_score']
-
-    return 1 - score / num_classes
+  def f1_score_loss(classified_examples: list['LearnableNB'] | Dataset):
+    # classes with zero precision and recall contribute an F1 score of 0
+    return metrics.f1_score_loss(LearnableNB.confusion_matrix(classified_examples))
 #########################################################################
 
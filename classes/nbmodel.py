@@ -0,0 +1,262 @@
+import threading
+import numpy as np
+from classes.dataset import Dataset
+from utils import nb_functions as nbf
+from utils import kernel_functions as kf
+from utils import artifact
+
+class NBModel:
+  """
+  Fitted naive Bayes model that owns its count and probability arrays, so several models of the same
+  LearnableNB subclass can be trained and served at once without sharing class level state.
+  Counts are the source of truth; probabilities are derived from them when first needed after a change.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, learnable_class: type, alpha: float = None, num_values: int = None):
+    self.learnable_class = learnable_class
+    self.num_classes: int = learnable_class.num_classes
+    self.num_attributes: int = learnable_class.num_attributes
+    self.num_values: int = num_values or learnable_class.domain_size()    # e.g. another bin count than the class's
+    self.alpha: float = learnable_class.alpha if alpha is None else alpha    # additive (Laplace) smoothing
+    if not self.alpha > 0:    # with alpha = 0 a class without training examples gets nan likelihoods, which win the argmax
+      raise ValueError(f"alpha must be positive, got {self.alpha}.")
+    self._lock = threading.Lock()    # guards swapping counts and the cached probabilities
+    self.reset()
+
+  def reset(self):
+    """
+    Discards everything learned so far.
+    """
+    with self._lock:
+      self.class_counts = np.zeros(self.num_classes, dtype=np.int64)
+      self.value_counts = np.zeros((self.num_classes, self.num_attributes, self.num_values), dtype=np.int64)
+      self._owns_counts = True    # False while the counts are arrays passed to set_counts, which update must not modify
+      self._probabilities = None
+    return self
+
+  def fit(self, training_set: Dataset, rows: np.array(int) = None):
+    """
+    Trains the model from scratch on a Dataset.
+
+    Parameters:
+        training_set (Dataset): the training examples.
+        rows (numpy.ndarray): indices or boolean mask of the examples to train on, e.g. from fold_functions.train_rows.
+                              They are gathered chunk by chunk instead of being copied into a new Dataset.
+
+    Returns:
+        NBModel: the model itself.
+    """
+    return self.fit_arrays(training_set.features, training_set.labels, rows)
+
+  def fit_arrays(self, features: np.array(int), labels: np.array(int), rows: np.array(int) = None):
+    """
+    Trains the model from scratch on a feature matrix and its labels, e.g. column views of a shared example matrix.
+
+    Parameters:
+        features (numpy.ndarray): 2D integer array of shape (n, num_attributes).
+        labels (numpy.ndarray): 1D integer array of class ids.
+        rows (numpy.ndarray): indices or boolean mask of the examples to train on, all examples by default.
+
+    Returns:
+        NBModel: the model itself.
+    """
+    class_counts = nbf.count_classes(labels, self.num_classes, rows)
+    value_counts = kf.count_values(features, labels, self.num_classes, self.num_values, rows=rows)
+    self.set_counts(class_counts, value_counts)
+    self._owns_counts = True    # freshly counted, not shared with the caller
+    return self
+
+  def partial_fit(self, training_examples: np.array(int) | Dataset):
+    """
+    Adds a batch of examples to the counts learned so far, e.g. one chunk of a file too large for memory, see update.
+
+    Returns:
+        NBModel: the model itself.
+    """
+    return self.update(training_examples)
+
+  def update(self, batch: np.array(int) | Dataset):
+    """
+    Adds a batch of examples to the raw counts. Only the cells of the batch are touched, so an update costs
+    O(batch) whatever the size of the model; the probabilities are recomputed on the next query.
+
+    Parameters:
+        batch (numpy.ndarray | Dataset): the batch, as a Dataset or an example matrix with the class id in the last column.
+
+    Returns:
+        NBModel: the model itself.
+
+    Raises:
+        IndexError: if a class id or an attribute value is outside of the model's classes or domain.
+    """
+    self._add_cells(*self._batch_cells(batch), 1)
+    return self
+
+  def forget(self, batch: np.array(int) | Dataset):
+    """
+    Removes a batch that was added with update (or fit) from the raw counts, e.g. the oldest batch of a window.
+
+    Parameters:
+        batch (numpy.ndarray | Dataset): the same examples as given to update.
+
+    Returns:
+        NBModel: the model itself.
+
+    Raises:
+        ValueError: if a count would become negative, i.e. the batch was never learned; the counts are left unchanged.
+        IndexError: if a class id or an attribute value is outside of the model's classes or domain.
+    """
+    self._add_cells(*self._batch_cells(batch), -1)
+    return self
+
+  def _batch_cells(self, batch):
+    # the classes and flat (class, attribute, value) cells a batch counts, see nb_functions.add_counts:
+    # (class ids, None, cells, None) with one entry per occurrence for a batch smaller than the model,
+    # otherwise the batch is counted chunk by chunk and only its nonzero cells are kept, with their counts
+    if not isinstance(batch, Dataset):
+      batch = Dataset.from_examples(batch)
+    features = batch.features[:, :self.num_attributes]
+    # flattened cells of values outside of the model would land in another attribute's or class's cells
+    nbf._check_range(batch.labels, self.num_classes, "class id outside of the model's classes")
+    nbf._check_range(features, self.num_values, "attribute value outside of the model's domain")
+    if len(batch) * self.num_attributes <= self.value_counts.size:
+      labels = batch.labels.astype(np.intp)
+      return labels, None, nbf.value_indices(features, labels, self.num_values), None
+    class_counts = nbf.count_classes(batch.labels, self.num_classes)
+    value_counts = kf.count_values(features, batch.labels, self.num_classes, self.num_values).reshape(-1)
+    classes, cells = np.flatnonzero(class_counts), np.flatnonzero(value_counts)
+    return classes, class_counts[classes], cells, value_counts[cells]
+
+  def _add_cells(self, classes, class_multiplicity, cells, cell_multiplicity, weight):
+    # adds weight to the given cells in place, so the cost is proportional to the batch and not to the model
+    with self._lock:
+      if not self._owns_counts:    # copy on first write
+        self.class_counts, self.value_counts = self.class_counts.copy(), self.value_counts.copy()
+        self._owns_counts = True
+      flat_counts = self.value_counts.reshape(-1)
+      nbf.add_counts(self.class_counts, classes, weight, class_multiplicity)
+      nbf.add_counts(flat_counts, cells, weight, cell_multiplicity)
+      if weight < 0 and ((self.class_counts[classes] < 0).any() or (flat_counts[cells] < 0).any()):
+        nbf.add_counts(self.class_counts, classes, -weight, class_multiplicity)
+        nbf.add_counts(flat_counts, cells, -weight, cell_multiplicity)
+        raise ValueError("Cannot forget examples that were not learned, a count would become negative.")
+      self._probabilities = None
+
+  def fit_stream(self, chunks):
+    """
+    Trains the model from scratch on an iterable of batches, holding only one batch in memory at a time.
+
+    Parameters:
+        chunks (iterable): batches accepted by partial_fit, e.g. from stream_functions.iter_chunks.
+
+    Returns:
+        NBModel: the model itself.
+    """
+    self.reset()
+    for chunk in chunks:
+      self.partial_fit(chunk)
+    return self
+
+  def set_counts(self, class_counts: np.array(int), value_counts: np.array(int)):
+    """
+    Replaces the counts of the model, e.g. with counts computed elsewhere.
+
+    Parameters:
+        class_counts (numpy.ndarray): 1D array with the count of each class.
+        value_counts (numpy.ndarray): 3D array of (class, attribute, value) counts.
+
+    Returns:
+        NBModel: the model itself.
+    """
+    with self._lock:
+      self.class_counts = class_counts
+      self.value_counts = value_counts
+      self._owns_counts = False
+      self._probabilities = None
+    return self
+
+  def current_counts(self):
+    """
+    Returns: tuple: (class_counts, value_counts) that the probabilities are derived from.
+    """
+    return self.class_counts, self.value_counts
+
+  def probabilities(self):
+    """
+    Returns: tuple: (class_prior, prob_tensor, log_prior, log_prob), computed from the counts on first use.
+    The tuple is never modified afterwards, so a caller can keep using it while the model is retrained.
+    """
+    probabilities = self._probabilities
+    if probabilities is None:
+      with self._lock:
+        if self._probabilities is None:
+          class_counts, value_counts = self.current_counts()
+          class_prior = class_counts / class_counts.sum()
+          # (count + alpha) / (n_c + alpha * V), smoothing is only applied here so counts can be reused for any alpha
+          n_ci = value_counts.sum(axis=2, keepdims=True)
+          with np.errstate(divide='ignore', invalid='ignore'):    # unseen classes have a prior of 0 and a log prior of -inf
+            prob_tensor = (value_counts + self.alpha) / (n_ci + self.alpha * self.num_values)
+            self._probabilities = (class_prior, prob_tensor, np.log(class_prior), np.log(prob_tensor))
+        probabilities = self._probabilities
+    return probabilities
+
+  @property
+  def class_prior(self):
+    return self.probabilities()[0]
+
+  @property
+  def prob_tensor(self):
+    return self.probabilities()[1]
+
+  def log_posteriors(self, features: np.array(int)):
+    """
+    Parameters:
+        features (numpy.ndarray): 2D integer array of shape (n, num_attributes).
+
+    Returns:
+        numpy.ndarray: 2D float array of shape (n, num_classes) holding each class's log posterior.
+    """
+    _, _, log_prior, log_prob = self.probabilities()
+    return kf.predict(log_prior, log_prob, features)[1]
+
+  def predict(self, test_examples: np.array(int) | Dataset, rows: np.array(int) = None):
+    """
+    Classifies a feature matrix, or a Dataset whose predictions are filled in.
+
+    Parameters:
+        test_examples (numpy.ndarray | Dataset): the examples to classify.
+        rows (numpy.ndarray): indices or boolean mask of a feature matrix's examples to classify, all by default.
+
+    Returns:
+        numpy.ndarray: 1D integer array of predicted class ids.
+    """
+    _, _, log_prior, log_prob = self.probabilities()
+    if isinstance(test_examples, Dataset):
+      test_examples.predictions[:], _ = kf.predict(log_prior, log_prob, test_examples.features)
+      return test_examples.predictions
+    class_ids, _ = kf.predict(log_prior, log_prob, test_examples, rows=rows)
+    return class_ids
+
+  def save(self, path: str, discretizer: 'Discretizer' = None, features: np.array(int) = None):
+    """
+    Exports the fitted model as one binary artifact with the log probabilities, class names, schema and bin edges.
+    The artifact is scored by predict.py without any preprocessing or training code.
+
+    Parameters:
+        path (str): output file, conventionally ending in .nbm.
+        discretizer (Discretizer): the fitted binning of continuous attributes, if any.
+        features (numpy.ndarray): a processed feature matrix stored next to the model, e.g. for the memory
+                                  mapped scoring workers of shared_functions.parallel_predict.
+    """
+    _, _, log_prior, log_prob = self.probabilities()
+    arrays = {'log_prior': log_prior, 'log_prob': log_prob}
+    if discretizer is not None:
+      arrays['bin_edges'] = discretizer.edges
+    if features is not None:
+      arrays['features'] = features
+    schema = self.learnable_class.schema
+    artifact.save(path, arrays, {
+      'class_names': list(self.learnable_class.class_names),
+      'schema': schema.to_dict() if schema is not None else None,
+    })
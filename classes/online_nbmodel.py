@@ -0,0 +1,125 @@
+import numpy as np
+from collections import deque
+from classes.dataset import Dataset
+from classes.nbmodel import NBModel
+
+class OnlineNBModel(NBModel):
+  """
+  NBModel kept current on a stream of batches whose distribution drifts, without retraining from scratch.
+  With a window, only the most recent batches are counted: each update forgets the batch that falls out.
+  With a decay, the counts learned before each update are weighted by decay, so old batches fade away.
+  Either way an update costs O(batch), and the probabilities are only recomputed when they are queried;
+  under decay a query first folds the accumulated scale back into the stored counts, see probabilities.
+  Updates are expected from one thread at a time; queries may come from any thread, see NBModel.
+  """
+
+  RESCALE_LIMIT: float = 1e100    # the decay scale is also folded back between queries before it can overflow
+
+  # CONSTRUCTOR
+  def __init__(self, learnable_class: type, alpha: float = None, num_values: int = None, decay: float = None, window: int = None):
+    if decay is not None and window is not None:
+      raise ValueError("Choose either a decay or a window, not both.")
+    if decay is not None and not 0 < decay <= 1:
+      raise ValueError(f"decay must be in (0, 1], got {decay}.")
+    if window is not None and window < 1:
+      raise ValueError(f"window must be at least 1 batch, got {window}.")
+    self.decay: float = decay      # weight of the existing counts at each update
+    self.window: int = window      # number of most recent batches counted
+    self._batches = deque()        # counted cells of the batches in the window, see NBModel._batch_cells
+    self._scale: float = 1.0       # weight of the newest batch relative to the stored counts under decay
+    super().__init__(learnable_class, alpha, num_values)
+
+  def reset(self):
+    """
+    Discards everything learned so far, including the batches of the window.
+    """
+    super().reset()
+    self._restart()
+    return self
+
+  def set_counts(self, class_counts: np.array(int), value_counts: np.array(int)):
+    """
+    Replaces the counts of the model, see NBModel.set_counts. They become a base that is never forgotten
+    by the window but fades under decay like any batch.
+
+    Returns:
+        OnlineNBModel: the model itself.
+    """
+    super().set_counts(class_counts, value_counts)
+    self._restart()
+    return self
+
+  def _restart(self):
+    # decayed counts are weighted, so they are kept as floats
+    with self._lock:
+      if self.decay is not None and self.value_counts.dtype.kind != 'f':
+        self.class_counts, self.value_counts = self.class_counts.astype(float), self.value_counts.astype(float)
+        self._owns_counts = True
+      self._batches.clear()
+      self._scale = 1.0
+
+  def update(self, batch: np.array(int) | Dataset):
+    """
+    Adds a batch of examples; under a window the oldest batch is forgotten once the window is full,
+    under decay everything learned before counts decay times less.
+
+    Parameters:
+        batch (numpy.ndarray | Dataset): the batch, as a Dataset or an example matrix with the class id in the last column.
+
+    Returns:
+        OnlineNBModel: the model itself.
+    """
+    batch_cells = self._batch_cells(batch)
+    if self.decay is not None:
+      # rather than multiplying every count by decay, the new batch is weighted by 1 / decay per update so far
+      self._scale /= self.decay
+      self._add_cells(*batch_cells, self._scale)
+      if self._scale > self.RESCALE_LIMIT:
+        self._rescale()
+      return self
+
+    self._add_cells(*batch_cells, 1)
+    if self.window is not None:
+      self._batches.append(batch_cells)
+      if len(self._batches) > self.window:
+        self._add_cells(*self._batches.popleft(), -1)
+    return self
+
+  def forget(self, batch: np.array(int) | Dataset):
+    """
+    Removes a batch from the counts, see NBModel.forget. Not available under decay, where the batch's weight is unknown.
+
+    Returns:
+        OnlineNBModel: the model itself.
+    """
+    if self.decay is not None:
+      raise ValueError("Batches cannot be forgotten under decay, they fade away instead.")
+    return super().forget(batch)
+
+  def _rescale(self):
+    # folds the decay scale into the stored counts, O(model) like recomputing the probabilities;
+    # the counts are divided into new arrays, so counts passed to set_counts are never modified
+    with self._lock:
+      if self._scale != 1.0:
+        self.class_counts = self.class_counts / self._scale
+        self.value_counts = self.value_counts / self._scale
+        self._owns_counts = True
+        self._scale = 1.0
+        self._probabilities = None
+
+  def current_counts(self):
+    """
+    Returns: tuple: (class_counts, value_counts) that the probabilities are derived from, the decayed counts under decay.
+    """
+    if self.decay is None or self._scale == 1.0:
+      return self.class_counts, self.value_counts
+    return self.class_counts / self._scale, self.value_counts / self._scale
+
+  def probabilities(self):
+    """
+    Returns: tuple: see NBModel.probabilities. Under decay the scale of the updates since the last query is first
+    folded into the stored counts, so they hold the decayed counts again and never grow with the length of the stream.
+    """
+    if self._probabilities is None and self._scale != 1.0:
+      self._rescale()
+    return super().probabilities()
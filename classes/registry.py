@@ -0,0 +1,149 @@
+import importlib
+import numpy as np
+from classes.schema import DatasetSchema
+
+# every known dataset, described only by data so nothing dataset specific is imported until it is used
+SCHEMAS: dict[str, DatasetSchema] = {schema.name: schema for schema in [
+  DatasetSchema(
+    name='cancer',
+    file_name='breast-cancer-wisconsin.data',
+    class_names=['Benign', 'Malignant'],
+    class_tokens=['2', '4'],
+    id_column=0,
+    attribute_columns=range(1, 10),
+    class_column=10,
+    attribute_type='int',
+    domain_values=(0, 9),
+    value_offset=-1,    # values 1-10 become 0-9
+    missing='?',
+    class_path='classes.cancer.Cancer'
+  ),
+  DatasetSchema(
+    name='glass',
+    file_name='glass.data',
+    class_names=[
+      "building_windows_float_processed",
+      "building_windows_non_float_processed",
+      "vehicle_windows_float_processed",
+      "vehicle_windows_non_float_processed",
+      "containers",
+      "tableware",
+      "headlamps"
+    ],
+    class_tokens=['1', '2', '3', '4', '5', '6', '7'],
+    id_column=0,
+    attribute_columns=range(1, 10),
+    class_column=10,
+    attribute_type='float',
+    num_bins=15,
+    class_path='classes.glass.Glass'
+  ),
+  DatasetSchema(
+    name='votes',
+    file_name='house-votes-84.data',
+    class_names=['republican', 'democrat'],
+    attribute_columns=range(1, 17),
+    class_column=0,
+    attribute_type='categorical',
+    vocabulary=['?', 'y', 'n'],    # ? is not a missing value
+    class_path='classes.votes.Votes'
+  ),
+  DatasetSchema(
+    name='iris',
+    file_name='iris.data',
+    class_names=['Iris-setosa', 'Iris-versicolor', 'Iris-virginica'],
+    attribute_columns=range(0, 4),
+    class_column=4,
+    attribute_type='float',
+    num_bins=15,
+    class_path='classes.iris.Iris'
+  ),
+  DatasetSchema(
+    name='soybean',
+    file_name='soybean-small.data',
+    class_names=['D1', 'D2', 'D3', 'D4'],
+    attribute_columns=range(0, 35),
+    class_column=35,
+    attribute_type='int',
+    domain_values=(0, 6),
+    class_path='classes.soybean.Soybean'
+  ),
+]}
+
+_learnable_classes: dict[str, type] = {}    # resolved LearnableNB subclasses by dataset name
+
+def register(schema: DatasetSchema):
+  """
+  Adds a dataset to the registry, e.g. a new production table that has no dedicated LearnableNB subclass.
+  """
+  SCHEMAS[schema.name] = schema
+  _learnable_classes.pop(schema.name, None)
+
+def get_schema(name: str):
+  """
+  Returns: DatasetSchema: the schema of a dataset, or None if there is none.
+  """
+  return SCHEMAS.get(name)
+
+def find_schema(file_name: str):
+  """
+  Returns: DatasetSchema: the schema whose raw data file is file_name, or None if there is none.
+  """
+  for schema in SCHEMAS.values():
+    if schema.file_name == file_name:
+      return schema
+  return None
+
+def get_learnable_class(name: str):
+  """
+  Resolves the LearnableNB subclass of a dataset on first use. Only that dataset's module is imported,
+  and datasets without a dedicated subclass get one generated from their schema.
+
+  Parameters:
+      name (str): dataset name.
+
+  Returns:
+      type: the LearnableNB subclass, or None if the dataset is unknown.
+  """
+  if name in _learnable_classes:
+    return _learnable_classes[name]
+  schema = SCHEMAS.get(name)
+  if schema is None:
+    return None
+
+  if schema.class_path:
+    module_name, class_name = schema.class_path.rsplit('.', 1)
+    learnable_class = getattr(importlib.import_module(module_name), class_name)
+  else:
+    learnable_class = make_learnable_class(schema)
+  _learnable_classes[name] = learnable_class
+  return learnable_class
+
+def make_learnable_class(schema: DatasetSchema):
+  """
+  Builds a LearnableNB subclass from a schema. The class is reachable as an attribute of this module
+  so it can be pickled by reference into worker processes.
+  """
+  from classes.learnablenb import LearnableNB
+  num_values = schema.domain_values[-1] - schema.domain_values[0] + 1
+  return type(schema.class_name, (LearnableNB,), {
+    '__slots__': (),
+    '__module__': __name__,
+    'schema': schema,
+    'class_names': schema.class_names,
+    'num_classes': len(schema.class_names),
+    'num_attributes': schema.num_attributes,
+    'domain_values': schema.domain_values,
+    'num_values': num_values,
+    'num_bins': schema.num_bins,
+    'class_prior': np.zeros(len(schema.class_names)),
+    'prob_tensor': np.ones((len(schema.class_names), schema.num_attributes, num_values)),
+    'process_data': staticmethod(schema.process),
+  })
+
+def __getattr__(class_name: str):
+  # resolves generated classes when they are unpickled in a worker process
+  for schema in SCHEMAS.values():
+    if not schema.class_path and schema.class_name == class_name:
+      return get_learnable_class(schema.name)
+  raise AttributeError(f"module '{__name__}' has no attribute '{class_name}'")
@@ -0,0 +1,126 @@
+import numpy as np
+from classes.discretizer import Discretizer
+from utils import processor_functions as pf
+from utils import parse_functions as psf
+from utils import profiling
+
+class DatasetSchema:
+  """
+  Declarative description of a raw dataset file: its columns, class column, categorical vocabularies,
+  missing value policy and binning. The schema drives the generic loader, so a new table only needs a schema.
+  """
+
+  attribute_types: tuple[str, ...] = ('int', 'float', 'categorical')
+  missing_policies: tuple[str, ...] = ('random',)    # 'random': uniform random value from domain_values
+
+  # CONSTRUCTOR
+  def __init__(self, name: str, file_name: str, class_names: list[str], attribute_columns: list[int], class_column: int,
+               attribute_type: str = 'int', id_column: int = None, class_tokens: list[str] = None,
+               vocabulary: list[str] = None, domain_values: tuple[int, int] = None, value_offset: int = 0,
+               missing: str = None, missing_policy: str = 'random', num_bins: int = 0, binning: str = 'frequency',
+               class_path: str = None):
+    if attribute_type not in self.attribute_types:
+      raise ValueError(f"Unknown attribute type '{attribute_type}', expected one of {self.attribute_types}.")
+    if missing_policy not in self.missing_policies:
+      raise ValueError(f"Unknown missing value policy '{missing_policy}', expected one of {self.missing_policies}.")
+    if attribute_type == 'float' and not num_bins:
+      raise ValueError(f"Continuous attributes of '{name}' need num_bins.")
+
+    self.name = name                                   # short name used on the command line and in output files
+    self.file_name = file_name                         # raw data file name in raw_data/
+    self.class_names = class_names                     # class names, a class id is its index
+    self.class_tokens = class_tokens or class_names    # class column tokens in the raw file, in class id order
+    self.attribute_columns = list(attribute_columns)   # raw file columns of the attributes, in attribute order
+    self.class_column = class_column                   # raw file column of the class
+    self.id_column = id_column                         # raw file column of the sample id, ignored
+    self.attribute_type = attribute_type               # 'int', 'float' (binned) or 'categorical'
+    self.vocabulary = vocabulary                       # tokens of categorical attributes, a value is its index
+    self.value_offset = value_offset                   # added to int attributes so values start at 0
+    self.missing = missing                             # token marking a missing value
+    self.missing_policy = missing_policy               # how missing values are filled in
+    self.num_bins = num_bins                           # number of bins for continuous attributes
+    self.binning = binning                             # Discretizer strategy
+    self.class_path = class_path                       # 'module.Class' of a dedicated LearnableNB subclass, if any
+
+    if domain_values is None:
+      domain_values = (0, len(vocabulary) - 1) if vocabulary else (0, num_bins - 1)
+    self.domain_values = domain_values                 # range of possible discrete values after processing
+
+  @property
+  def num_columns(self):
+    # number of columns of the raw data file
+    return max(self.attribute_columns + [self.class_column] + ([self.id_column] if self.id_column is not None else [])) + 1
+
+  def to_dict(self):
+    """
+    Returns: dict: the JSON serializable fields needed to parse new rows, stored in model artifacts.
+    """
+    return {
+      'name': self.name,
+      'class_names': self.class_names,
+      'attribute_columns': self.attribute_columns,
+      'class_column': self.class_column,
+      'num_columns': self.num_columns,
+      'attribute_type': self.attribute_type,
+      'vocabulary': self.vocabulary,
+      'domain_values': list(self.domain_values),
+      'value_offset': self.value_offset,
+      'missing': self.missing,
+    }
+
+  @property
+  def num_attributes(self):
+    return len(self.attribute_columns)
+
+  @property
+  def class_name(self):
+    # name of the LearnableNB subclass generated for schemas without a dedicated one
+    return ''.join(part.capitalize() for part in self.name.replace('-', '_').split('_'))
+
+  def load(self, raw, rng: np.random.Generator = None):
+    """
+    Parses a raw data file into an example matrix.
+
+    Parameters:
+        raw (bytes | list of str): Raw raw_data file contents or lines from the input file.
+        rng (numpy.random.Generator): random generator used for missing values.
+
+    Returns:
+        numpy.ndarray: 2D array, one example per row with the class id in the last column.
+    """
+    if self.attribute_type == 'categorical':
+      attributes = psf.read_categorical(raw, self.attribute_columns, self.vocabulary)
+    else:
+      attributes, missing = psf.read_numeric(raw, self.attribute_columns, int if self.attribute_type == 'int' else float, self.missing)
+      attributes = attributes + self.value_offset
+      if missing.any():
+        attributes = psf.fill_missing(attributes, missing, *self.domain_values, rng=rng)
+    class_ids = psf.read_categorical(raw, [self.class_column], self.class_tokens)
+    return np.column_stack((attributes, class_ids))
+
+  def process(self, raw, rng: np.random.Generator = None):
+    """
+    Loads a raw data file, bins continuous attributes, shuffles the examples and builds the noisy copy.
+
+    Parameters:
+        raw (bytes | list of str): Raw raw_data file contents or lines from the input file.
+        rng (numpy.random.Generator | int): random generator or seed used for missing values, the shuffle and the noise.
+
+    Returns: tuple: (clean_examples, noisy_examples, discretizer) where:
+            - clean_examples and noisy_examples are 2D integer arrays with the class id in the last column.
+            - discretizer is the fitted Discretizer holding the bin edges, or None if nothing was binned.
+    """
+    rng = np.random.default_rng(rng)
+    with profiling.stage('parse'):
+      examples = self.load(raw, rng)
+    profiling.count('rows_processed', len(examples))
+    discretizer = None
+    if self.num_bins:
+      with profiling.stage('bin'):
+        discretizer = Discretizer(self.num_bins, self.binning)  # bins, edges can be saved and reused for new rows
+        examples = np.column_stack((discretizer.fit_transform(examples[:, :-1]), examples[:, -1]))  # bin the example values
+    with profiling.stage('noise'):
+      examples = examples[rng.permutation(len(examples))]  # ensure raw_data is in random order to eliminate bias
+      noisy_examples = pf.add_noise(examples, 0.10, rng)  # shuffle a tenth of the attributes in a copy
+
+    return examples.astype(int), noisy_examples.astype(int), discretizer
@@ -1,15 +1,19 @@
 import numpy as np
 from classes.learnablenb import LearnableNB
-from utils import processor_functions as pf
+from classes.registry import SCHEMAS
 
 class Soybean(LearnableNB):
 
-  class_names: list[str] = ['D1', 'D2', 'D3', 'D4']
+  __slots__ = ()
 
-  num_classes: int = len(class_names)                             # number of classes
-  num_attributes: int = 35                                          # number of attributes (excluding the class feature)
-  domain_values: tuple[int, int] = (0, 6)                         # range of possible discrete values
-  num_values: int = domain_values[-1] - domain_values[0] + 1      # number of possible discrete values
+  schema = SCHEMAS['soybean']  # columns, vocabularies, missing values and binning of the raw file
+
+  class_names: list[str] = schema.class_names
+
+  num_classes: int = len(class_names) # number of classes
+  num_attributes: int = schema.num_attributes # number of attributes (excluding the class feature)
+  domain_values: tuple[int, int] = schema.domain_values  # range of possible discrete values
+  num_values: int = domain_values[-1] - domain_values[0] + 1 # number of possible discrete values
 
   class_prior: np.array = np.zeros(num_classes)
   prob_tensor: np.array = np.ones((num_classes, num_attributes, num_values)) #initialized to all 1's for smoothing
@@ -18,22 +22,12 @@ class Soybean(LearnableNB):
     super().__init__(attributes, classify)
 
   @staticmethod
-  def process_data(lines: list[str]):
+  def process_data(raw: bytes | list[str], rng: np.random.Generator = None):
     """
-    Process raw_data lines by converting to digits and shuffling examples.
-    Parameters: lines (list of str): Raw raw_data lines from the input file.
-    Returns: processed_lines (list of str): a list of strings with processed raw_data.
+    Process raw_data by converting to digits and shuffling examples, as described by the schema.
+    Parameters: raw (bytes | list of str): Raw raw_data file contents or lines from the input file.
+                rng (numpy.random.Generator | int): random generator or seed used for missing values, the shuffle and the noise.
+    Returns: tuple: (clean_examples, noisy_examples, None) where clean_examples and noisy_examples are 2D integer arrays
+            with the class id in the last column.
     """
-    processed_lines = []
-    for i in range(len(lines)):
-      line = lines[i].strip().split(',')
-      line[-1] = Soybean.class_names.index(line[-1])
-      processed_lines.append(line)
-    examples = np.array(processed_lines, dtype=int)  # ensure class uses a digit id, get a matrix of floats
-    # NO NEED TO BIN OR DOCUMENT since entries are already discrete
-    np.random.shuffle(examples)  # ensure raw_data is in random order to eliminate bias
-    noisy_examples = pf.add_noise(examples, 0.10)  # add noise to class, get a matrix of floats
-    clean_lines = pf.array_to_lines(examples)    # get list of strings in proper format
-    noisy_lines = pf.array_to_lines(noisy_examples) # get list of strings in proper format
-
-    return clean_lines, noisy_lines, None
\ No newline at end of file
+    return Soybean.schema.process(raw, rng)
\ No newline at end of file
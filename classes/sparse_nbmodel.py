@@ -0,0 +1,214 @@
+import threading
+import numpy as np
+from classes.dataset import Dataset
+from classes.nbmodel import NBModel
+from utils import nb_functions as nbf
+from utils import sparse_functions as sf
+
+class SparseNBModel:
+  """
+  Naive Bayes model with the same interface and results as NBModel for attributes with large, uneven domains.
+  Instead of a dense (num_classes, num_attributes, num_values) tensor sized by the largest domain, it stores
+  the counts of the (class, attribute, value) triples that were observed, see utils.sparse_functions,
+  so its memory grows with the distinct values seen in training rather than with the domain sizes.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, learnable_class: type, alpha: float = None, domain_sizes: np.array(int) = None):
+    self.learnable_class = learnable_class
+    self.num_classes: int = learnable_class.num_classes
+    self.num_attributes: int = learnable_class.num_attributes
+    if domain_sizes is None:
+      domain_sizes = np.full(self.num_attributes, learnable_class.domain_size())    # the dense layout
+    self.domain_sizes: np.array(int) = np.asarray(domain_sizes, dtype=np.int64)    # number of values of each attribute
+    self.alpha: float = learnable_class.alpha if alpha is None else alpha    # additive (Laplace) smoothing
+    if not self.alpha > 0:    # with alpha = 0 a class without training examples gets nan likelihoods, which win the argmax
+      raise ValueError(f"alpha must be positive, got {self.alpha}.")
+    self._lock = threading.Lock()    # guards swapping counts and the cached probabilities
+    self.reset()
+
+  def reset(self):
+    """
+    Discards everything learned so far.
+    """
+    with self._lock:
+      self.class_counts = np.zeros(self.num_classes, dtype=np.int64)
+      self.keys = np.empty(0, dtype=np.int64)      # sorted keys of the observed (class, attribute, value) triples
+      self.counts = np.empty(0, dtype=np.int64)    # count of every key
+      self._probabilities = None
+    return self
+
+  def fit(self, training_set: Dataset, rows: np.array(int) = None):
+    """
+    Trains the model from scratch on a Dataset, see NBModel.fit.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    return self.fit_arrays(training_set.features, training_set.labels, rows)
+
+  def fit_arrays(self, features: np.array(int), labels: np.array(int), rows: np.array(int) = None):
+    """
+    Trains the model from scratch on a feature matrix and its labels, see NBModel.fit_arrays.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    class_counts = nbf.count_classes(labels, self.num_classes, rows)
+    keys, counts = sf.count_keys(features, labels, self.num_classes, self.domain_sizes, rows=rows)
+    return self.set_counts(class_counts, keys, counts)
+
+  def partial_fit(self, training_examples: np.array(int) | Dataset):
+    """
+    Adds a batch of examples to the counts learned so far, see update.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    return self.update(training_examples)
+
+  def update(self, batch: np.array(int) | Dataset):
+    """
+    Adds a batch of examples to the raw counts, see NBModel.update. The batch's keys are merged into the
+    sorted keys, so the cost grows with the batch and the number of observed keys.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    self._add_batch(batch, 1)
+    return self
+
+  def forget(self, batch: np.array(int) | Dataset):
+    """
+    Removes a batch that was added with update (or fit) from the raw counts, see NBModel.forget.
+    Keys whose count drops to zero are removed.
+
+    Returns:
+        SparseNBModel: the model itself.
+
+    Raises:
+        ValueError: if a count would become negative; the counts are left unchanged.
+    """
+    self._add_batch(batch, -1)
+    return self
+
+  def _add_batch(self, batch, weight):
+    if not isinstance(batch, Dataset):
+      batch = Dataset.from_examples(batch)
+    class_counts = nbf.count_classes(batch.labels, self.num_classes)
+    keys, counts = sf.count_keys(batch.features, batch.labels, self.num_classes, self.domain_sizes)
+    with self._lock:
+      class_counts = self.class_counts + weight * class_counts
+      keys, counts = sf.merge_counts(np.concatenate((self.keys, keys)), np.concatenate((self.counts, weight * counts)))
+      if (class_counts < 0).any() or (counts < 0).any():
+        raise ValueError("Cannot forget examples that were not learned, a count would become negative.")
+      self.class_counts, self.keys, self.counts = class_counts, keys, counts
+      self._probabilities = None
+
+  def fit_stream(self, chunks):
+    """
+    Trains the model from scratch on an iterable of batches, see NBModel.fit_stream.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    self.reset()
+    for chunk in chunks:
+      self.partial_fit(chunk)
+    return self
+
+  def set_counts(self, class_counts: np.array(int), keys: np.array(int), counts: np.array(int)):
+    """
+    Replaces the counts of the model, e.g. with counts computed elsewhere.
+
+    Parameters:
+        class_counts (numpy.ndarray): 1D array with the count of each class.
+        keys (numpy.ndarray): sorted 1D array of unique keys, see sparse_functions.count_keys.
+        counts (numpy.ndarray): 1D array with the count of every key.
+
+    Returns:
+        SparseNBModel: the model itself.
+    """
+    with self._lock:
+      self.class_counts = class_counts
+      self.keys = keys
+      self.counts = counts
+      self._probabilities = None
+    return self
+
+  def probabilities(self):
+    """
+    Returns: tuple: (class_prior, log_prior, keys, log_observed, log_unseen), computed from the counts on first use, where
+    log_observed holds the log likelihood of every key and log_unseen the (class, attribute) log likelihood of any other value.
+    The tuple is never modified afterwards, so a caller can keep using it while the model is retrained.
+    """
+    probabilities = self._probabilities
+    if probabilities is None:
+      with self._lock:
+        if self._probabilities is None:
+          class_prior = self.class_counts / self.class_counts.sum()
+          # the same (count + alpha) / (n_c + alpha * V_j) as NBModel, with the domain size of each attribute
+          denominator = self.class_counts[:, None] + self.alpha * self.domain_sizes    # (num_classes, num_attributes)
+          class_ids, attribute_ids = sf.key_attributes(self.keys, self.domain_sizes)
+          with np.errstate(divide='ignore', invalid='ignore'):    # unseen classes have a prior of 0 and a log prior of -inf
+            log_observed = np.log((self.counts + self.alpha) / denominator[class_ids, attribute_ids])
+            log_unseen = np.log((0 + self.alpha) / denominator)
+            self._probabilities = (class_prior, np.log(class_prior), self.keys, log_observed, log_unseen)
+        probabilities = self._probabilities
+    return probabilities
+
+  @property
+  def class_prior(self):
+    return self.probabilities()[0]
+
+  @property
+  def nbytes(self):
+    """
+    Returns: int: bytes held by the counts and the derived probabilities.
+    """
+    probabilities = self._probabilities
+    arrays = [self.class_counts, self.keys, self.counts, self.domain_sizes]
+    if probabilities is not None:
+      arrays += [probabilities[0], probabilities[1], probabilities[3], probabilities[4]]    # the keys are shared
+    return sum(array.nbytes for array in arrays)
+
+  def log_posteriors(self, features: np.array(int), rows: np.array(int) = None):
+    """
+    Parameters:
+        features (numpy.ndarray): 2D integer array of shape (n, num_attributes).
+        rows (numpy.ndarray): indices or boolean mask of the examples to score, all by default.
+
+    Returns:
+        numpy.ndarray: 2D float array of shape (n, num_classes) holding each class's log posterior.
+    """
+    _, log_prior, keys, log_observed, log_unseen = self.probabilities()
+    return sf.log_posteriors(log_prior, keys, log_observed, log_unseen, self.domain_sizes, features, rows=rows)
+
+  def predict(self, test_examples: np.array(int) | Dataset, rows: np.array(int) = None):
+    """
+    Classifies a feature matrix, or a Dataset whose predictions are filled in, see NBModel.predict.
+
+    Returns:
+        numpy.ndarray: 1D integer array of predicted class ids.
+    """
+    if isinstance(test_examples, Dataset):
+      test_examples.predictions[:] = np.argmax(self.log_posteriors(test_examples.features), axis=1)
+      return test_examples.predictions
+    return np.argmax(self.log_posteriors(test_examples, rows), axis=1)
+
+  def value_counts(self):
+    """
+    Returns: numpy.ndarray: the counts as a dense (num_classes, num_attributes, max domain size) array, e.g. to compare with NBModel.
+    """
+    class_ids, attribute_ids = sf.key_attributes(self.keys, self.domain_sizes)
+    attribute_offsets, _ = sf.key_layout(self.domain_sizes)
+    value_counts = np.zeros((self.num_classes, self.num_attributes, int(self.domain_sizes.max())), dtype=np.int64)
+    value_counts[class_ids, attribute_ids, self.keys - class_ids * self.domain_sizes.sum() - attribute_offsets[attribute_ids]] = self.counts
+    return value_counts
+
+  def to_dense(self):
+    """
+    Returns: NBModel: a dense model with the same counts. Its probabilities are identical when all attributes
+    have the same domain size; otherwise it smooths every attribute with the largest domain size.
+    """
+    return NBModel(self.learnable_class, self.alpha, int(self.domain_sizes.max())).set_counts(self.class_counts, self.value_counts())
@@ -1,14 +1,18 @@
 import numpy as np
 from classes.learnablenb import LearnableNB
-from utils import processor_functions as pf
+from classes.registry import SCHEMAS
 
 class Votes(LearnableNB):
 
-  class_names: list[str] = ['republican', 'democrat']
+  __slots__ = ()
+
+  schema = SCHEMAS['votes']  # columns, vocabularies, missing values and binning of the raw file
+
+  class_names: list[str] = schema.class_names
 
   num_classes: int = len(class_names) # number of classes
-  num_attributes: int = 16 # number of attributes (excluding the class feature)
-  domain_values: tuple[int, int] = (0, 2)  # range of possible discrete values
+  num_attributes: int = schema.num_attributes # number of attributes (excluding the class feature)
+  domain_values: tuple[int, int] = schema.domain_values  # range of possible discrete values
   num_values: int = domain_values[-1] - domain_values[0] + 1 # number of possible discrete values
 
   class_prior: np.array = np.zeros(num_classes)
@@ -18,27 +22,12 @@ class Votes(LearnableNB):
     super().__init__(attributes, classify)
 
   @staticmethod
-  def process_data(lines: list[str]):
+  def process_data(raw: bytes | list[str], rng: np.random.Generator = None):
     """
-    Process raw_data lines by converting to digits, reordering class names, and shuffling examples.
-    Parameters: lines (list of str): Raw raw_data lines from the input file.
-    Returns: processed_lines (list of str): a list of strings with processed raw_data.
+    Process raw_data by converting to digits, reordering class names, and shuffling examples, as described by the schema.
+    Parameters: raw (bytes | list of str): Raw raw_data file contents or lines from the input file.
+                rng (numpy.random.Generator | int): random generator or seed used for missing values, the shuffle and the noise.
+    Returns: tuple: (clean_examples, noisy_examples, None) where clean_examples and noisy_examples are 2D integer arrays
+            with the class id in the last column.
     """
-    strings_digits: list[str] = ['?', 'y', 'n']  # ? is not a missing value
-    processed_lines = []
-    for i in range(len(lines)):
-      line = lines[i].strip().split(',')
-      line.append(line.pop(0))  # moves the class name from front to back
-      line[-1] = Votes.class_names.index(line[-1]) # sets class name to digit
-      for j in range(len(line)-1):
-        line[j] = strings_digits.index(line[j]) # ensure all entries except class name/id are digits
-      processed_lines.append(line)
-    examples = np.array(processed_lines, dtype=int)  # ensure class uses a digit id, get a matrix of floats
-    # NO NEED TO BIN OR DOCUMENT since entries are already discrete
-    np.random.shuffle(examples) # ensure raw_data is in random order to eliminate bias
-    noisy_examples = pf.add_noise(examples, 0.10)  # add noise to class, get a matrix of floats
-
-    clean_lines = pf.array_to_lines(examples)    # get list of strings in proper format
-    noisy_lines = pf.array_to_lines(noisy_examples) # get list of strings in proper format
-
-    return clean_lines, noisy_lines, None # get list of strings in proper format
\ No newline at end of file
+    return Votes.schema.process(raw, rng)
\ No newline at end of file
@@ -1,60 +1,73 @@
 import sys, os, numpy as np
-from classes.learnablenb import LearnableNB
-from classes import cancer, glass, votes, iris, soybean
+from utils import cv_functions as cvf
+from utils import pipeline_functions as pipeline
+from classes import registry
+from utils import profiling
 
 def main():
-  if len(sys.argv) < 3:
-    print("Usage: python learn_processor.py <input_file> <output_file>")
+  args = [arg for arg in sys.argv[1:] if arg != '--profile']
+  if len(args) < 2:
+    print("Usage: python learn_processor.py <input_file> <output_file> [--profile]")
     return
 
-  in_file_name = sys.argv[1]
-  out_file_name = sys.argv[2]
-
-  prefix = in_file_name.split('_')[0]
-  suffix = in_file_name.split('_')[1]
-
-  in_file_folder = prefix + '_data'
-
-  in_file = os.path.join(in_file_folder, in_file_name)
+  if '--profile' in sys.argv:
+    # folds run serially so every stage is timed and profiled in this process
+    os.makedirs("profile", exist_ok=True)
+    prefix = os.path.join("profile", os.path.splitext(args[0])[0])
+    profiling.profile_call(prefix, run, args[0], args[1], executor='serial')
+    print(profiling.format_report(), end='')
+    print(f"Profile written to {prefix}.prof, {prefix}_profile.txt and {prefix}_stages.json")
+  else:
+    run(args[0], args[1])
+
+def input_location(in_file_name: str):
+  """
+  Returns: tuple: (path, dataset name) of a processed file name, see run.
+  """
+  parts = in_file_name.split('_')
+  if registry.get_schema(parts[0]) is not None:    # <name>_clean.npy or <name>_noisy.npy, as cached by the pipeline
+    return os.path.join(pipeline.CACHE_DIR, in_file_name), parts[0]
+  return os.path.join(parts[0] + '_data', in_file_name), parts[1] if len(parts) > 1 else in_file_name    # <prefix>_<name>_...
+
+def run(in_file_name: str, out_file_name: str, executor: str = 'process'):
+  """
+  Cross validates on a processed data file and writes the loss of every fold.
+
+  Parameters:
+      in_file_name (str): processed file name, either a cache file of main.py such as iris_clean.npy, read from
+                          processed_data/, or a file such as processed_iris_clean.npy, read from <prefix>_data/.
+      out_file_name (str): loss file name in loss/.
+      executor (str): worker pool of the cross validation, see cv_functions.cross_validate.
+  """
+
+  in_file, name = input_location(in_file_name)
   out_file = os.path.join("loss", out_file_name)
 
-  learnable_classes = {
-    "cancer": cancer.Cancer,
-    "glass": glass.Glass,
-    "votes": votes.Votes,
-    "iris": iris.Iris,
-    "soybean": soybean.Soybean
-  }
-
-  Learnable = learnable_classes.get(suffix)
+  Learnable = registry.get_learnable_class(name)
 
   if Learnable is None:
-    print(f"Error: No class for '{suffix}'.")
+    print(f"Error: No class for '{name}'.")
     return
 
   try:
-    data: np.array(int) = np.loadtxt(in_file, delimiter=",")
+    with profiling.stage('load'):
+      if in_file.endswith('.npy'):
+        data: np.array(int) = np.load(in_file, mmap_mode='r')    # binary processed data, no parsing
+      else:
+        data: np.array(int) = np.loadtxt(in_file, delimiter=",")
+    profiling.count('bytes_read', os.path.getsize(in_file))
+    profiling.count('rows_processed', len(data))
   except Exception as e:
     print(f"Error loading data from '{in_file}': {e}")
     return
 
-  folds: list[np.array(int)] = np.array_split(data, 10)
-
-  losses = []
-  for i in range(len(folds)):
-    test_data: np.array(int) = folds[i]
-    train_data: np.array(int) = np.concatenate(folds[0:i] + folds[i+1:])
-
-    test_experiments: list['LearnableNB'] = [Learnable(data, False) for data in test_data]
-    train_experiments: list['LearnableNB'] = [Learnable(data, True) for data in train_data]
-
-    Learnable.naive_bayes_trainer(train_experiments)
-    Learnable.naive_bayes_classifier(test_experiments)
-
-    losses.append([Learnable.zero_one_loss(test_experiments), Learnable.f1_score_loss(test_experiments)])
+  # each fold is counted and then classified as a separate task of the executor pool
+  with profiling.stage('cross_validation'):
+    results = cvf.cross_validate(Learnable, data, num_folds=10, executor=executor)[0]
+  losses = [[result['zero_one_loss'], result['f1_score_loss']] for result in results]
 
   try:
-    with open(out_file, 'w') as out_f:
+    with profiling.stage('write_output'), open(out_file, 'w') as out_f:
       for loss in losses:
         out_f.write(f"{loss[0]},{loss[1]}\n")
 
@@ -66,5 +79,5 @@ def main():
     print(f"An unexpected error occurred: {e}")
 
 
-  if __name__ == "__main__":
-    main()
\ No newline at end of file
+if __name__ == "__main__":
+  main()
\ No newline at end of file
@@ -1,115 +1,79 @@
 import sys, os
 import numpy as np
-from classes.learnablenb import LearnableNB
-from classes import iris, glass, cancer, votes, soybean
+from utils import pipeline_functions as pipeline
+from utils import profiling
+from classes import registry
 
 
 def main():
   # retrieve program arguments
-  if len(sys.argv) < 2:
-    print("Usage: python main.py <input_file>")
+  args = [arg for arg in sys.argv[1:] if arg != '--profile']
+  if len(args) < 1:
+    print("Usage: python main.py <input_file> [--profile]")
     return
 
-  names = {
-    "breast-cancer-wisconsin.data": 'cancer',
-    "glass.data": 'glass',
-    "house-votes-84.data": 'votes',
-    "iris.data": 'iris',
-    "soybean-small.data": 'soybean'
-  }
-
-  input_file = sys.argv[1]
-  name = names.get(input_file)
-  if name is None:
+  if '--profile' in sys.argv:
+    # folds run serially so every stage is timed and profiled in this process
+    os.makedirs("profile", exist_ok=True)
+    prefix = os.path.join("profile", os.path.splitext(os.path.basename(args[0]))[0])
+    profiling.profile_call(prefix, run, args[0], executor='serial')
+    print(profiling.format_report(), end='')
+    print(f"Profile written to {prefix}.prof, {prefix}_profile.txt and {prefix}_stages.json")
+  else:
+    run(args[0])
+
+def run(input_file: str, executor: str = 'process'):
+  """
+  Processes a raw data file, cross validates on its clean and noisy examples and writes the losses and the model.
+
+  Parameters:
+      input_file (str): raw data file name in raw_data/, or dataset name.
+      executor (str): worker pool of the cross validation, see cv_functions.cross_validate.
+  """
+  schema = registry.find_schema(input_file) or registry.get_schema(input_file)    # raw file name or dataset name
+  if schema is None:
     print(f"Error: No class for '{input_file}'.")
     return
-# determine appropriate file pathes
-  in_file = os.path.join("raw_data", input_file)
-  clean_file = os.path.join("processed_data", name + "_clean.data")
-  noisy_file = os.path.join("processed_data", name + "_noisy.data")
-  bin_file = os.path.join("bin_docs", name + "_bins.txt")
-  clean_loss_file = os.path.join("loss", name + "_loss_clean.txt")
-  noisy_loss_file = os.path.join("loss", name + "_loss_noisy.txt")
+  name = schema.name
 
-  learnable_classes = {
-    "cancer": cancer.Cancer,
-    "glass": glass.Glass,
-    "votes": votes.Votes,
-    "iris": iris.Iris,
-    "soybean": soybean.Soybean
-  }
-  # acquire class based on system argument
-  learnable_class = learnable_classes.get(name)
+  # acquire class based on system argument, only this dataset's module is imported
+  learnable_class = registry.get_learnable_class(name)
   if learnable_class is None:
     print(f"Error: No class for '{name}'.")
     return
 
   try:
-    with open(in_file, 'r') as in_f:
-      in_file_lines: list[str] = in_f.readlines()
-    # clean_lines: list[str] noisy_lines: list[str] documentation: str
-      clean_lines, noisy_lines, documentation = learnable_class.process_data(in_file_lines)
-
-    # write output files
-    with open(clean_file, 'w') as clean_f:
-      clean_f.writelines(clean_lines)
-    with open(noisy_file, 'w') as noisy_f:
-      noisy_f.writelines(noisy_lines)
-    # write documentation if provided
-    if documentation:
-      with open(bin_file, 'w') as doc_f:
-        doc_f.write(documentation)
-
+    # clean_data: np.array(int) noisy_data: np.array(int) discretizer: Discretizer
+    clean_data, noisy_data, discretizer, _ = pipeline.prepare(schema, learnable_class)
   except FileNotFoundError:
     print(f"Error: File for '{name}' not found.")
+    return
   except IOError as e:
     print(f"Error reading or writing file for '{name}': {e}")
+    return
   except Exception as e:
     print(f"An unexpected error occurred: {e}")
-
-  for i in range(len(clean_lines)):
-    clean_lines[i] = clean_lines[i].strip().split(',')
-    noisy_lines[i] = noisy_lines[i].strip().split(',')
-  clean_data = np.array(clean_lines, dtype=int)
-  noisy_data = np.array(noisy_lines, dtype=int)
+    return
 
   def n_fold_cross_validation(data: np.array(int)):
-    folds = np.array_split(data, 10)
+    # each fold is counted and then classified as a separate task of the executor pool
+    results = pipeline.cross_validate(learnable_class, data, executor)
 
-    losses = []
     print("--------------------------------")
-    for i in range(len(folds)):
-      test_data: np.array(int) = folds[i]
-      train_data: np.array(int) = np.array(np.concatenate(folds[0:i] + folds[i + 1:]), dtype=int)
-      test_experiments: list['LearnableNB'] = [learnable_class(data, False) for data in test_data]
-      train_experiments: list['LearnableNB'] = [learnable_class(data, True) for data in train_data]
-
-      print(f"Number of training experiments: {len(train_experiments)}")
-      print(f"Number of testing experiments: {len(test_experiments)}")
-
-      learnable_class.naive_bayes_trainer(train_experiments)
-      learnable_class.naive_bayes_classifier(test_experiments)
-      zero_one_loss = learnable_class.zero_one_loss(test_experiments)
-      f1_score_loss = learnable_class.f1_score_loss(test_experiments)
-
-      print(f"0/1 loss: {zero_one_loss}")
-      print(f"f1 score: {f1_score_loss}")
+    for result in results:
+      print(f"Number of training experiments: {result['num_train']}")
+      print(f"Number of testing experiments: {result['num_test']}")
+      print(f"0/1 loss: {result['zero_one_loss']}")
+      print(f"f1 score: {result['f1_score_loss']}")
       print( "--------------------------------")
-      losses.append([zero_one_loss, f1_score_loss])
-
-    loss_string = "     0/1 loss     |     f1 score\n"
-    for i in range(len(losses)):
-      loss_string += f"{losses[i][0]},{losses[i][1]}\n"
-
-    return loss_string
+    return results
 
-  clean_loss = n_fold_cross_validation(clean_data)
-  noisy_loss = n_fold_cross_validation(noisy_data)
+  results = {'clean': n_fold_cross_validation(clean_data), 'noisy': n_fold_cross_validation(noisy_data)}
 
   try:
-    with open(clean_loss_file, 'w') as c_loss_f, open(noisy_loss_file, 'w') as n_loss_f:
-      c_loss_f.write(clean_loss)
-      n_loss_f.write(noisy_loss)
+    for variant in pipeline.VARIANTS:
+      pipeline.write_losses(name, variant, results[variant])
+    pipeline.write_report(name, results)
 
   except FileNotFoundError:
     print(f"Error: File for loss '{name}' not found.")
@@ -118,5 +82,10 @@ def main():
   except Exception as e:
     print(f"An unexpected error occurred: {e}")
 
+  try:
+    pipeline.export_model(name, learnable_class, clean_data, discretizer)
+  except IOError as e:
+    print(f"Error writing model file for '{name}': {e}")
+
 if __name__ == "__main__":
   main()
\ No newline at end of file
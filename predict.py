@@ -0,0 +1,106 @@
+import sys, io
+import numpy as np
+from utils import artifact
+
+# Standalone scoring of raw data files with a model artifact written by NBModel.save.
+# Only numpy and the artifact reader are imported, no preprocessing or training code.
+
+class Predictor:
+  """
+  Memory mapped model artifact that turns raw rows into class predictions. Rows are parsed with the schema
+  stored in the artifact: categorical tokens through the vocabulary, continuous values through the bin edges.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, path: str):
+    arrays, meta = artifact.load(path)
+    self.log_prior: np.array(float) = arrays['log_prior']
+    self.log_prob: np.array(float) = arrays['log_prob']    # (class, attribute, value)
+    self.bin_edges: np.array(float) = arrays.get('bin_edges')
+    self.class_names: list[str] = meta['class_names']
+    self.schema: dict = meta['schema']
+    self.num_values: int = self.log_prob.shape[2]
+
+  def parse(self, raw: bytes):
+    """
+    Parses raw rows laid out like the training file. The class column may be present with any value, or left out.
+
+    Parameters:
+        raw (bytes): comma separated rows.
+
+    Returns:
+        tuple: (features, known) where features is a 2D integer array of attribute values and known is
+               a 2D boolean array, False for missing or unseen values.
+    """
+    schema = self.schema
+    lines = raw.splitlines()
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+      return np.zeros((0, len(schema['attribute_columns'])), dtype=np.intp), np.zeros((0, len(schema['attribute_columns'])), dtype=bool)
+    columns = np.array(schema['attribute_columns'])
+    if lines[0].count(b',') + 1 < schema['num_columns']:
+      columns -= columns > schema['class_column']    # rows without the class column
+    width = max(len(line) for line in lines) + 1
+    tokens = np.loadtxt(io.BytesIO(b'\n'.join(lines)), dtype=f'S{width}', delimiter=',', usecols=columns, ndmin=2)
+    tokens = np.char.strip(tokens)
+
+    if schema['attribute_type'] == 'categorical':
+      features = np.full(tokens.shape, -1, dtype=np.intp)
+      for value, token in enumerate(schema['vocabulary']):
+        features[tokens == token.encode()] = value
+      known = features >= 0
+    else:
+      missing = tokens == (schema['missing'] or '').encode()
+      values = np.where(missing, b'nan', tokens).astype(float)
+      if self.bin_edges is not None:
+        features = np.empty(values.shape, dtype=np.intp)
+        for i, edges in enumerate(self.bin_edges):
+          # same intervals as processor_functions.bin_attributes
+          features[:, i] = np.minimum(np.searchsorted(edges[1:], values[:, i], side='left'), len(edges) - 2)
+      else:
+        features = np.nan_to_num(values + schema['value_offset'], nan=-1).astype(np.intp)
+      known = ~missing & (features >= 0) & (features < self.num_values)
+    return np.where(known, features, 0), known
+
+  def log_posteriors(self, features: np.array(int), known: np.array(bool) = None):
+    """
+    Parameters:
+        features (numpy.ndarray): 2D integer array of shape (n, num_attributes).
+        known (numpy.ndarray): 2D boolean array, missing values are left out of the posterior.
+
+    Returns:
+        numpy.ndarray: 2D float array of shape (n, num_classes).
+    """
+    posteriors = np.tile(self.log_prior, (len(features), 1))
+    for i in range(features.shape[1]):
+      terms = self.log_prob[:, i, :].T[features[:, i]]    # (n, num_classes)
+      if known is not None:
+        terms = np.where(known[:, i, None], terms, 0.0)    # multiplying would turn a -inf term of a missing value into nan
+      posteriors += terms
+    return posteriors
+
+  def predict(self, raw: bytes):
+    """
+    Returns: list of str: the predicted class name of every row of raw.
+    """
+    class_ids = self.log_posteriors(*self.parse(raw)).argmax(axis=1)
+    return [self.class_names[class_id] for class_id in class_ids]
+
+
+def main():
+  if len(sys.argv) < 3:
+    print("Usage: python predict.py <model_file> <input_file> [<output_file>]")
+    return
+
+  predictor = Predictor(sys.argv[1])
+  with open(sys.argv[2], 'rb') as in_f:
+    predictions = predictor.predict(in_f.read())
+  output = '\n'.join(predictions) + '\n'
+  if len(sys.argv) > 3:
+    with open(sys.argv[3], 'w') as out_f:
+      out_f.write(output)
+  else:
+    sys.stdout.write(output)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,200 @@
+import sys, os, time, json, asyncio
+from collections import deque
+import numpy as np
+from predict import Predictor
+
+# Long running prediction server. A model artifact is loaded once and rows are classified over localhost HTTP
+# or a Unix socket. Concurrent requests are micro-batched into one vectorized classifier call.
+#
+#   POST /predict   body: raw rows laid out like the training file, the class column is optional
+#                   reply: {"class_ids": [...], "class_names": [...]}
+#   GET  /stats     reply: request, row and batch counters, throughput and p50/p99 latency
+
+class ServerStats:
+  """
+  Counters of a running server. Latencies of the most recent requests are kept for the percentiles.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, window: int = 10000):
+    self.start = time.perf_counter()
+    self.requests: int = 0
+    self.rows: int = 0
+    self.batches: int = 0
+    self.errors: int = 0
+    self.latencies: deque = deque(maxlen=window)    # seconds, from request read to reply ready
+
+  def record_request(self, num_rows: int, latency: float):
+    self.requests += 1
+    self.rows += num_rows
+    self.latencies.append(latency)
+
+  def snapshot(self):
+    """
+    Returns: dict: JSON serializable counters, latencies are in milliseconds.
+    """
+    uptime = time.perf_counter() - self.start
+    latencies = np.array(self.latencies) * 1000
+    p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+    return {
+      'uptime': uptime,
+      'requests': self.requests,
+      'rows': self.rows,
+      'batches': self.batches,
+      'errors': self.errors,
+      'mean_batch_rows': self.rows / self.batches if self.batches else 0.0,
+      'requests_per_second': self.requests / uptime,
+      'rows_per_second': self.rows / uptime,
+      'latency_p50_ms': float(p50),
+      'latency_p99_ms': float(p99),
+    }
+
+
+class MicroBatcher:
+  """
+  Collects parsed requests in a queue and classifies everything waiting in one call. Requests that arrive while a
+  batch is being classified form the next batch, so batches grow with the load without delaying a lone request
+  by more than max_delay.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, predictor: Predictor, stats: ServerStats, max_batch_rows: int = 8192, max_delay: float = 0.001):
+    self.predictor = predictor
+    self.stats = stats
+    self.max_batch_rows = max_batch_rows
+    self.max_delay = max_delay
+    self.queue: asyncio.Queue = asyncio.Queue()
+
+  async def classify(self, features: np.array(int), known: np.array(bool)):
+    """
+    Returns: numpy.ndarray: 1D integer array of predicted class ids, once the batch holding the rows is classified.
+    """
+    future = asyncio.get_running_loop().create_future()
+    await self.queue.put((features, known, future))
+    return await future
+
+  async def run(self):
+    loop = asyncio.get_running_loop()
+    while True:
+      batch = [await self.queue.get()]
+      if self.queue.empty() and self.max_delay > 0:
+        await asyncio.sleep(self.max_delay)    # give concurrent requests a chance to join
+      num_rows = len(batch[0][0])
+      while not self.queue.empty() and num_rows < self.max_batch_rows:
+        batch.append(self.queue.get_nowait())
+        num_rows += len(batch[-1][0])
+
+      try:
+        features = np.concatenate([features for features, _, _ in batch])
+        known = np.concatenate([known for _, known, _ in batch])
+        # classified off the event loop so requests keep being read meanwhile
+        class_ids = await loop.run_in_executor(None, self._predict, features, known)
+      except Exception as e:    # fails this batch's requests only, the loop keeps serving the next ones
+        for _, _, future in batch:
+          if not future.done():    # the client may have disconnected meanwhile
+            future.set_exception(e)
+        continue
+      self.stats.batches += 1
+      offsets = np.cumsum([0] + [len(features) for features, _, _ in batch])
+      for (_, _, future), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+        if not future.done():
+          future.set_result(class_ids[start:stop])
+
+  def _predict(self, features, known):
+    return self.predictor.log_posteriors(features, known).argmax(axis=1)
+
+
+class PredictionServer:
+  """
+  Minimal HTTP/1.1 server with keep-alive connections, built on asyncio streams.
+  """
+
+  # CONSTRUCTOR
+  def __init__(self, predictor: Predictor, max_batch_rows: int = 8192, max_delay: float = 0.001):
+    self.predictor = predictor
+    self.stats = ServerStats()
+    self.batcher = MicroBatcher(predictor, self.stats, max_batch_rows, max_delay)
+
+  async def serve(self, host: str = '127.0.0.1', port: int = 8000, socket_path: str = None):
+    """
+    Serves until cancelled, on a Unix socket if socket_path is given and on host:port otherwise.
+    """
+    batcher_task = asyncio.create_task(self.batcher.run())
+    if socket_path:
+      server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+    else:
+      server = await asyncio.start_server(self.handle_connection, host, port)
+    print(f"Serving on {socket_path or f'http://{host}:{port}'}", flush=True)
+    try:
+      async with server:
+        await server.serve_forever()
+    finally:
+      batcher_task.cancel()
+
+  async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+      while True:
+        request_line = await reader.readline()
+        if not request_line:
+          break
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+          key, _, value = line.decode('latin-1').partition(':')
+          headers[key.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        status, reply = await self.route(method, path, body)
+        payload = json.dumps(reply).encode()
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+        await writer.drain()
+        if not keep_alive:
+          break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+      pass
+    finally:
+      writer.close()
+
+  async def route(self, method: str, path: str, body: bytes):
+    """
+    Returns: tuple: (status line, JSON serializable reply).
+    """
+    if method == 'GET' and path == '/stats':
+      return '200 OK', self.stats.snapshot()
+    if method != 'POST' or path != '/predict':
+      return '404 Not Found', {'error': f"Unknown endpoint {method} {path}"}
+
+    start = time.perf_counter()
+    try:
+      features, known = self.predictor.parse(body)
+      class_ids = await self.batcher.classify(features, known)
+    except (ValueError, IndexError) as e:
+      self.stats.errors += 1
+      return '400 Bad Request', {'error': str(e)}
+    self.stats.record_request(len(class_ids), time.perf_counter() - start)
+    return '200 OK', {
+      'class_ids': class_ids.tolist(),
+      'class_names': [self.predictor.class_names[class_id] for class_id in class_ids],
+    }
+
+
+def main():
+  if len(sys.argv) < 2:
+    print("Usage: python serve.py <model_file> [--port <port> | --socket <path>] [--max-batch <rows>] [--max-delay-ms <ms>]")
+    return
+
+  options = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+  server = PredictionServer(Predictor(sys.argv[1]), int(options.get('--max-batch', 8192)),
+                            float(options.get('--max-delay-ms', 1)) / 1000)
+  socket_path = options.get('--socket')
+  if socket_path and os.path.exists(socket_path):
+    os.remove(socket_path)    # stale socket of an earlier run
+  try:
+    asyncio.run(server.serve(port=int(options.get('--port', 8000)), socket_path=socket_path))
+  except KeyboardInterrupt:
+    pass
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,52 @@
+import sys, os, json
+import numpy as np
+from classes import registry
+from utils import sweep_functions as swf
+
+# Grid search over the number of bins and the smoothing alpha of one dataset, on its clean examples.
+
+def main():
+  args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+  options = dict(arg.split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+  if not args:
+    print("Usage: python sweep.py <dataset | raw_file> [--bins=5,10,15] [--alphas=0.1,0.5,1] [--folds=10] [--seed=0] "
+          "[--workers=<n>] [--output=<file>]")
+    return
+
+  schema = registry.find_schema(os.path.basename(args[0])) or registry.get_schema(args[0])
+  if schema is None:
+    print(f"Error: No class for '{args[0]}'.")
+    return
+  learnable_class = registry.get_learnable_class(schema.name)
+  seed = int(options.get('--seed', 0))
+  bin_counts = [int(b) for b in options.get('--bins', '5,10,15,20').split(',')] if schema.num_bins else [None]
+  alphas = [float(a) for a in options.get('--alphas', '0.1,0.5,1,2').split(',')]
+  if not all(alpha > 0 for alpha in alphas):
+    print(f"Error: every alpha must be positive, got {options['--alphas']}.")
+    return
+  output_file = options.get('--output', os.path.join("loss", schema.name + "_sweep.json"))
+
+  try:
+    with open(os.path.join("raw_data", schema.file_name), 'rb') as in_f:
+      examples = schema.load(in_f.read(), np.random.default_rng(seed))    # continuous values are binned per grid point
+  except IOError as e:
+    print(f"Error reading file for '{schema.name}': {e}")
+    return
+
+  results = swf.sweep(learnable_class, examples, bin_counts, alphas, int(options.get('--folds', 10)), seed,
+                      max_workers=int(options['--workers']) if '--workers' in options else None)
+
+  print(f"{'bins':>5} | {'alpha':>6} | {'0/1 loss':>8} | {'f1 loss':>8}")
+  for result in results:
+    print(f"{str(result['num_bins']):>5} | {result['alpha']:>6} | {result['zero_one_loss']:>8.4f} | {result['f1_score_loss']:>8.4f}")
+  best = min(results, key=lambda result: result['zero_one_loss'])
+  print(f"Best: {best['num_bins']} bins, alpha {best['alpha']} with 0/1 loss {best['zero_one_loss']:.4f}")
+
+  try:
+    with open(output_file, 'w') as out_f:
+      json.dump(results, out_f, indent=1)
+  except IOError as e:
+    print(f"Error writing file '{output_file}': {e}")
+
+if __name__ == "__main__":
+  main()
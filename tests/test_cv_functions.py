@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from classes.iris import Iris
+from utils import cv_functions as cvf
+from utils import sweep_functions as swf
+
+def examples(num_rows=60, seed=0):
+  rng = np.random.default_rng(seed)
+  return np.hstack((rng.integers(0, Iris.domain_size(), (num_rows, Iris.num_attributes)),
+                    rng.integers(0, Iris.num_classes, (num_rows, 1))))
+
+@pytest.mark.parametrize('options', [{'mode': 'count'}, {'executor': 'processes'}, {'executor': None}])
+def test_unknown_options_are_rejected(options):
+  with pytest.raises(ValueError):
+    cvf.cross_validate(Iris, examples(), **options)
+
+def test_unknown_sweep_executor_is_rejected():
+  with pytest.raises(ValueError):
+    swf.sweep(Iris, examples(), executor='serail')
+
+@pytest.mark.parametrize('mode', cvf.MODES)
+@pytest.mark.parametrize('executor', cvf.EXECUTORS)
+def test_every_option_gives_the_same_scores(mode, executor):
+  reference = cvf.cross_validate(Iris, examples(), 5, seeds=(0, 1), executor='serial', mode='refit')
+  assert cvf.cross_validate(Iris, examples(), 5, seeds=(0, 1), executor=executor, max_workers=2, mode=mode) == reference
@@ -0,0 +1,77 @@
+import os, sys, subprocess
+import numpy as np
+import pytest
+from utils import kernel_functions as kf
+
+# Both backends of the count and predict kernels must give identical results and reject the same inputs.
+
+NUM_CLASSES, NUM_ATTRIBUTES, NUM_VALUES = 4, 6, 5
+
+requires_numba = pytest.mark.skipif(not kf.NUMBA_AVAILABLE, reason="numba is not installed")
+backends = ['numpy', pytest.param('numba', marks=requires_numba)]
+
+@pytest.fixture
+def examples():
+  rng = np.random.default_rng(0)
+  features = rng.integers(0, NUM_VALUES, (1000, NUM_ATTRIBUTES))
+  labels = rng.integers(0, NUM_CLASSES, 1000)
+  counts = kf.BACKENDS['numpy'][0](features, labels, NUM_CLASSES, NUM_VALUES)
+  log_prob = np.log((counts + 1) / (counts.sum(axis=2, keepdims=True) + NUM_VALUES))
+  log_prior = np.log(np.bincount(labels, minlength=NUM_CLASSES) / len(labels))
+  return features, labels, log_prior, log_prob
+
+@requires_numba
+@pytest.mark.parametrize('rows', [None, np.arange(0, 1000, 3), np.arange(1000) % 2 == 0])
+def test_backends_agree(examples, rows):
+  features, labels, log_prior, log_prob = examples
+  numpy_count, numpy_predict = kf.BACKENDS['numpy']
+  numba_count, numba_predict = kf.BACKENDS['numba']
+  assert np.array_equal(numpy_count(features, labels, NUM_CLASSES, NUM_VALUES, rows=rows),
+                        numba_count(features, labels, NUM_CLASSES, NUM_VALUES, rows=rows))
+  numpy_ids, numpy_posteriors = numpy_predict(log_prior, log_prob, features, rows=rows)
+  numba_ids, numba_posteriors = numba_predict(log_prior, log_prob, features, rows=rows)
+  assert np.array_equal(numpy_ids, numba_ids)
+  assert np.array_equal(numpy_posteriors, numba_posteriors)
+
+@pytest.mark.parametrize('backend', backends)
+def test_float_labels_and_small_chunks(examples, backend):
+  features, labels, _, _ = examples
+  count_values = kf.BACKENDS[backend][0]
+  expected = kf.BACKENDS['numpy'][0](features, labels, NUM_CLASSES, NUM_VALUES)
+  assert np.array_equal(count_values(features, labels.astype(float), NUM_CLASSES, NUM_VALUES, chunk_size=7), expected)
+
+@pytest.mark.parametrize('backend', backends)
+def test_threaded_predict(examples, backend):
+  features, _, log_prior, log_prob = examples
+  class_ids, posteriors = kf.threaded_predict(log_prior, log_prob, features, 3, backend=backend)
+  expected_ids, expected_posteriors = kf.BACKENDS[backend][1](log_prior, log_prob, features)
+  assert np.array_equal(class_ids, expected_ids)
+  assert np.array_equal(posteriors, expected_posteriors)
+
+@pytest.mark.parametrize('backend', backends)
+@pytest.mark.parametrize('value', [NUM_VALUES, -1])
+def test_values_outside_of_domain(examples, backend, value):
+  features, labels, log_prior, log_prob = examples
+  count_values, predict = kf.BACKENDS[backend]
+  features = features.copy()
+  features[10, 0] = value    # would land in a cell of the next or previous attribute once flattened
+  with pytest.raises(IndexError):
+    count_values(features, labels, NUM_CLASSES, NUM_VALUES)
+  with pytest.raises(IndexError):
+    predict(log_prior, log_prob, features)
+
+@pytest.mark.parametrize('backend', backends)
+@pytest.mark.parametrize('class_id', [NUM_CLASSES, -1])
+def test_classes_outside_of_model(examples, backend, class_id):
+  features, labels, _, _ = examples
+  labels = labels.copy()
+  labels[10] = class_id
+  with pytest.raises(IndexError):
+    kf.BACKENDS[backend][0](features, labels, NUM_CLASSES, NUM_VALUES)
+
+def test_numpy_backend_does_not_import_numba():
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  code = "import sys; from utils import kernel_functions as kf; kf.count_values([[0]], [0], 1, 1); print('numba' in sys.modules)"
+  result = subprocess.run([sys.executable, '-c', code], cwd=root, env={**os.environ, 'NB_BACKEND': 'numpy'},
+                          capture_output=True, text=True, check=True)
+  assert result.stdout.strip() == 'False'
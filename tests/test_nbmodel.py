@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from classes.cancer import Cancer
+
+# Every training path of the dense models rejects examples outside of the model, as the count kernels do.
+
+def valid_rows(num_rows=20, seed=0):
+  rng = np.random.default_rng(seed)
+  features = rng.integers(0, Cancer.domain_size(), (num_rows, Cancer.num_attributes))
+  labels = rng.integers(0, Cancer.num_classes, (num_rows, 1))
+  return np.hstack((features, labels))
+
+def invalid_rows(column, value):
+  rows = valid_rows()
+  rows[3, column] = value
+  return rows
+
+# a value of domain_size or -1 would be counted in the next or previous attribute's cell, a class id of -1 in the last class
+INVALID = [(0, Cancer.domain_size()), (1, -1), (-1, -1), (-1, Cancer.num_classes)]
+
+models = [Cancer.new_model, lambda: Cancer.new_online_model(window=3), lambda: Cancer.new_online_model(decay=0.9)]
+
+@pytest.mark.parametrize('new_model', models)
+@pytest.mark.parametrize('column, value', INVALID)
+def test_update_rejects_rows_outside_of_model(new_model, column, value):
+  model = new_model().update(valid_rows())
+  counts = model.value_counts.copy()
+  with pytest.raises(IndexError):
+    model.update(invalid_rows(column, value))
+  assert np.array_equal(model.value_counts, counts)
+
+@pytest.mark.parametrize('column, value', INVALID)
+def test_large_batches_are_checked_too(column, value):
+  rows = np.vstack([valid_rows(seed=seed) for seed in range(50)] + [invalid_rows(column, value)])    # counted in chunks
+  assert len(rows) * Cancer.num_attributes > Cancer.new_model().value_counts.size
+  with pytest.raises(IndexError):
+    Cancer.new_model().partial_fit(rows)
+
+@pytest.mark.parametrize('column, value', INVALID)
+def test_forget_rejects_rows_outside_of_model(column, value):
+  model = Cancer.new_model().update(valid_rows())
+  with pytest.raises(IndexError):
+    model.forget(invalid_rows(column, value))
+
+@pytest.mark.parametrize('column, value', INVALID)
+def test_fit_and_update_agree(column, value):
+  rows = invalid_rows(column, value)
+  with pytest.raises(IndexError):
+    Cancer.new_model().fit_arrays(rows[:, :-1], rows[:, -1])
+  with pytest.raises(IndexError):
+    Cancer.new_model().update(rows)
+
+@pytest.mark.parametrize('new_model', [Cancer.new_model, Cancer.new_online_model, Cancer.new_sparse_model])
+@pytest.mark.parametrize('alpha', [0.0, -1.0])
+def test_alpha_must_be_positive(new_model, alpha):
+  # with alpha = 0 a class absent from the training counts gets nan likelihoods, and argmax would predict it
+  with pytest.raises(ValueError):
+    new_model(alpha=alpha)
+
+@pytest.mark.parametrize('new_model', [Cancer.new_model, Cancer.new_sparse_model])
+@pytest.mark.parametrize('column, value', INVALID)
+def test_dense_and_sparse_reject_the_same_rows(new_model, column, value):
+  rows = invalid_rows(column, value)
+  with pytest.raises(IndexError):
+    new_model().fit_arrays(rows[:, :-1], rows[:, -1])
+  model = new_model().update(valid_rows())
+  with pytest.raises(IndexError):
+    model.update(rows)
+  with pytest.raises(IndexError):
+    model.forget(rows)
+  if column != -1:    # values outside of the domain are not scored either
+    with pytest.raises(IndexError):
+      model.log_posteriors(rows[:, :-1])
+
+def test_sparse_update_leaves_counts_unchanged():
+  model = Cancer.new_sparse_model().update(valid_rows())
+  keys, counts = model.keys.copy(), model.counts.copy()
+  with pytest.raises(IndexError):
+    model.update(invalid_rows(0, Cancer.domain_size()))
+  assert np.array_equal(model.keys, keys) and np.array_equal(model.counts, counts)
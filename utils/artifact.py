@@ -0,0 +1,59 @@
+import json
+import numpy as np
+
+MAGIC: bytes = b'NBARTIF1'    # identifies the file format and its version
+ALIGNMENT: int = 64           # every array starts on a multiple of this many bytes
+
+def _align(offset):
+  return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def save(path, arrays, meta):
+  """
+  Writes arrays and metadata to one binary file: magic, header length, JSON header, then the raw array buffers.
+  Every buffer is aligned so the arrays can be used directly from a memory map.
+
+  Parameters:
+      path (str): output file.
+      arrays (dict): name to numpy.ndarray.
+      meta (dict): JSON serializable metadata.
+  """
+  arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+  descriptors = {}
+  offset = 0
+  for name, array in arrays.items():
+    descriptors[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+    offset = _align(offset + array.nbytes)
+  header = json.dumps({'arrays': descriptors, 'meta': meta}).encode()
+  data_start = _align(len(MAGIC) + 8 + len(header))
+
+  with open(path, 'wb') as out_f:
+    out_f.write(MAGIC)
+    out_f.write(np.uint64(len(header)).tobytes())
+    out_f.write(header)
+    for name, array in arrays.items():
+      out_f.write(b'\0' * (data_start + descriptors[name]['offset'] - out_f.tell()))    # padding up to the aligned start
+      out_f.write(array.tobytes())
+
+def load(path):
+  """
+  Opens a file written by save. Only the header is read; the arrays are read-only views of a memory map,
+  so loading costs the same regardless of their size and pages are shared between processes.
+
+  Parameters:
+      path (str): the file.
+
+  Returns:
+      tuple: (arrays, meta) where arrays maps names to read-only numpy.ndarray views.
+  """
+  with open(path, 'rb') as in_f:
+    if in_f.read(len(MAGIC)) != MAGIC:
+      raise ValueError(f"'{path}' is not a model artifact.")
+    header_length = int(np.frombuffer(in_f.read(8), dtype=np.uint64)[0])
+    header = json.loads(in_f.read(header_length))
+  data_start = _align(len(MAGIC) + 8 + header_length)
+
+  buffer = np.memmap(path, dtype=np.uint8, mode='r')
+  arrays = {}
+  for name, descriptor in header['arrays'].items():
+    arrays[name] = np.ndarray(descriptor['shape'], dtype=descriptor['dtype'], buffer=buffer, offset=data_start + descriptor['offset'])
+  return arrays, header['meta']
@@ -0,0 +1,64 @@
+import os, json, hashlib
+import numpy as np
+
+BLOCK_SIZE: int = 1 << 20    # bytes hashed per read
+
+def file_hash(path):
+  """
+  Computes the SHA-256 content hash of a file, reading it in blocks.
+
+  Parameters:
+      path (str): path of the file.
+
+  Returns:
+      str: hexadecimal digest.
+  """
+  digest = hashlib.sha256()
+  with open(path, 'rb') as in_f:
+    for block in iter(lambda: in_f.read(BLOCK_SIZE), b''):
+      digest.update(block)
+  return digest.hexdigest()
+
+def cache_paths(cache_dir, name):
+  """
+  Returns: tuple: (clean_file, noisy_file, meta_file) paths of a dataset's cache entry.
+  """
+  return (os.path.join(cache_dir, name + "_clean.npy"),
+          os.path.join(cache_dir, name + "_noisy.npy"),
+          os.path.join(cache_dir, name + "_cache.json"))
+
+def load_cached(cache_dir, name, raw_hash):
+  """
+  Loads the processed clean and noisy examples of a dataset, memory mapped, if they were produced from the same raw file.
+
+  Parameters:
+      cache_dir (str): directory holding the cache.
+      name (str): dataset name.
+      raw_hash (str): content hash of the raw file, from file_hash.
+
+  Returns:
+      tuple: (clean_examples, noisy_examples) as read-only memory mapped arrays, or None if the cache is missing or stale.
+  """
+  clean_file, noisy_file, meta_file = cache_paths(cache_dir, name)
+  try:
+    with open(meta_file, 'r') as meta_f:
+      meta = json.load(meta_f)
+    if meta.get('raw_hash') != raw_hash:
+      return None
+    return np.load(clean_file, mmap_mode='r'), np.load(noisy_file, mmap_mode='r')
+  except (OSError, ValueError):
+    return None
+
+def save_cached(cache_dir, name, raw_hash, clean_examples, noisy_examples):
+  """
+  Stores the processed clean and noisy examples of a dataset as .npy files next to a small json file with the raw file hash.
+  The json file is written last, so an interrupted write leaves a cache entry that is treated as stale.
+  """
+  clean_file, noisy_file, meta_file = cache_paths(cache_dir, name)
+  os.makedirs(cache_dir, exist_ok=True)
+  if os.path.exists(meta_file):
+    os.remove(meta_file)
+  np.save(clean_file, np.ascontiguousarray(clean_examples, dtype=int))
+  np.save(noisy_file, np.ascontiguousarray(noisy_examples, dtype=int))
+  with open(meta_file, 'w') as meta_f:
+    json.dump({'raw_hash': raw_hash, 'shape': list(np.shape(clean_examples))}, meta_f)
@@ -0,0 +1,264 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from utils import nb_functions as nbf
+from utils import kernel_functions as kf
+from utils import metrics
+from utils import fold_functions as ff
+from utils import profiling
+
+EXECUTORS: tuple[str, ...] = ('process', 'thread', 'serial')
+MODES: tuple[str, ...] = ('counts', 'refit')
+
+def fold_indices(num_examples, num_folds=10, seed=None):
+  """
+  Splits example indices into folds, see fold_functions.kfold.
+
+  Parameters:
+      num_examples (int): Number of examples in the dataset.
+      num_folds (int): Number of folds.
+      seed (int): Seed for shuffling the examples before splitting. None keeps the order of the data.
+
+  Returns:
+      list of numpy.ndarray: the example indices of each test fold.
+  """
+  return ff.kfold(num_examples, num_folds, seed)
+
+def share_array(array):
+  """
+  Copies an array into a new shared memory block so worker processes can attach to it without pickling it.
+
+  Parameters:
+      array (numpy.ndarray): the array to share.
+
+  Returns:
+      tuple: (shm, descriptor) where:
+          - shm is the SharedMemory block, which the caller must close and unlink.
+          - descriptor is a small picklable (name, shape, dtype) tuple passed to attach_array.
+  """
+  array = np.ascontiguousarray(array)
+  shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+  np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+  return shm, (shm.name, array.shape, array.dtype.str)
+
+def attach_array(descriptor):
+  """
+  Attaches to an array shared with share_array.
+
+  Parameters:
+      descriptor (tuple): the (name, shape, dtype) tuple returned by share_array.
+
+  Returns:
+      tuple: (shm, array) where shm must be kept alive as long as the array is used and then closed.
+  """
+  name, shape, dtype = descriptor
+  shm = shared_memory.SharedMemory(name=name)
+  array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+  array.flags.writeable = False
+  return shm, array
+
+def evaluate(learnable_class, true_labels, predictions, num_train):
+  """
+  Scores the predictions of a test fold from its confusion matrix.
+
+  Returns:
+      dict: metrics.report of the fold plus 'num_train' and 'num_test'.
+  """
+  with profiling.stage('loss'):
+    result = metrics.report(metrics.confusion_matrix(true_labels, predictions, learnable_class.num_classes))
+  result['num_train'] = num_train
+  result['num_test'] = len(true_labels)
+  return result
+
+def run_fold(learnable_class, source, test_indices):
+  """
+  Trains on every example outside a fold and evaluates on the fold. The training rows are passed to the
+  trainer as indices into the example matrix, so no training matrix is built.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      source (numpy.ndarray | tuple): the example matrix, or a share_array descriptor of it.
+      test_indices (numpy.ndarray): indices of the test examples.
+
+  Returns:
+      dict: the fold's scores, see evaluate.
+  """
+  shm = None
+  if isinstance(source, tuple):
+    shm, source = attach_array(source)
+  features = labels = None
+  try:
+    features, labels = source[:, :-1], source[:, -1]    # views of the examples
+    with profiling.stage('split'):
+      train = ff.train_rows(len(source), test_indices)
+    with profiling.stage('train'):
+      model = learnable_class.new_model().fit_arrays(features, labels, train)
+    with profiling.stage('classify'):
+      predictions = model.predict(features, test_indices)
+    true_labels = labels[test_indices]
+  finally:
+    if shm is not None:
+      del source, features, labels
+      shm.close()
+
+  profiling.count('rows_trained', len(train))
+  profiling.count('rows_classified', len(test_indices))
+  return evaluate(learnable_class, true_labels, predictions, len(train))
+
+def count_fold(learnable_class, source, test_indices):
+  """
+  Counts the classes and the (class, attribute, value) triples of one fold, reading the fold through its indices.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      source (numpy.ndarray | tuple): the example matrix, or a share_array descriptor of it.
+      test_indices (numpy.ndarray): indices of the examples of the fold.
+
+  Returns:
+      tuple: (class_counts, value_counts) of the fold.
+  """
+  shm = None
+  if isinstance(source, tuple):
+    shm, source = attach_array(source)
+  features = labels = None
+  num_classes, num_values = learnable_class.num_classes, learnable_class.domain_size()
+  try:
+    features, labels = source[:, :-1], source[:, -1]    # views of the examples
+    with profiling.stage('train'):
+      counts = (nbf.count_classes(labels, num_classes, test_indices),
+                kf.count_values(features, labels, num_classes, num_values, rows=test_indices))
+  finally:
+    if shm is not None:
+      del source, features, labels
+      shm.close()
+
+  profiling.count('rows_trained', len(test_indices))
+  return counts
+
+def training_counts(fold_counts):
+  """
+  Derives the training counts of every fold from the counts of all folds of one repetition:
+  the total counts minus the fold's own counts.
+
+  Parameters:
+      fold_counts (list of tuple): (class_counts, value_counts) of each fold, see count_fold.
+
+  Returns:
+      list of tuple: (class_counts, value_counts) of the examples outside each fold.
+  """
+  total_class_counts = sum(counts[0] for counts in fold_counts)
+  total_value_counts = sum(counts[1] for counts in fold_counts)
+  return [(total_class_counts - class_counts, total_value_counts - value_counts) for class_counts, value_counts in fold_counts]
+
+def score_count_fold(learnable_class, source, test_indices, class_counts, value_counts):
+  """
+  Evaluates a fold with a model set to the fold's training counts, see training_counts.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      source (numpy.ndarray | tuple): the example matrix, or a share_array descriptor of it.
+      test_indices (numpy.ndarray): indices of the test examples.
+      class_counts (numpy.ndarray): class counts of the training examples.
+      value_counts (numpy.ndarray): (class, attribute, value) counts of the training examples.
+
+  Returns:
+      dict: the fold's scores, see evaluate.
+  """
+  shm = None
+  if isinstance(source, tuple):
+    shm, source = attach_array(source)
+  features = labels = None
+  try:
+    features, labels = source[:, :-1], source[:, -1]    # views of the examples
+    model = learnable_class.new_model().set_counts(class_counts, value_counts)
+    with profiling.stage('classify'):
+      predictions = model.predict(features, test_indices)    # smoothing is only applied here, to the fold's training counts
+    true_labels = labels[test_indices]
+  finally:
+    if shm is not None:
+      del source, features, labels
+      shm.close()
+
+  profiling.count('rows_classified', len(test_indices))
+  return evaluate(learnable_class, true_labels, predictions, int(class_counts.sum()))
+
+def run_count_folds(learnable_class, source, folds):
+  """
+  Evaluates every fold of one repetition from counts: each fold is counted once, and the training counts
+  of a fold are the total counts minus the fold's own counts, so the data is only read once.
+  Folds are read through their indices, no example is copied except one chunk at a time.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      source (numpy.ndarray | tuple): the example matrix, or a share_array descriptor of it.
+      folds (list of numpy.ndarray): indices of the test examples of each fold.
+
+  Returns:
+      list of dict: the scores of each fold, see evaluate.
+  """
+  fold_counts = [count_fold(learnable_class, source, test) for test in folds]
+  return [score_count_fold(learnable_class, source, test, *counts) for test, counts in zip(folds, training_counts(fold_counts))]
+
+def cross_validate(learnable_class, data, num_folds=10, seeds=(None,), executor='process', max_workers=None, mode='counts',
+                   method='kfold', groups=None):
+  """
+  Runs (repeated) k-fold cross validation with the work submitted to a worker pool.
+  In 'refit' mode every fold of every repetition is a task that trains on the other folds' examples.
+  In 'counts' mode every fold is first a task that counts the fold once, the training counts are derived by
+  subtraction, and every fold is then a task that classifies it, which gives the same results for about one pass
+  over the data per repetition.
+  With the process pool the data is placed in shared memory once instead of being pickled for every fold.
+  Results only depend on the data and the seeds, not on the number of workers or the scheduling order.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      data (numpy.ndarray): 2D integer array, one example per row with the class id in the last column.
+      num_folds (int): Number of folds per repetition.
+      seeds (list of int): One seed per repetition; None keeps the order of the data.
+      executor (str): 'process', 'thread' or 'serial'.
+      max_workers (int): Size of the pool, defaults to the number of CPUs.
+      mode (str): 'counts' or 'refit'.
+      method (str): 'kfold', 'stratified' or 'grouped', see fold_functions.make_folds.
+      groups (numpy.ndarray): group of every example, for 'grouped'.
+
+  Returns:
+      list of list: for each seed, the scores of each fold, see evaluate.
+
+  Raises:
+      ValueError: if executor is not one of EXECUTORS or mode not one of MODES.
+  """
+  if executor not in EXECUTORS:
+    raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}.")
+  if mode not in MODES:
+    raise ValueError(f"Unknown cross validation mode '{mode}', expected one of {MODES}.")
+  data = np.asarray(data, dtype=int)
+  splits = [ff.make_folds(len(data), num_folds, seed, method, data[:, -1], groups) for seed in seeds]
+
+  if executor == 'serial':
+    if mode == 'counts':
+      return [run_count_folds(learnable_class, data, folds) for folds in splits]
+    return [[run_fold(learnable_class, data, test) for test in folds] for folds in splits]
+
+  shm = None
+  source = data
+  if executor == 'process':
+    shm, source = share_array(data)
+    pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+  else:
+    pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+  try:
+    with pool:
+      if mode == 'counts':
+        futures = [[pool.submit(count_fold, learnable_class, source, test) for test in folds] for folds in splits]
+        fold_counts = [training_counts([future.result() for future in row]) for row in futures]
+        futures = [[pool.submit(score_count_fold, learnable_class, source, test, *counts) for test, counts in zip(folds, row)]
+                   for folds, row in zip(splits, fold_counts)]
+        return [[future.result() for future in row] for row in futures]
+      futures = [[pool.submit(run_fold, learnable_class, source, test) for test in folds] for folds in splits]
+      return [[future.result() for future in row] for row in futures]
+  finally:
+    if shm is not None:
+      shm.close()
+      shm.unlink()
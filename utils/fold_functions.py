@@ -0,0 +1,113 @@
+import numpy as np
+
+# Fold splitting for cross validation. Every splitter builds one ordering of the examples and returns the test
+# folds as consecutive slices of it, so a fold is a view of a single index array and no data is copied.
+# Training examples are the complement of a fold, see train_rows; trainers take them as a rows argument.
+
+METHODS: tuple[str, ...] = ('kfold', 'stratified', 'grouped')
+
+def _base_order(num_examples, seed):
+  # None keeps the order of the data
+  return np.arange(num_examples) if seed is None else np.random.default_rng(seed).permutation(num_examples)
+
+def _split_by_fold(order, fold_of, num_folds):
+  # stable sort by fold keeps the random order within each fold, then one slice per fold
+  order = order[np.argsort(fold_of[order], kind='stable')]
+  return np.split(order, np.cumsum(np.bincount(fold_of, minlength=num_folds))[:-1])
+
+def kfold(num_examples, num_folds=10, seed=None):
+  """
+  Splits example indices into folds of nearly equal size.
+
+  Parameters:
+      num_examples (int): Number of examples in the dataset.
+      num_folds (int): Number of folds.
+      seed (int): Seed for shuffling the examples before splitting. None keeps the order of the data.
+
+  Returns:
+      list of numpy.ndarray: the example indices of each test fold, views of one permutation.
+  """
+  return np.array_split(_base_order(num_examples, seed), num_folds)
+
+def stratified_kfold(labels, num_folds=10, seed=None):
+  """
+  Splits example indices into folds that keep the class proportions of the whole dataset.
+  The examples are ordered by class (randomly within a class) and dealt to the folds in turn.
+
+  Parameters:
+      labels (numpy.ndarray): 1D integer array of class ids.
+      num_folds (int): Number of folds.
+      seed (int): Seed for shuffling the examples within each class. None keeps the order of the data.
+
+  Returns:
+      list of numpy.ndarray: the example indices of each test fold, views of one index array.
+  """
+  labels = np.asarray(labels)
+  order = _base_order(len(labels), seed)
+  by_class = order[np.argsort(labels[order], kind='stable')]
+  fold_of = np.empty(len(labels), dtype=np.intp)
+  fold_of[by_class] = np.arange(len(labels)) % num_folds    # deal the examples of each class round robin
+  return _split_by_fold(order, fold_of, num_folds)
+
+def grouped_kfold(groups, num_folds=10, seed=None):
+  """
+  Splits example indices into folds so that all examples of a group are in the same fold,
+  e.g. repeated measurements of one sample id. Groups are assigned largest first to the smallest fold.
+
+  Parameters:
+      groups (numpy.ndarray): 1D array with the group of every example.
+      num_folds (int): Number of folds.
+      seed (int): Seed for shuffling the groups and the examples. None keeps the order of the data.
+
+  Returns:
+      list of numpy.ndarray: the example indices of each test fold, views of one index array.
+  """
+  _, group_ids, group_sizes = np.unique(np.asarray(groups), return_inverse=True, return_counts=True)
+  group_order = _base_order(len(group_sizes), seed)
+  group_order = group_order[np.argsort(-group_sizes[group_order], kind='stable')]    # largest first, ties in random order
+
+  fold_sizes = np.zeros(num_folds, dtype=np.int64)
+  fold_of_group = np.empty(len(group_sizes), dtype=np.intp)
+  for group in group_order:
+    fold = int(np.argmin(fold_sizes))
+    fold_of_group[group] = fold
+    fold_sizes[fold] += group_sizes[group]
+  return _split_by_fold(_base_order(len(group_ids), seed), fold_of_group[group_ids.ravel()], num_folds)
+
+def make_folds(num_examples, num_folds=10, seed=None, method='kfold', labels=None, groups=None):
+  """
+  Splits example indices with one of METHODS.
+
+  Parameters:
+      num_examples (int): Number of examples in the dataset.
+      num_folds (int): Number of folds.
+      seed (int): Seed for shuffling, None keeps the order of the data.
+      method (str): 'kfold', 'stratified' (needs labels) or 'grouped' (needs groups).
+      labels (numpy.ndarray): class id of every example.
+      groups (numpy.ndarray): group of every example.
+
+  Returns:
+      list of numpy.ndarray: the example indices of each test fold.
+  """
+  if method == 'kfold':
+    return kfold(num_examples, num_folds, seed)
+  if method == 'stratified':
+    return stratified_kfold(labels, num_folds, seed)
+  if method == 'grouped':
+    return grouped_kfold(groups, num_folds, seed)
+  raise ValueError(f"Unknown fold method '{method}', expected one of {METHODS}.")
+
+def test_mask(num_examples, test_indices):
+  """
+  Returns: numpy.ndarray: boolean mask of the test examples of a fold.
+  """
+  mask = np.zeros(num_examples, dtype=bool)
+  mask[test_indices] = True
+  return mask
+
+def train_rows(num_examples, test_indices):
+  """
+  Returns: numpy.ndarray: sorted indices of the training examples of a fold, one integer per example
+  instead of a copy of the training rows.
+  """
+  return np.flatnonzero(~test_mask(num_examples, test_indices))
@@ -0,0 +1,79 @@
+import os, importlib.util
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from utils import nb_functions as nbf
+
+# Backend of the two inner loops of naive Bayes: counting (class, attribute, value) triples for training and
+# the log posterior argmax for classification. The backend is chosen once, at import time: compiled Numba
+# kernels when Numba is installed, the vectorized NumPy kernels of nb_functions otherwise. NB_BACKEND=numpy
+# in the environment forces the NumPy kernels, and Numba is then never imported. Both backends give identical
+# results and raise IndexError for class ids and attribute values outside of the model.
+#
+# The Numba kernels walk the examples once, without the flattened index and (n, attributes, classes)
+# gather temporaries of the NumPy kernels, and release the GIL, so threads scoring different rows run in parallel.
+
+NUMBA_AVAILABLE: bool = importlib.util.find_spec('numba') is not None    # Numba itself is imported on first use
+
+def _as_index_array(array):
+  # the kernels are compiled for integer arrays, float class ids or bins are converted
+  array = np.asarray(array)
+  return array if array.dtype.kind in 'iu' else array.astype(np.intp)
+
+def _rows(num_examples, rows):
+  return np.arange(num_examples) if rows is None else nbf._row_indices(rows)
+
+def numba_count_values(features, labels, num_classes, num_values, chunk_size=nbf.CHUNK_SIZE, rows=None):
+  """
+  Numba version of nb_functions.count_values with the same parameters and result; chunk_size is not needed.
+  """
+  from utils import numba_kernels    # compiles or loads the cached kernels on first use
+  features, labels = _as_index_array(features), _as_index_array(labels)
+  counts = np.zeros((num_classes, features.shape[1], num_values), dtype=np.int64)
+  numba_kernels.count_kernel(features, labels, _rows(len(features), rows), counts)
+  return counts
+
+def numba_predict(log_prior, log_prob, features, chunk_size=nbf.CHUNK_SIZE, rows=None):
+  """
+  Numba version of nb_functions.predict with the same parameters and result; chunk_size is not needed.
+  """
+  from utils import numba_kernels
+  features = _as_index_array(features)
+  rows = _rows(len(features), rows)
+  table = np.ascontiguousarray(np.transpose(log_prob, (1, 2, 0)))    # (num_attributes, num_values, num_classes)
+  class_ids = np.empty(len(rows), dtype=np.intp)
+  posteriors = np.empty((len(rows), log_prob.shape[0]), dtype=float)
+  numba_kernels.predict_kernel(np.asarray(log_prior, dtype=float), table, features, rows, class_ids, posteriors)
+  return class_ids, posteriors
+
+BACKENDS: dict = {'numpy': (nbf.count_values, nbf.predict)}    # name: (count_values, predict)
+if NUMBA_AVAILABLE:
+  BACKENDS['numba'] = (numba_count_values, numba_predict)
+
+BACKEND: str = os.environ.get('NB_BACKEND', 'numba' if NUMBA_AVAILABLE else 'numpy')
+if BACKEND not in BACKENDS:
+  raise ImportError(f"NB_BACKEND '{BACKEND}' is not available, expected one of {list(BACKENDS)}.")
+
+count_values, predict = BACKENDS[BACKEND]
+
+def threaded_predict(log_prior, log_prob, features, max_workers=None, rows=None, backend=None):
+  """
+  Classifies blocks of rows in a pool of threads that share the model and the features.
+  The Numba kernel releases the GIL, so the threads run in parallel; NumPy releases it only inside its own operations.
+
+  Parameters:
+      log_prior (numpy.ndarray): 1D array of log class priors.
+      log_prob (numpy.ndarray): 3D array of log likelihoods with shape (num_classes, num_attributes, num_values).
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      max_workers (int): Number of threads, defaults to the number of CPUs.
+      rows (numpy.ndarray): indices or boolean mask of the examples to classify, all examples by default.
+      backend (str): one of BACKENDS, the selected BACKEND by default.
+
+  Returns:
+      tuple: (class_ids, posteriors), see nb_functions.predict.
+  """
+  predict_block = BACKENDS[backend or BACKEND][1]
+  rows = _rows(len(features), rows)
+  blocks = np.array_split(rows, max_workers or os.cpu_count())
+  with ThreadPoolExecutor(max_workers=len(blocks)) as pool:
+    parts = list(pool.map(lambda block: predict_block(log_prior, log_prob, features, rows=block), blocks))
+  return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
@@ -0,0 +1,117 @@
+import numpy as np
+
+def confusion_matrix(true_labels, predicted_labels, num_classes):
+  """
+  Builds the confusion matrix of a set of predictions with one bincount.
+
+  Parameters:
+      true_labels (numpy.ndarray): 1D integer array of true class ids.
+      predicted_labels (numpy.ndarray): 1D integer array of predicted class ids.
+      num_classes (int): Number of possible classes.
+
+  Returns:
+      numpy.ndarray: 2D integer array, entry (i, j) counts examples of class i predicted as class j.
+
+  Raises:
+      ValueError: if a label is outside of [0, num_classes).
+  """
+  true_labels = np.asarray(true_labels, dtype=np.intp)
+  predicted_labels = np.asarray(predicted_labels, dtype=np.intp)
+  for name, labels in (('true', true_labels), ('predicted', predicted_labels)):
+    if labels.size and (labels.min() < 0 or labels.max() >= num_classes):
+      raise ValueError(f"{name} labels must be class ids in [0, {num_classes}), got values from {labels.min()} to {labels.max()}.")
+  counts = np.bincount(true_labels * num_classes + predicted_labels, minlength=num_classes * num_classes)
+  return counts.reshape(num_classes, num_classes)
+
+def safe_divide(numerator, denominator):
+  # 0 wherever the denominator is 0, e.g. the precision of a class that is never predicted
+  numerator = np.asarray(numerator, dtype=float)
+  return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=np.asarray(denominator) != 0)
+
+def present_classes(matrix):
+  """
+  Returns: numpy.ndarray: boolean mask of the classes that occur as a true or a predicted label.
+  """
+  return (matrix.sum(axis=0) + matrix.sum(axis=1)) > 0
+
+def class_scores(matrix):
+  """
+  Derives per class scores from a confusion matrix.
+  The scores of a class with neither true nor predicted examples are undefined (NaN) and left out of the macro averages.
+
+  Parameters:
+      matrix (numpy.ndarray): confusion matrix from confusion_matrix.
+
+  Returns:
+      dict: 1D arrays 'precision', 'recall', 'f1_score' and 'support', indexed by class id.
+  """
+  tp = np.diag(matrix)
+  predicted = matrix.sum(axis=0)    # TP + FP
+  actual = matrix.sum(axis=1)       # TP + FN
+  precision = safe_divide(tp, predicted)
+  recall = safe_divide(tp, actual)
+  f1_score = safe_divide(2 * precision * recall, precision + recall)
+  absent = ~present_classes(matrix)
+  for scores in (precision, recall, f1_score):
+    scores[absent] = np.nan
+  return {
+    'precision': precision,
+    'recall': recall,
+    'f1_score': f1_score,
+    'support': actual,
+  }
+
+def macro_average(scores):
+  # mean over the classes whose score is defined, 1 (perfect) when no class occurs at all
+  defined = scores[~np.isnan(scores)]
+  return float(defined.mean()) if defined.size else 1.0
+
+def zero_one_loss(matrix):
+  """
+  Returns: float: fraction of misclassified examples.
+  """
+  total = matrix.sum()
+  return float(1 - np.trace(matrix) / total) if total else 0.0
+
+def macro_f1_score(matrix):
+  """
+  Returns: float: unweighted mean of the per class F1 scores over the classes present in the true or predicted labels.
+  """
+  return macro_average(class_scores(matrix)['f1_score'])
+
+def micro_f1_score(matrix):
+  """
+  Returns: float: F1 score of the pooled counts, equal to the accuracy for single label predictions.
+  """
+  tp = np.trace(matrix)
+  fp = matrix.sum() - tp    # every misclassification is a false positive of one class and a false negative of another
+  return float(safe_divide(2 * tp, 2 * tp + 2 * fp))
+
+def f1_score_loss(matrix):
+  """
+  Returns: float: 1 minus the macro F1 score.
+  """
+  return 1 - macro_f1_score(matrix)
+
+def report(matrix):
+  """
+  Summarizes a confusion matrix for dashboards.
+
+  Parameters:
+      matrix (numpy.ndarray): confusion matrix from confusion_matrix.
+
+  Returns:
+      dict: losses, macro and micro averages, per class scores and the matrix itself, all JSON serializable.
+            Undefined per class scores are None.
+  """
+  scores = class_scores(matrix)
+  return {
+    'zero_one_loss': zero_one_loss(matrix),
+    'f1_score_loss': f1_score_loss(matrix),
+    'macro_precision': macro_average(scores['precision']),
+    'macro_recall': macro_average(scores['recall']),
+    'macro_f1_score': macro_f1_score(matrix),
+    'micro_f1_score': micro_f1_score(matrix),
+    'per_class': {key: [None if np.isnan(value) else value for value in values.tolist()] for key, values in scores.items()},
+    'confusion_matrix': np.asarray(matrix).tolist(),
+  }
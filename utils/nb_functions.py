@@ -0,0 +1,173 @@
+import numpy as np
+
+CHUNK_SIZE: int = 1 << 16    # number of examples counted per bincount call, bounds temporary index memory
+
+def _row_indices(rows):
+  # a boolean mask becomes the indices of its True entries
+  rows = np.asarray(rows)
+  return np.flatnonzero(rows) if rows.dtype == bool else rows
+
+def _chunk(features, labels, rows, start, stop):
+  # rows start:stop of the examples, or of the selected rows gathered from them
+  if rows is None:
+    return features[start:stop], (labels[start:stop] if labels is not None else None)
+  selected = rows[start:stop]
+  return features[selected], (labels[selected] if labels is not None else None)
+
+def _check_range(array, limit, message):
+  # a flattened index out of range would count or score another attribute's cell, so fail like the Numba kernels
+  if array.size and (array.min() < 0 or array.max() >= limit):
+    raise IndexError(message)
+
+def count_classes(labels, num_classes, rows=None):
+  """
+  Counts the occurrences of each class id.
+
+  Parameters:
+      labels (numpy.ndarray): 1D integer array of class ids.
+      num_classes (int): Number of possible classes.
+      rows (numpy.ndarray): indices or boolean mask of the examples to count, all examples by default.
+
+  Returns:
+      numpy.ndarray: 1D integer array of length num_classes with the count of each class.
+
+  Raises:
+      IndexError: if a class id is outside of [0, num_classes).
+  """
+  labels = np.asarray(labels) if rows is None else np.asarray(labels)[_row_indices(rows)]
+  _check_range(labels, num_classes, "class id outside of the model's classes")
+  return np.bincount(labels.astype(np.intp, copy=False), minlength=num_classes)
+
+def value_indices(features, labels, num_values, attribute_offsets=None):
+  """
+  Flattens every (class, attribute, value) triple of the examples into its index in a raveled
+  (num_classes, num_attributes, num_values) count array.
+
+  Parameters:
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      labels (numpy.ndarray): 1D integer array of class ids, one per example.
+      num_values (int): Number of possible discrete values of any attribute.
+      attribute_offsets (numpy.ndarray): start of each attribute within a class block, computed when not given.
+
+  Returns:
+      numpy.ndarray: 1D integer array of num_examples * num_attributes indices.
+  """
+  num_attributes = features.shape[1]
+  if attribute_offsets is None:
+    attribute_offsets = np.arange(num_attributes, dtype=np.intp) * num_values
+  flat = features.astype(np.intp) + attribute_offsets    # offset values by attribute
+  flat += (np.asarray(labels).astype(np.intp) * (num_attributes * num_values))[:, None]    # offset values by class
+  return flat.ravel()
+
+def add_counts(counts, indices, weight=1, multiplicity=None):
+  """
+  Adds weight to the entries of a count array at the given indices, in place.
+  Small batches are scattered into their cells only, so the cost does not grow with the array;
+  batches with more indices than cells are counted with one bincount instead.
+
+  Parameters:
+      counts (numpy.ndarray): 1D count array, e.g. a raveled view of a value count tensor.
+      indices (numpy.ndarray): 1D integer array of indices into counts, repeated once per occurrence,
+                               or unique when multiplicity is given.
+      weight (int | float): amount added per occurrence, negative to subtract.
+      multiplicity (numpy.ndarray): number of occurrences of each index, for already counted batches.
+  """
+  if multiplicity is not None:
+    counts[indices] += weight * multiplicity
+  elif len(indices) > counts.size:
+    counts += weight * np.bincount(indices, minlength=counts.size)
+  else:
+    np.add.at(counts, indices, weight)
+
+def count_values(features, labels, num_classes, num_values, chunk_size=CHUNK_SIZE, rows=None):
+  """
+  Counts occurrences of every (class, attribute, value) triple in a single pass over the examples.
+  Each triple is flattened into one index so the whole chunk is counted with one bincount call.
+  With rows, only the selected examples are counted and they are gathered one chunk at a time,
+  so a training subset such as the complement of a fold is never copied as a whole.
+
+  Parameters:
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      labels (numpy.ndarray): 1D integer array of class ids, one per example.
+      num_classes (int): Number of possible classes.
+      num_values (int): Number of possible discrete values of any attribute.
+      chunk_size (int): Number of examples flattened at once.
+      rows (numpy.ndarray): indices or boolean mask of the examples to count, all examples by default.
+
+  Returns:
+      numpy.ndarray: 3D integer array of shape (num_classes, num_attributes, num_values) with the counts.
+
+  Raises:
+      IndexError: if a class id or an attribute value is outside of the model's classes or domain.
+  """
+  features = np.asarray(features)
+  labels = np.asarray(labels)
+  rows = None if rows is None else _row_indices(rows)
+  num_examples = len(features) if rows is None else len(rows)
+  num_attributes = features.shape[1]
+  size = num_classes * num_attributes * num_values
+  attribute_offsets = np.arange(num_attributes, dtype=np.intp) * num_values    # start of each attribute within a class block
+
+  counts = np.zeros(size, dtype=np.int64)
+  for start in range(0, num_examples, chunk_size):
+    chunk_features, chunk_labels = _chunk(features, labels, rows, start, start + chunk_size)
+    _check_range(chunk_labels, num_classes, "class id outside of the model's classes")
+    _check_range(chunk_features, num_values, "attribute value outside of the model's domain")
+    counts += np.bincount(value_indices(chunk_features, chunk_labels, num_values, attribute_offsets), minlength=size)
+
+  return counts.reshape(num_classes, num_attributes, num_values)
+
+def log_posteriors(log_prior, log_prob, features, chunk_size=CHUNK_SIZE, rows=None):
+  """
+  Computes the unnormalized log posterior of every class for every example.
+  The per-attribute log likelihoods are gathered with fancy indexing and summed, so no Python object is built per example.
+
+  Parameters:
+      log_prior (numpy.ndarray): 1D array of log class priors, length num_classes.
+      log_prob (numpy.ndarray): 3D array of log likelihoods with shape (num_classes, num_attributes, num_values).
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      chunk_size (int): Number of examples gathered at once.
+      rows (numpy.ndarray): indices or boolean mask of the examples to score, all examples by default.
+
+  Returns:
+      numpy.ndarray: 2D float array of shape (num_examples, num_classes), one row per scored example.
+
+  Raises:
+      IndexError: if an attribute value is outside of the model's domain.
+  """
+  features = np.asarray(features)
+  rows = None if rows is None else _row_indices(rows)
+  num_examples = len(features) if rows is None else len(rows)
+  num_classes, num_attributes, num_values = log_prob.shape
+  table = np.ascontiguousarray(log_prob.transpose(1, 2, 0)).reshape(num_attributes * num_values, num_classes)    # one row per (attribute, value)
+  attribute_offsets = np.arange(num_attributes, dtype=np.intp) * num_values
+
+  posteriors = np.empty((num_examples, num_classes), dtype=float)
+  for start in range(0, num_examples, chunk_size):
+    chunk_features, _ = _chunk(features, None, rows, start, start + chunk_size)
+    chunk_features = chunk_features[:, :num_attributes]
+    _check_range(chunk_features, num_values, "attribute value outside of the model's domain")
+    table_rows = chunk_features + attribute_offsets
+    # table[(j, x_j)] for every example and attribute -> (chunk, num_attributes, num_classes)
+    posteriors[start:start + chunk_size] = table[table_rows].sum(axis=1) + log_prior
+
+  return posteriors
+
+def predict(log_prior, log_prob, features, chunk_size=CHUNK_SIZE, rows=None):
+  """
+  Predicts the most probable class of every example.
+
+  Parameters:
+      log_prior (numpy.ndarray): 1D array of log class priors.
+      log_prob (numpy.ndarray): 3D array of log likelihoods with shape (num_classes, num_attributes, num_values).
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      chunk_size (int): Number of examples gathered at once.
+      rows (numpy.ndarray): indices or boolean mask of the examples to classify, all examples by default.
+
+  Returns:
+      tuple: (class_ids, posteriors) where:
+          - class_ids is a 1D integer array of predicted class ids.
+          - posteriors is a 2D float array of per-class log posteriors.
+  """
+  posteriors = log_posteriors(log_prior, log_prob, features, chunk_size, rows)
+  return np.argmax(posteriors, axis=1), posteriors
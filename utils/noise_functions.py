@@ -0,0 +1,157 @@
+from math import ceil
+import numpy as np
+
+# Noise models for robustness experiments. Every function takes an explicit numpy.random.Generator (or a seed)
+# and returns new arrays, the caller's examples are never modified. Examples are integer matrices with the
+# class id in the last column.
+
+def noisy_attributes(num_attributes, noise_level=0.10, rng=None):
+  """
+  Picks the attributes to add noise to.
+
+  Parameters:
+      num_attributes (int): Number of attributes, without the class.
+      noise_level (float): Fraction of attributes to pick, rounded up.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      numpy.ndarray: 1D array of distinct attribute indices.
+  """
+  rng = np.random.default_rng(rng)
+  num_noisy = min(ceil(num_attributes * noise_level), num_attributes)
+  return rng.choice(num_attributes, size=num_noisy, replace=False)
+
+def permutation_index(num_examples, num_attributes, noise_level=0.10, rng=None):
+  """
+  Builds the column permutation noise of a dataset without touching the data: a fraction of the attributes
+  each get their own random order of the examples.
+
+  Parameters:
+      num_examples (int): Number of examples.
+      num_attributes (int): Number of attributes, without the class.
+      noise_level (float): Fraction of attributes to permute.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      tuple: (columns, orders) where columns is a 1D array of the permuted attributes and orders is a 2D array,
+             row j holding the source example of every example in attribute columns[j].
+  """
+  rng = np.random.default_rng(rng)
+  columns = noisy_attributes(num_attributes, noise_level, rng)
+  orders = rng.permuted(np.broadcast_to(np.arange(num_examples), (len(columns), num_examples)), axis=1)
+  return columns, orders
+
+def take_noisy(examples, index, rows=None):
+  """
+  Materializes rows of the permuted dataset described by a permutation_index, e.g. one chunk at a time.
+
+  Parameters:
+      examples (numpy.ndarray): the clean examples.
+      index (tuple): (columns, orders) from permutation_index.
+      rows (numpy.ndarray | slice): rows to take, all rows by default.
+
+  Returns:
+      numpy.ndarray: the noisy rows, a new array.
+  """
+  columns, orders = index
+  rows = slice(None) if rows is None else rows
+  noisy = np.array(examples[rows])
+  for column, order in zip(columns, orders):
+    noisy[:, column] = examples[order[rows], column]
+  return noisy
+
+def permute_columns(examples, noise_level=0.10, rng=None):
+  """
+  Shuffles the values within a fraction of the attributes, which keeps each attribute's distribution
+  but breaks its relation to the class.
+
+  Parameters:
+      examples (numpy.ndarray): 2D integer array with the class id in the last column.
+      noise_level (float): Fraction of attributes to shuffle.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      numpy.ndarray: the noisy examples, a new array.
+  """
+  return take_noisy(examples, permutation_index(len(examples), examples.shape[1] - 1, noise_level, rng))
+
+def _shift(values, mask, num_values, rng):
+  # replaces the masked values by a different value drawn uniformly from the other num_values - 1 values
+  shifts = rng.integers(1, np.maximum(num_values, 2), size=values.shape)
+  return np.where(mask, (values + shifts) % num_values, values)
+
+def flip_cells(examples, flip_rate, num_values, rng=None):
+  """
+  Replaces every attribute value with probability flip_rate by another value of the attribute's domain.
+
+  Parameters:
+      examples (numpy.ndarray): 2D integer array with the class id in the last column.
+      flip_rate (float): Probability of each cell to be replaced.
+      num_values (int | numpy.ndarray): Number of possible values, for all attributes or per attribute.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      numpy.ndarray: the noisy examples, a new array.
+  """
+  rng = np.random.default_rng(rng)
+  noisy = np.array(examples)
+  features = noisy[:, :-1]
+  features[...] = _shift(features, rng.random(features.shape) < flip_rate, np.asarray(num_values), rng)
+  return noisy
+
+def flip_labels(examples, flip_rate, num_classes, rng=None):
+  """
+  Replaces every class id with probability flip_rate by another class.
+
+  Parameters:
+      examples (numpy.ndarray): 2D integer array with the class id in the last column.
+      flip_rate (float): Probability of each label to be replaced.
+      num_classes (int): Number of classes.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      numpy.ndarray: the noisy examples, a new array.
+  """
+  rng = np.random.default_rng(rng)
+  noisy = np.array(examples)
+  noisy[:, -1] = _shift(noisy[:, -1], rng.random(len(noisy)) < flip_rate, num_classes, rng)
+  return noisy
+
+def replicates(examples, num_replicates, model='permute', level=0.10, num_values=None, num_classes=None, rng=None):
+  """
+  Generates many noisy copies of a dataset in one batched call, for robustness sweeps.
+
+  Parameters:
+      examples (numpy.ndarray): 2D integer array with the class id in the last column.
+      num_replicates (int): Number of noisy copies.
+      model (str): 'permute' (noise_level of the attributes shuffled), 'cells' (flip rate of the attribute values)
+                   or 'labels' (flip rate of the class ids).
+      level (float): noise level of permute, flip rate of cells and labels.
+      num_values (int | numpy.ndarray): Number of attribute values, needed by 'cells'.
+      num_classes (int): Number of classes, needed by 'labels'.
+      rng (numpy.random.Generator | int): random generator or seed.
+
+  Returns:
+      numpy.ndarray: 3D array of shape (num_replicates, n, num_attributes + 1).
+  """
+  rng = np.random.default_rng(rng)
+  examples = np.asarray(examples)
+  num_examples, num_columns = examples.shape
+  noisy = np.repeat(examples[None], num_replicates, axis=0)
+
+  if model == 'permute':
+    num_attributes = num_columns - 1
+    num_noisy = min(ceil(num_attributes * level), num_attributes)
+    columns = rng.random((num_replicates, num_attributes)).argsort(axis=1)[:, :num_noisy]    # distinct per replicate
+    attributes = np.ascontiguousarray(examples.T)    # each attribute contiguous, shuffled without a gather
+    for replicate, replicate_columns in enumerate(columns):
+      for column in replicate_columns:
+        noisy[replicate, :, column] = rng.permutation(attributes[column])
+  elif model == 'cells':
+    features = noisy[:, :, :-1]
+    features[...] = _shift(features, rng.random(features.shape) < level, np.asarray(num_values), rng)
+  elif model == 'labels':
+    noisy[:, :, -1] = _shift(noisy[:, :, -1], rng.random(noisy.shape[:2]) < level, num_classes, rng)
+  else:
+    raise ValueError(f"Unknown noise model '{model}', expected 'permute', 'cells' or 'labels'.")
+  return noisy
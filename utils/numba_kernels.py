@@ -0,0 +1,41 @@
+import numba
+
+# Compiled Numba kernels of kernel_functions. They live in their own module so that Numba is only imported
+# when the Numba backend is used, see kernel_functions.numba_count_values and numba_predict.
+
+@numba.njit(nogil=True, cache=True)
+def count_kernel(features, labels, rows, counts):
+  num_attributes, num_values = counts.shape[1], counts.shape[2]
+  for i in range(len(rows)):
+    row = rows[i]
+    class_id = labels[row]
+    if class_id < 0 or class_id >= counts.shape[0]:
+      raise IndexError("class id outside of the model's classes")
+    for j in range(num_attributes):
+      value = features[row, j]
+      if value < 0 or value >= num_values:
+        raise IndexError("attribute value outside of the model's domain")
+      counts[class_id, j, value] += 1
+
+@numba.njit(nogil=True, cache=True)
+def predict_kernel(log_prior, table, features, rows, class_ids, posteriors):
+  # table is log_prob laid out as (attribute, value, class), so one example reads one row of classes per attribute;
+  # the terms are added attribute by attribute and the prior last, in the order of nb_functions.log_posteriors
+  num_attributes, num_values, num_classes = table.shape
+  for i in range(len(rows)):
+    row = rows[i]
+    for j in range(num_attributes):
+      value = features[row, j]
+      if value < 0 or value >= num_values:
+        raise IndexError("attribute value outside of the model's domain")
+      for c in range(num_classes):
+        if j == 0:
+          posteriors[i, c] = table[0, value, c]
+        else:
+          posteriors[i, c] += table[j, value, c]
+    best = 0
+    for c in range(num_classes):
+      posteriors[i, c] += log_prior[c]
+      if posteriors[i, c] > posteriors[i, best]:    # the first of equal maxima, as numpy.argmax
+        best = c
+    class_ids[i] = best
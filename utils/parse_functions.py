@@ -0,0 +1,86 @@
+import io
+import numpy as np
+
+def to_bytes(raw):
+  """
+  Parameters:
+      raw (bytes | str | list of str): contents of a file, or its lines.
+
+  Returns:
+      bytes: the contents as one buffer.
+  """
+  if isinstance(raw, list):
+    raw = ''.join(raw)
+  if isinstance(raw, str):
+    raw = raw.encode()
+  return raw
+
+def read_numeric(raw, columns, dtype=float, missing=None, delimiter=','):
+  """
+  Parses numeric columns of a whole delimited file with NumPy's C tokenizer instead of splitting it line by line.
+
+  Parameters:
+      raw (bytes | str | list of str): contents of the file, or its lines.
+      columns (list of int): indices of the columns to read.
+      dtype (type): int or float.
+      missing (str): token marking a missing value, e.g. '?'. Missing cells are read as NaN.
+      delimiter (str): Column separator.
+
+  Returns:
+      tuple: (values, missing_mask) where values is a 2D array with one column per requested column
+             and missing_mask marks the missing cells, which still have to be filled in.
+  """
+  raw = to_bytes(raw)
+  if missing is None or missing.encode() not in raw:
+    values = np.loadtxt(io.BytesIO(raw), delimiter=delimiter, usecols=columns, dtype=dtype, ndmin=2)
+    return values, np.zeros(values.shape, dtype=bool)
+  values = np.loadtxt(io.BytesIO(raw.replace(missing.encode(), b'nan')), delimiter=delimiter, usecols=columns, dtype=float, ndmin=2)
+  return values, np.isnan(values)
+
+def read_categorical(raw, columns, vocabulary, delimiter=','):
+  """
+  Parses categorical columns of a whole delimited file and maps each token to its index in the vocabulary.
+  Tokens are read as fixed width byte strings and compared against each vocabulary entry over whole arrays.
+
+  Parameters:
+      raw (bytes | str | list of str): contents of the file, or its lines.
+      columns (list of int): indices of the columns to read.
+      vocabulary (list of str): the known tokens, a token's id is its index in the list.
+      delimiter (str): Column separator.
+
+  Returns:
+      numpy.ndarray: 2D integer array of ids with one column per requested column.
+  """
+  raw = to_bytes(raw)
+  width = max(len(token) for token in vocabulary) + 1    # longer tokens are cut to width and cannot match any entry
+  tokens = np.loadtxt(io.BytesIO(raw), delimiter=delimiter, usecols=columns, dtype=f'S{width}', ndmin=2)
+
+  ids = np.full(tokens.shape, -1, dtype=int)
+  for i, token in enumerate(vocabulary):
+    ids[tokens == token.encode()] = i
+  if np.any(ids < 0):
+    unknown = sorted({token.decode() for token in tokens[ids < 0]})
+    raise ValueError(f"Unknown values {unknown}, expected one of {vocabulary}.")
+  return ids
+
+def fill_missing(values, missing_mask, low, high, rng=None, dtype=int):
+  """
+  Replaces missing cells with random integers drawn in one vectorized call.
+
+  Parameters:
+      values (numpy.ndarray): the parsed values.
+      missing_mask (numpy.ndarray): boolean mask of the missing cells.
+      low (int): smallest value used for missing values.
+      high (int): largest value used for missing values.
+      rng (numpy.random.Generator): random generator, a new unseeded one by default.
+      dtype (type): type of the returned array.
+
+  Returns:
+      numpy.ndarray: a copy of values without missing cells.
+  """
+  values = np.where(missing_mask, 0, values).astype(dtype)
+  num_missing = np.count_nonzero(missing_mask)
+  if num_missing:
+    rng = rng if rng is not None else np.random.default_rng()
+    values[missing_mask] = rng.integers(low, high + 1, size=num_missing)
+  return values
@@ -0,0 +1,103 @@
+import os, json
+import numpy as np
+from classes.dataset import Dataset
+from classes.discretizer import Discretizer
+from utils import cv_functions as cvf
+from utils import cache_functions as cache
+from utils import profiling
+
+# Steps of the processing pipeline shared by main.py and batch.py: processing a raw file (or reusing its cache),
+# cross validating one variant of the data and writing the outputs of a dataset.
+
+CACHE_DIR: str = "processed_data"
+VARIANTS: tuple[str, ...] = ('clean', 'noisy')
+
+def output_paths(name):
+  """
+  Returns: dict: the output file paths of a dataset, by kind.
+  """
+  return {
+    'bins': os.path.join("bin_docs", name + "_bins.txt"),
+    'edges': os.path.join("bin_docs", name + "_bins.npz"),
+    'clean': os.path.join("loss", name + "_loss_clean.txt"),
+    'noisy': os.path.join("loss", name + "_loss_noisy.txt"),
+    'report': os.path.join("loss", name + "_report.json"),
+    'model': os.path.join("models", name + ".nbm"),
+  }
+
+def prepare(schema, learnable_class):
+  """
+  Processes the raw data file of a dataset, or memory maps the processed arrays of an earlier run on the same file.
+  Freshly processed data is cached, and its bin documentation and bin edges are written.
+
+  Parameters:
+      schema (DatasetSchema): the dataset.
+      learnable_class (type): LearnableNB subclass of the dataset.
+
+  Returns:
+      tuple: (clean_examples, noisy_examples, discretizer, raw_hash), discretizer is None if nothing is binned.
+  """
+  in_file = os.path.join("raw_data", schema.file_name)
+  paths = output_paths(schema.name)
+  with profiling.stage('cache_load'):
+    raw_hash = cache.file_hash(in_file)
+    cached = cache.load_cached(CACHE_DIR, schema.name, raw_hash)
+  if cached is not None:
+    # processed arrays from an earlier run on the same raw file, memory mapped without any parsing
+    discretizer = Discretizer.load(paths['edges']) if schema.num_bins else None
+    return cached + (discretizer, raw_hash)
+
+  with profiling.stage('read'), open(in_file, 'rb') as in_f:
+    in_file_bytes: bytes = in_f.read()    # parsed in bulk by process_data
+  profiling.count('bytes_read', len(in_file_bytes))
+  with profiling.stage('process_data'):
+    clean_data, noisy_data, discretizer = learnable_class.process_data(in_file_bytes)
+
+  with profiling.stage('write_cache'):
+    cache.save_cached(CACHE_DIR, schema.name, raw_hash, clean_data, noisy_data)
+    # write documentation and the reusable bin edges if the data was binned
+    if discretizer:
+      with open(paths['bins'], 'w') as doc_f:
+        doc_f.write(str(discretizer))
+      discretizer.save(paths['edges'])
+  return clean_data, noisy_data, discretizer, raw_hash
+
+def cross_validate(learnable_class, data, executor='process'):
+  """
+  Returns: list of dict: the scores of each of the 10 folds, see cv_functions.evaluate.
+  """
+  with profiling.stage('cross_validation'):
+    return cvf.cross_validate(learnable_class, data, num_folds=10, executor=executor)[0]
+
+def loss_string(results):
+  """
+  Returns: str: the contents of a loss file, one '0/1 loss,f1 score' line per fold.
+  """
+  lines = ["     0/1 loss     |     f1 score\n"]
+  for result in results:
+    lines.append(f"{result['zero_one_loss']},{result['f1_score_loss']}\n")
+  return ''.join(lines)
+
+def write_losses(name, variant, results):
+  with profiling.stage('write_output'), open(output_paths(name)[variant], 'w') as loss_f:
+    loss_f.write(loss_string(results))
+
+def write_report(name, results):
+  """
+  Writes the per fold confusion matrices and scores of every variant, for dashboards.
+
+  Parameters:
+      name (str): dataset name.
+      results (dict): variant name to the fold results from cross_validate.
+  """
+  with profiling.stage('write_output'), open(output_paths(name)['report'], 'w') as report_f:
+    json.dump(results, report_f, indent=1)
+
+def export_model(name, learnable_class, clean_data, discretizer):
+  """
+  Writes the model trained on all clean examples, scored by predict.py.
+  """
+  os.makedirs("models", exist_ok=True)
+  with profiling.stage('export_model'):
+    model = learnable_class.new_model().fit(Dataset.from_examples(np.asarray(clean_data), learnable_class))
+    model.save(output_paths(name)['model'], discretizer)
@@ -1,6 +1,6 @@
 import numpy as np
-from math import ceil
-from random import randint, sample
+from random import randint
+from utils import noise_functions as nf
 
 def strings_to_digits(lines: list[str], strings_digits: list):
   """
@@ -121,24 +121,34 @@ def array_to_lines(array):
 
   return lines
 
-def get_attribute_bins(experiments, num_bins=15):
+def get_bin_edges(experiments, num_bins=15, has_class=True):
   """
-  Separates raw_data into a specified number of bins for each attribute.
-  Returns a list of dictionaries, where each dictionary maps an interval to an integer.
+  Computes equal frequency bin edges for every attribute, sorting all attribute columns in one call.
 
   Parameters:
       experiments (numpy.ndarray): 2D array where each row represents an example and each column represents an attribute.
       num_bins (int): Number of bins to divide each attribute into.
+      has_class (bool): Whether the last column is the class attribute, which is not binned.
 
   Returns:
-      list of dict: A list where each dictionary contains bin intervals as keys and bin numbers as values.
+      numpy.ndarray: 2D array of shape (num_attributes, num_bins + 1), row i holds the sorted bin edges of attribute i.
   """
-  # examples row: example value, column: attribute number
-  attributes = experiments.T  # attributes row: attribute number, column: example value
+  attributes = np.sort(experiments[:, :-1] if has_class else experiments, axis=0)    # ignores class attribute, sorts every attribute column
+  return get_sorted_bin_edges(attributes, num_bins)
 
-  attribute_bins = [] # list of dictionaries that map bin intervals to bin numbers
+def get_sorted_bin_edges(attributes, num_bins=15):
+  """
+  Computes equal frequency bin edges from attribute columns that are already sorted, so one sort
+  can serve any number of bin counts.
 
-  num_values = len(attributes[0]) # number of example values in the matrix
+  Parameters:
+      attributes (numpy.ndarray): 2D array where each column is an attribute sorted in ascending order.
+      num_bins (int): Number of bins to divide each attribute into.
+
+  Returns:
+      numpy.ndarray: 2D array of shape (num_attributes, num_bins + 1), row i holds the sorted bin edges of attribute i.
+  """
+  num_values = len(attributes)  # number of example values in the matrix
 
   if num_bins > num_values:
     num_bins = num_values
@@ -146,22 +156,31 @@ def get_attribute_bins(experiments, num_bins=15):
   values_per_bin = num_values // num_bins
   values_left_over = num_values % num_bins
 
-  for i in range(len(attributes) - 1):    # ignores class attribute
-    attribute = np.sort(attributes[i])
+  bin_sizes = values_per_bin + (np.arange(num_bins) < values_left_over)   # evenly distributes remainder so that bins are similarly sized
+  indices = np.concatenate(([0], np.cumsum(bin_sizes)))
+  indices[indices >= num_values] = num_values - 1    # the last edge is the largest value
 
-    bin_edges = [attribute[0]]
-    attribute_bin = {}  # dictionary mapping bin intervals to bin numbers for this particular attribute
+  return attributes[indices].T
 
-    index = 0
-    for j in range(num_bins):
-      index += values_per_bin + (1 if j < values_left_over else 0)    # evenly distributes remainder so that bins are similarly sized
-      bin_edges.append(attribute[index] if index < num_values else attribute[-1])
+def get_attribute_bins(experiments, num_bins=15):
+  """
+  Separates raw_data into a specified number of bins for each attribute.
+  Returns a list of dictionaries, where each dictionary maps an interval to an integer.
 
-      min_val = bin_edges[j]
-      max_val = bin_edges[j + 1]
-      attribute_bin[(min_val, max_val)] = j
+  Parameters:
+      experiments (numpy.ndarray): 2D array where each row represents an example and each column represents an attribute.
+      num_bins (int): Number of bins to divide each attribute into.
+
+  Returns:
+      list of dict: A list where each dictionary contains bin intervals as keys and bin numbers as values.
+  """
+  attribute_bins = [] # list of dictionaries that map bin intervals to bin numbers
+
+  for bin_edges in get_bin_edges(experiments, num_bins):
+    attribute_bin = {}  # dictionary mapping bin intervals to bin numbers for this particular attribute
+    for j in range(len(bin_edges) - 1):
+      attribute_bin[(bin_edges[j], bin_edges[j + 1])] = j
     attribute_bins.append(attribute_bin)
-  print(attribute_bins)
   return attribute_bins
 
 def get_bin_string(attribute_bins):
@@ -182,49 +201,61 @@ def get_bin_string(attribute_bins):
     bin_string += "\n"
   return bin_string
 
+def interval_edges(attribute_bin):
+  """
+  Recovers the ordered bin edges of one attribute from its bin mapping of get_attribute_bins.
+  Tied edges give equal interval keys, which the dictionary keeps once with the last of their bin numbers,
+  so the edges of the missing bins are filled in from the next edge that is known.
+
+  Parameters:
+      attribute_bin (dict): maps bin intervals (min_val, max_val) to bin numbers.
+
+  Returns:
+      numpy.ndarray: 1D array of num_bins + 1 sorted bin edges, as one row of get_bin_edges.
+  """
+  edges = np.full(max(attribute_bin.values()) + 2, np.nan)
+  for (min_val, max_val), bin_num in attribute_bin.items():
+    edges[bin_num], edges[bin_num + 1] = min_val, max_val
+  positions = np.where(np.isnan(edges), len(edges) - 1, np.arange(len(edges)))
+  return edges[np.minimum.accumulate(positions[::-1])[::-1]]    # position of the next known edge
+
 def bin_attributes(experiments, attribute_bins):
   """
-  Discretizes the attributes based on the provided bin mappings.
+  Discretizes the attributes based on the provided bin mappings, one whole attribute column at a time.
+  A value v goes into the first interval (min_val, max_val] containing it. Values equal to the lowest edge
+  go into the first bin and values above the highest edge into the last bin.
 
   Parameters:
       experiments (numpy.ndarray): 2D array where each row represents an example and each column represents an attribute.
-      attribute_bins (list of dict): List where each dictionary contains bin intervals and their corresponding bin numbers.
+      attribute_bins (list of dict | numpy.ndarray): bin mappings from get_attribute_bins, or bin edges from get_bin_edges.
+                                                     Both give the same bins, including for tied edges.
 
   Returns:
-      numpy.ndarray: 2D array with discretized attribute values.
+      numpy.ndarray: 2D array with discretized attribute values, the class attribute is left unchanged.
   """
-  # examples row: example value, column: attribute number
-  attributes = experiments.T  # attributes row: attribute number, column: example value
-
-  for i in range(len(attributes) - 1):    # ignore class attribute
-    attribute = attributes[i]
-    attribute_bin = attribute_bins[i]
+  binned = np.array(experiments, dtype=float)    # copy, the caller's experiments are not modified
 
-    for j in range(len(attribute)):
-      for (min_val, max_val) in attribute_bin:
-        if min_val < attribute[j] <= max_val:
-          attributes[i][j] = attribute_bin[(min_val, max_val)]
-          break
+  for i, attribute_bin in enumerate(attribute_bins):    # one mapping per attribute, the class attribute has none
+    bin_edges = interval_edges(attribute_bin) if isinstance(attribute_bin, dict) else np.asarray(attribute_bin)
+    upper_edges = bin_edges[1:]
+    # index of the first interval whose upper edge is >= v, upper edges are sorted
+    indices = np.searchsorted(upper_edges, binned[:, i], side='left')
+    binned[:, i] = np.minimum(indices, len(upper_edges) - 1)
 
-  return attributes.T
+  return binned
 
-def add_noise(experiments, noise_level=0.10):
+def add_noise(experiments, noise_level=0.10, rng=None):
   """
   Adds noise to a subset of attributes in the dataset by shuffling values within an attribute.
+  The experiments are not modified, see noise_functions for other noise models.
 
   Parameters:
       experiments (numpy.ndarray): 2D array where each row represents an example and each column represents an attribute.
       noise_level (float): Fraction of attributes to add noise to. Default is 0.10 (10%).
+      rng (numpy.random.Generator | int): random generator or seed, a new unseeded one by default.
 
   Returns:
-      numpy.ndarray: 2D array with noise added to a fraction of the attributes.
+      numpy.ndarray: new 2D array with noise added to a fraction of the attributes.
   """
   noise_level = noise_level if (0 < noise_level < 1) else 0.10 # Ensure noise_level is between 0 and 1
-  attributes = experiments.T  # attributes - row: attribute number, column: example value
-  num_attributes = len(attributes)-1   # ignore class attribute
-  num_noisy = min(ceil(num_attributes * noise_level), num_attributes)    # number of attributes to add noise to
-
-  for i in sample(range(num_attributes), num_noisy):
-    np.random.shuffle(attributes[i])
-
-  return attributes.T
\ No newline at end of file
+  return nf.permute_columns(np.asarray(experiments), noise_level, rng)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import io, json, time, cProfile, pstats, functools
+
+# Opt-in stage timing. Stages and counters are only recorded after enable(); while disabled a stage is a no-op
+# context manager and a decorated function is called directly, so instrumented code costs a flag check.
+
+ENABLED: bool = False
+timings: dict[str, list] = {}     # stage name -> [calls, total seconds]
+counters: dict[str, int] = {}     # counter name -> total, e.g. rows processed or bytes read
+
+def enable():
+  global ENABLED
+  ENABLED = True
+
+def disable():
+  global ENABLED
+  ENABLED = False
+
+def reset():
+  timings.clear()
+  counters.clear()
+
+class stage:
+  """
+  Times a pipeline stage, as a context manager or as a decorator:
+
+      with profiling.stage('parse'):
+        ...
+
+      @profiling.stage('train')
+      def train(...):
+  """
+
+  __slots__ = ('name', 'start')
+
+  # CONSTRUCTOR
+  def __init__(self, name: str):
+    self.name = name
+    self.start = None
+
+  def __enter__(self):
+    if ENABLED:
+      self.start = time.perf_counter()
+    return self
+
+  def __exit__(self, *exc_info):
+    if self.start is not None:
+      entry = timings.setdefault(self.name, [0, 0.0])
+      entry[0] += 1
+      entry[1] += time.perf_counter() - self.start
+      self.start = None
+    return False
+
+  def __call__(self, function):
+    name = self.name
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+      if not ENABLED:
+        return function(*args, **kwargs)
+      with stage(name):
+        return function(*args, **kwargs)
+    return wrapper
+
+def count(name: str, amount: int = 1):
+  """
+  Adds amount to a counter, e.g. count('rows_processed', len(examples)).
+  """
+  if ENABLED:
+    counters[name] = counters.get(name, 0) + int(amount)
+
+def report():
+  """
+  Returns: dict: JSON serializable 'stages' with the calls and seconds of every stage, and 'counters'.
+  """
+  return {
+    'stages': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in timings.items()},
+    'counters': dict(counters),
+  }
+
+def format_report():
+  """
+  Returns: str: the stages, slowest first, and the counters as a table.
+  """
+  lines = [f"{'stage':>24} | {'calls':>6} | {'seconds':>10}"]
+  for name, (calls, seconds) in sorted(timings.items(), key=lambda item: -item[1][1]):
+    lines.append(f"{name:>24} | {calls:>6} | {seconds:>10.4f}")
+  for name, value in counters.items():
+    lines.append(f"{name:>24} | {value}")
+  return '\n'.join(lines) + '\n'
+
+def profile_call(output_prefix: str, function, *args, **kwargs):
+  """
+  Runs a function with stage timing enabled and under cProfile, then writes:
+      <output_prefix>.prof          cProfile statistics, readable with pstats or snakeviz.
+      <output_prefix>_profile.txt   the 40 functions with the highest cumulative time.
+      <output_prefix>_stages.json   the stage timings and counters, see report.
+
+  Returns:
+      the function's return value.
+  """
+  reset()
+  enable()
+  profiler = cProfile.Profile()
+  try:
+    result = profiler.runcall(function, *args, **kwargs)
+  finally:
+    disable()
+    profiler.dump_stats(output_prefix + '.prof')
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+    with open(output_prefix + '_profile.txt', 'w') as profile_f:
+      profile_f.write(format_report() + '\n' + summary.getvalue())
+    with open(output_prefix + '_stages.json', 'w') as stages_f:
+      json.dump(report(), stages_f, indent=1)
+  return result
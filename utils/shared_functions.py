@@ -0,0 +1,99 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from utils import kernel_functions as kf
+from utils import cv_functions as cvf
+from utils import artifact
+
+# Model and data arrays shared by scoring workers on one host. The arrays are published once, either in
+# shared memory blocks (cv_functions.share_array) or in a model artifact file written by NBModel.save, and
+# every worker attaches read-only views, so adding workers does not add copies of the model or the feature matrix.
+
+def publish_model(model, features=None):
+  """
+  Publishes the log probabilities of a fitted NBModel, and optionally a feature matrix to score, in shared memory.
+
+  Returns:
+      tuple: (blocks, descriptor) where:
+          - blocks are the SharedMemory blocks, which the caller must release once the workers are done.
+          - descriptor is a small picklable dict passed to attach.
+  """
+  _, _, log_prior, log_prob = model.probabilities()
+  arrays = {'log_prior': log_prior, 'log_prob': log_prob}
+  if features is not None:
+    arrays['features'] = features
+  blocks, descriptor = [], {}
+  for name, array in arrays.items():
+    shm, descriptor[name] = cvf.share_array(array)
+    blocks.append(shm)
+  return blocks, descriptor
+
+def release(blocks):
+  """
+  Closes and unlinks the shared memory blocks of publish_model.
+  """
+  for shm in blocks:
+    shm.close()
+    shm.unlink()
+
+def attach(descriptor):
+  """
+  Attaches to arrays published by publish_model or saved by NBModel.save, without copying them.
+
+  Parameters:
+      descriptor (dict | str): descriptor from publish_model, or path of a model artifact.
+
+  Returns:
+      tuple: (blocks, arrays) where arrays maps names to read-only views, and the blocks must be closed once
+             they are no longer used (none for a file).
+  """
+  if isinstance(descriptor, str):
+    return [], artifact.load(descriptor)[0]
+  blocks, arrays = [], {}
+  for name, array_descriptor in descriptor.items():
+    shm, arrays[name] = cvf.attach_array(array_descriptor)
+    blocks.append(shm)
+  return blocks, arrays
+
+def score_rows(descriptor, start, stop):
+  """
+  Worker task: classifies rows start:stop of the shared feature matrix with the shared model.
+
+  Returns:
+      numpy.ndarray: 1D integer array of predicted class ids.
+  """
+  blocks, arrays = attach(descriptor)
+  try:
+    class_ids, _ = kf.predict(arrays['log_prior'], arrays['log_prob'], arrays['features'][start:stop])
+  finally:
+    del arrays
+    for shm in blocks:
+      shm.close()
+  return class_ids
+
+def parallel_predict(model, features, max_workers=None, descriptor=None, mp_context=None):
+  """
+  Classifies a feature matrix in a pool of worker processes that all read the same model and feature arrays.
+  Only the descriptor and a row range are sent to each task, and only the class ids come back.
+
+  Parameters:
+      model (NBModel): fitted model, published for the duration of the call unless descriptor is given.
+      features (numpy.ndarray): 2D integer array of shape (n, num_attributes).
+      max_workers (int): Size of the pool, defaults to the number of CPUs.
+      descriptor (dict | str): already published model and features, e.g. the path of NBModel.save(path, features=...).
+      mp_context (multiprocessing.context.BaseContext): start method of the workers, e.g. spawn.
+
+  Returns:
+      numpy.ndarray: 1D integer array of predicted class ids.
+  """
+  blocks = []
+  if descriptor is None:
+    blocks, descriptor = publish_model(model, features)
+  try:
+    max_workers = max_workers or os.cpu_count()
+    bounds = np.linspace(0, len(features), max_workers + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as pool:
+      parts = list(pool.map(score_rows, [descriptor] * max_workers, bounds[:-1], bounds[1:]))
+    return np.concatenate(parts)
+  finally:
+    release(blocks)
@@ -0,0 +1,139 @@
+import numpy as np
+from utils import nb_functions as nbf
+
+# Sparse counting and scoring for attributes with large domains. Every attribute has its own domain size, the
+# attribute domains are packed one after another into a row of width sum(domain_sizes), one row per class, and a
+# (class, attribute, value) triple is the key class * row_width + attribute_offset + value. Only the keys that
+# occur in the training data are stored, as a sorted array next to their counts, and are looked up with
+# searchsorted; every other triple has the smoothed probability of an unseen value of its (class, attribute).
+
+def key_layout(domain_sizes):
+  """
+  Parameters:
+      domain_sizes (numpy.ndarray): 1D integer array with the number of discrete values of each attribute.
+
+  Returns:
+      tuple: (attribute_offsets, row_width) where:
+          - attribute_offsets is the start of each attribute's values within a class row.
+          - row_width is the number of (attribute, value) pairs of a class.
+  """
+  domain_sizes = np.asarray(domain_sizes, dtype=np.int64)
+  attribute_offsets = np.concatenate(([0], np.cumsum(domain_sizes)[:-1])).astype(np.int64)
+  return attribute_offsets, int(domain_sizes.sum())
+
+def _check_domain(values, domain_sizes):
+  # a value outside of its attribute's domain would be keyed as a value of the next attribute, see nb_functions._check_range
+  if values.size and ((values < 0).any() or (values >= domain_sizes).any()):
+    raise IndexError("attribute value outside of the model's domain")
+
+def merge_counts(keys, counts):
+  """
+  Adds up the counts of equal keys and drops keys whose total is zero, e.g. after subtracting counts.
+
+  Parameters:
+      keys (numpy.ndarray): 1D integer array of keys, in any order and possibly repeated.
+      counts (numpy.ndarray): 1D integer array with the count of every key.
+
+  Returns:
+      tuple: (keys, counts) with sorted unique keys.
+  """
+  keys, inverse = np.unique(keys, return_inverse=True)
+  counts = np.bincount(inverse.ravel(), weights=counts, minlength=len(keys)).astype(np.int64)    # exact below 2**53
+  nonzero = counts != 0
+  return keys[nonzero], counts[nonzero]
+
+def count_keys(features, labels, num_classes, domain_sizes, chunk_size=nbf.CHUNK_SIZE, rows=None):
+  """
+  Counts occurrences of every (class, attribute, value) triple, like nb_functions.count_values, but returns
+  only the triples that occur. Each chunk is reduced to its unique keys before the chunks are merged.
+
+  Parameters:
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      labels (numpy.ndarray): 1D integer array of class ids, one per example.
+      num_classes (int): Number of possible classes.
+      domain_sizes (numpy.ndarray): number of discrete values of each attribute.
+      chunk_size (int): Number of examples flattened at once.
+      rows (numpy.ndarray): indices or boolean mask of the examples to count, all examples by default.
+
+  Returns:
+      tuple: (keys, counts) where keys is a sorted 1D int64 array of the observed keys and counts their counts.
+
+  Raises:
+      IndexError: if a class id or an attribute value is outside of the model's classes or its attribute's domain.
+  """
+  features = np.asarray(features)
+  labels = np.asarray(labels)
+  domain_sizes = np.asarray(domain_sizes, dtype=np.int64)
+  rows = None if rows is None else nbf._row_indices(rows)
+  num_examples = len(features) if rows is None else len(rows)
+  attribute_offsets, row_width = key_layout(domain_sizes)
+
+  chunk_keys, chunk_counts = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+  for start in range(0, num_examples, chunk_size):
+    chunk_features, chunk_labels = nbf._chunk(features, labels, rows, start, start + chunk_size)
+    nbf._check_range(chunk_labels, num_classes, "class id outside of the model's classes")
+    values = chunk_features[:, :len(domain_sizes)].astype(np.int64)
+    _check_domain(values, domain_sizes)
+    flat = values + attribute_offsets
+    flat += (chunk_labels.astype(np.int64) * row_width)[:, None]
+    keys, counts = np.unique(flat, return_counts=True)
+    chunk_keys.append(keys)
+    chunk_counts.append(counts)
+
+  return merge_counts(np.concatenate(chunk_keys), np.concatenate(chunk_counts))
+
+def key_attributes(keys, domain_sizes):
+  """
+  Returns: tuple: (class_ids, attribute_ids) of every key.
+  """
+  attribute_offsets, row_width = key_layout(domain_sizes)
+  return keys // row_width, np.searchsorted(attribute_offsets, keys % row_width, side='right') - 1
+
+def log_posteriors(log_prior, keys, log_observed, log_unseen, domain_sizes, features, chunk_size=nbf.CHUNK_SIZE, rows=None):
+  """
+  Computes the unnormalized log posterior of every class for every example from sparse log likelihoods.
+  The terms are gathered into the same (chunk, num_attributes, num_classes) layout as nb_functions.log_posteriors
+  and summed the same way, so the result equals the dense computation exactly.
+
+  Parameters:
+      log_prior (numpy.ndarray): 1D array of log class priors, length num_classes.
+      keys (numpy.ndarray): sorted 1D array of the observed keys, see count_keys.
+      log_observed (numpy.ndarray): 1D array with the log likelihood of every key.
+      log_unseen (numpy.ndarray): 2D array of shape (num_classes, num_attributes) with the log likelihood of an unseen value.
+      domain_sizes (numpy.ndarray): number of discrete values of each attribute.
+      features (numpy.ndarray): 2D integer array where each row is an example and each column an attribute.
+      chunk_size (int): Number of examples gathered at once.
+      rows (numpy.ndarray): indices or boolean mask of the examples to score, all examples by default.
+
+  Returns:
+      numpy.ndarray: 2D float array of shape (num_examples, num_classes), one row per scored example.
+
+  Raises:
+      IndexError: if an attribute value is outside of its attribute's domain.
+  """
+  features = np.asarray(features)
+  domain_sizes = np.asarray(domain_sizes, dtype=np.int64)
+  rows = None if rows is None else nbf._row_indices(rows)
+  num_examples = len(features) if rows is None else len(rows)
+  num_classes, num_attributes = log_unseen.shape
+  attribute_offsets, row_width = key_layout(domain_sizes)
+  unseen = np.ascontiguousarray(log_unseen.T)    # (num_attributes, num_classes)
+
+  posteriors = np.empty((num_examples, num_classes), dtype=float)
+  for start in range(0, num_examples, chunk_size):
+    chunk_features, _ = nbf._chunk(features, None, rows, start, start + chunk_size)
+    values = chunk_features[:, :num_attributes].astype(np.int64)
+    _check_domain(values, domain_sizes)
+    flat = values + attribute_offsets
+    terms = np.empty(values.shape + (num_classes,), dtype=float)    # (chunk, num_attributes, num_classes)
+    for class_id in range(num_classes):    # one class at a time keeps the index temporaries to (chunk, num_attributes)
+      query = flat + class_id * row_width
+      if len(keys):
+        position = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        found = keys[position] == query
+        terms[:, :, class_id] = np.where(found, log_observed[position], unseen[:, class_id])
+      else:
+        terms[:, :, class_id] = unseen[:, class_id]
+    posteriors[start:start + chunk_size] = terms.sum(axis=1) + log_prior
+
+  return posteriors
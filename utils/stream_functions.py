@@ -0,0 +1,28 @@
+import numpy as np
+from itertools import islice
+
+CHUNK_SIZE: int = 100000    # default number of lines parsed per chunk
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE, delimiter=','):
+  """
+  Reads a processed data file in fixed size chunks so memory use does not depend on the file size.
+
+  Parameters:
+      source (str | iterable): path of the file, or any iterable of comma-separated lines.
+      chunk_size (int): Number of lines parsed per chunk.
+      delimiter (str): Column separator.
+
+  Yields:
+      numpy.ndarray: 2D integer array of at most chunk_size examples with the class id in the last column.
+  """
+  if isinstance(source, str):
+    with open(source, 'r') as in_f:
+      yield from iter_chunks(in_f, chunk_size, delimiter)
+    return
+
+  lines = iter(source)
+  while True:
+    chunk = list(islice(lines, chunk_size))
+    if not chunk:
+      return
+    yield np.loadtxt(chunk, delimiter=delimiter, dtype=int, ndmin=2)
@@ -0,0 +1,140 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from classes.nbmodel import NBModel
+from utils import processor_functions as pf
+from utils import nb_functions as nbf
+from utils import kernel_functions as kf
+from utils import fold_functions as ff
+from utils import cv_functions as cvf
+from utils import metrics
+
+# Grid search over the number of bins and the smoothing alpha with the preprocessing shared between grid points:
+# every attribute column is sorted once for all bin counts, the folds are counted once per bin count, and every
+# alpha is evaluated from those counts since smoothing is only applied when probabilities are derived.
+
+def grid_edges(features, bin_counts):
+  """
+  Computes the equal frequency bin edges of every bin count from a single sort of the attribute columns.
+
+  Parameters:
+      features (numpy.ndarray): 2D array of continuous attribute values, without the class.
+      bin_counts (list of int): the numbers of bins.
+
+  Returns:
+      dict: number of bins to the (num_attributes, num_bins + 1) edges, see processor_functions.get_bin_edges.
+  """
+  sorted_features = np.sort(features, axis=0)    # the only sort of the sweep
+  return {num_bins: pf.get_sorted_bin_edges(sorted_features, num_bins) for num_bins in bin_counts}
+
+def summarize(fold_reports):
+  """
+  Returns: dict: mean and standard deviation of the fold losses, and the losses of every fold.
+  """
+  zero_one = np.array([report['zero_one_loss'] for report in fold_reports])
+  f1 = np.array([report['f1_score_loss'] for report in fold_reports])
+  return {
+    'zero_one_loss': float(zero_one.mean()), 'zero_one_loss_std': float(zero_one.std()),
+    'f1_score_loss': float(f1.mean()), 'f1_score_loss_std': float(f1.std()),
+    'fold_zero_one_loss': zero_one.tolist(), 'fold_f1_score_loss': f1.tolist(),
+  }
+
+def evaluate_bin_count(learnable_class, source, folds, num_bins, edges, alphas):
+  """
+  Evaluates every alpha of one bin count: the examples are binned, each fold is counted once, and the
+  training counts of a fold are the total counts minus the fold's counts, as in cv_functions.run_count_folds.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      source (numpy.ndarray | tuple): the example matrix with the class id in the last column, or a share_array descriptor of it.
+      folds (list of numpy.ndarray): indices of the test examples of each fold.
+      num_bins (int): the number of bins, None to use the attribute values as they are.
+      edges (numpy.ndarray): bin edges of num_bins, None when num_bins is None.
+      alphas (list of float): smoothing values.
+
+  Returns:
+      list of dict: one result per alpha, see summarize, with 'num_bins' and 'alpha'.
+  """
+  shm = None
+  if isinstance(source, tuple):
+    shm, source = cvf.attach_array(source)
+  features = None
+  try:
+    labels = source[:, -1].astype(np.intp)
+    if edges is None:
+      features, num_values = source[:, :-1], learnable_class.domain_size()
+    else:
+      features, num_values = pf.bin_attributes(source[:, :-1], edges).astype(np.intp), edges.shape[1] - 1
+    num_classes = learnable_class.num_classes
+    fold_counts = [(nbf.count_classes(labels, num_classes, test),
+                    kf.count_values(features, labels, num_classes, num_values, rows=test)) for test in folds]
+    total_class_counts = sum(counts[0] for counts in fold_counts)
+    total_value_counts = sum(counts[1] for counts in fold_counts)
+
+    results = []
+    for alpha in alphas:    # the counts are shared by every alpha
+      fold_reports = []
+      for test, (class_counts, value_counts) in zip(folds, fold_counts):
+        model = NBModel(learnable_class, alpha, num_values).set_counts(total_class_counts - class_counts, total_value_counts - value_counts)
+        predictions = model.predict(features, test)
+        fold_reports.append(metrics.report(metrics.confusion_matrix(labels[test], predictions, num_classes)))
+      results.append({'num_bins': num_bins, 'alpha': alpha, **summarize(fold_reports)})
+  finally:
+    if shm is not None:
+      del source, features
+      shm.close()
+  return results
+
+def sweep(learnable_class, examples, bin_counts=(None,), alphas=(1.0,), num_folds=10, seed=0, method='kfold',
+          executor='process', max_workers=None):
+  """
+  Cross validates every (number of bins, alpha) grid point on the same folds.
+  Bin counts run in parallel, each evaluating all alphas from one set of counts.
+
+  Parameters:
+      learnable_class (type): LearnableNB subclass being evaluated.
+      examples (numpy.ndarray): 2D array with the class id in the last column; continuous attribute values
+                                 if bin_counts are given, discrete values for None.
+      bin_counts (list of int): the numbers of bins, None evaluates the attribute values without binning.
+      alphas (list of float): smoothing values.
+      num_folds (int): Number of folds.
+      seed (int): Seed of the fold split, None keeps the order of the data.
+      method (str): 'kfold' or 'stratified', see fold_functions.make_folds.
+      executor (str): 'process', 'thread' or 'serial'.
+      max_workers (int): Size of the pool, defaults to the number of CPUs.
+
+  Returns:
+      list of dict: one result per grid point, ordered by bin count then alpha, see evaluate_bin_count.
+
+  Raises:
+      ValueError: if an alpha is not positive or executor is not one of cv_functions.EXECUTORS.
+  """
+  if executor not in cvf.EXECUTORS:
+    raise ValueError(f"Unknown executor '{executor}', expected one of {cvf.EXECUTORS}.")
+  if not all(alpha > 0 for alpha in alphas):
+    raise ValueError(f"Every alpha must be positive, got {list(alphas)}.")
+  examples = np.asarray(examples)
+  folds = ff.make_folds(len(examples), num_folds, seed, method, examples[:, -1].astype(np.intp))
+  edges = grid_edges(examples[:, :-1], [num_bins for num_bins in bin_counts if num_bins])
+  tasks = [(num_bins, edges.get(num_bins)) for num_bins in bin_counts]
+
+  if executor == 'serial':
+    return [result for num_bins, bin_edges in tasks
+            for result in evaluate_bin_count(learnable_class, examples, folds, num_bins, bin_edges, alphas)]
+
+  shm = None
+  source = examples
+  if executor == 'process':
+    shm, source = cvf.share_array(examples)
+    pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+  else:
+    pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+  try:
+    with pool:
+      futures = [pool.submit(evaluate_bin_count, learnable_class, source, folds, num_bins, bin_edges, alphas)
+                 for num_bins, bin_edges in tasks]
+      return [result for future in futures for result in future.result()]
+  finally:
+    if shm is not None:
+      shm.close()
+      shm.unlink()